@@ -0,0 +1 @@
+"""Configuration test package."""
@@ -0,0 +1,186 @@
+"""Test cases for the cross-worker invalidation bus."""
+
+import io
+import os
+import queue
+import socketserver
+import threading
+
+import pytest
+
+from configs.Invalidation import (
+    InvalidationBus,
+    RedisTransport,
+    SQLiteTransport,
+    encode_command,
+    read_reply,
+)
+
+
+def collect(bus: InvalidationBus) -> "queue.Queue":
+    received: "queue.Queue" = queue.Queue()
+    bus.subscribe(
+        lambda table, key: received.put((table, key))
+    )
+    return received
+
+
+def first_delivery(
+    writer: InvalidationBus, received: "queue.Queue"
+):
+    # Published until the listener has started
+    while True:
+        writer.publish("life_events")
+        try:
+            return received.get(timeout=0.1)
+        except queue.Empty:
+            pass
+
+
+class StandInServer(socketserver.ThreadingTCPServer):
+    """Serves PUBLISH and SUBSCRIBE of the Redis protocol."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.lock = threading.Lock()
+        self.subscribers = []
+
+
+class StandInHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        server = self.server
+        while True:
+            try:
+                command = read_reply(self.rfile)
+            except ConnectionError:
+                return
+            if command[0] == "SUBSCRIBE":
+                self.wfile.write(
+                    b"*3\r\n$9\r\nsubscribe\r\n"
+                    + encode_command(command[1])[4:]
+                    + b":1\r\n"
+                )
+                with server.lock:
+                    server.subscribers.append(self.wfile)
+            elif command[0] == "PUBLISH":
+                message = encode_command(
+                    "message", command[1], command[2]
+                )
+                with server.lock:
+                    for subscriber in server.subscribers:
+                        subscriber.write(message)
+                    count = len(server.subscribers)
+                self.wfile.write(f":{count}\r\n".encode())
+
+
+def test_reply_parsing() -> None:
+    """Test that protocol replies of each kind are read."""
+    file = io.BytesIO(
+        b"+OK\r\n:3\r\n$5\r\nhello\r\n$-1\r\n"
+        b"*2\r\n$1\r\na\r\n:1\r\n"
+    )
+    assert read_reply(file) == "OK"
+    assert read_reply(file) == 3
+    assert read_reply(file) == "hello"
+    assert read_reply(file) is None
+    assert read_reply(file) == ["a", 1]
+    with pytest.raises(ConnectionError):
+        read_reply(file)
+
+
+def test_messages_apply_locally_at_once() -> None:
+    """Test that a publisher's handlers run without a transport."""
+    bus = InvalidationBus()
+    received = collect(bus)
+    bus.publish("event_types", 3)
+    assert received.get_nowait() == ("event_types", 3)
+
+
+def test_origin_is_made_per_process(monkeypatch) -> None:
+    """Test that workers forked after import get their own origin."""
+    bus = InvalidationBus()
+    parent = bus.origin
+    assert bus.origin == parent
+
+    pid = os.getpid()
+    monkeypatch.setattr(
+        "configs.Invalidation.os.getpid", lambda: pid + 1
+    )
+    child = bus.origin
+    assert child != parent
+    assert bus.origin == child
+
+
+def test_sqlite_transport_reaches_other_workers(
+    tmp_path,
+) -> None:
+    """Test that workers sharing a file see each other's writes."""
+    path = str(tmp_path / "invalidations.db")
+    writer, reader = InvalidationBus(), InvalidationBus()
+    received = collect(reader)
+    writer.connect(SQLiteTransport(path))
+    reader.connect(
+        SQLiteTransport(path, poll_interval=0.01)
+    )
+    reader.listen()
+    try:
+        assert first_delivery(writer, received) == (
+            "life_events",
+            None,
+        )
+        writer.publish("event_types", 2)
+        # After any repeats of the first message
+        while received.get(timeout=5) != ("event_types", 2):
+            pass
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_sqlite_transport_reports_pruned_messages(
+    tmp_path,
+) -> None:
+    """Test that messages pruned before a poll reset the caches."""
+    path = str(tmp_path / "invalidations.db")
+    listener = SQLiteTransport(path)
+    connection = listener._connect()
+    delivered = []
+    publisher = SQLiteTransport(path, retention=-1)
+    publisher.publish("first")
+    publisher.publish("second")
+    last = listener._poll(connection, 0, delivered.append)
+    assert delivered == [None]
+    assert last == 2
+    # Nothing was missed since
+    assert (
+        listener._poll(connection, 2, delivered.append) == 2
+    )
+    assert delivered == [None]
+    publisher.close()
+    connection.close()
+
+
+def test_redis_transport_through_a_stand_in() -> None:
+    """Test that workers exchange messages through pub/sub."""
+    server = StandInServer()
+    threading.Thread(
+        target=server.serve_forever, daemon=True
+    ).start()
+    writer, reader = InvalidationBus(), InvalidationBus()
+    received = collect(reader)
+    writer.connect(RedisTransport(server.server_address))
+    reader.connect(RedisTransport(server.server_address))
+    reader.listen()
+    try:
+        assert first_delivery(writer, received) == (
+            "life_events",
+            None,
+        )
+    finally:
+        reader.close()
+        writer.close()
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,54 @@
+"""Test cases for connection pool metrics."""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError
+
+from configs.Pool import MeasuredQueuePool, pool_statistics
+
+
+@pytest.fixture
+def engine():
+    """Create an engine with a single measured connection."""
+    engine = create_engine(
+        "sqlite://",
+        poolclass=MeasuredQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+        pool_logging_name="test",
+    )
+    yield engine
+    engine.dispose()
+
+
+def get_statistics(name: str):
+    return next(
+        statistics
+        for statistics in pool_statistics()
+        if statistics["name"] == name
+    )
+
+
+def test_checkouts_are_counted(engine) -> None:
+    """Test that checkouts and occupancy are reported."""
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        statistics = get_statistics("test")
+        assert statistics["checked_out"] == 1
+        assert statistics["idle"] == 0
+
+    statistics = get_statistics("test")
+    assert statistics["checked_out"] == 0
+    assert statistics["idle"] == 1
+    assert statistics["checkouts"] == 1
+    assert statistics["wait_max_ms"] >= 0
+
+
+def test_timeouts_are_counted(engine) -> None:
+    """Test that exhausted pools record checkout timeouts."""
+    with engine.connect():
+        with pytest.raises(TimeoutError):
+            engine.connect()
+
+    assert get_statistics("test")["timeouts"] == 1
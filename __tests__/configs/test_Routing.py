@@ -0,0 +1,121 @@
+"""Test cases for read replica session routing."""
+
+import time
+
+import pytest
+from fastapi import Request, Response
+from sqlalchemy import create_engine, select
+from sqlalchemy.pool import StaticPool
+
+from configs.Routing import (
+    PRIMARY_COOKIE,
+    REPLICA,
+    RoutingSession,
+    read_your_writes,
+)
+from models.BaseModel import Base
+from models.EventTypeModel import EventType
+
+
+def create_database():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def session():
+    """Create a session over a primary and an empty replica."""
+    primary = create_database()
+    replica = create_database()
+    session = RoutingSession(
+        bind=primary, info={"read_engine": replica}
+    )
+    yield session
+    session.close()
+
+
+def count_event_types(session: RoutingSession) -> int:
+    query = select(EventType)
+    return len(
+        session.execute(query, bind_arguments=REPLICA)
+        .scalars()
+        .all()
+    )
+
+
+def test_reads_use_replica(session: RoutingSession) -> None:
+    """Test that replica reads skip the primary's rows."""
+    primary = session.get_bind()
+    with primary.begin() as connection:
+        connection.execute(
+            EventType.__table__.insert(), {"name": "note"}
+        )
+
+    assert count_event_types(session) == 0
+    assert not session.has_written
+
+
+def test_reads_follow_writes(
+    session: RoutingSession,
+) -> None:
+    """Test that reads after a write stay on the primary."""
+    session.add(EventType(name="note"))
+    session.commit()
+
+    assert session.has_written
+    assert count_event_types(session) == 1
+
+
+def test_reads_without_replica() -> None:
+    """Test that reads use the primary when no replica is set."""
+    session = RoutingSession(bind=create_database())
+    session.add(EventType(name="note"))
+    session.flush()
+    session.has_written = False
+
+    assert count_event_types(session) == 1
+
+
+def request(cookie: str = "") -> Request:
+    return Request(
+        {
+            "type": "http",
+            "headers": [(b"cookie", cookie.encode())],
+        }
+    )
+
+
+def test_writes_pin_the_client_to_the_primary(
+    session: RoutingSession,
+) -> None:
+    """Test that a write's cookie keeps later reads on the primary."""
+    response = Response()
+    read_your_writes(session, request(), response, 5)
+    assert count_event_types(session) == 0
+    session.commit()
+    assert "set-cookie" not in response.headers
+
+    session.add(EventType(name="note"))
+    session.commit()
+    session.commit()
+    [cookie] = response.headers.getlist("set-cookie")
+    assert cookie.startswith(f"{PRIMARY_COOKIE}=")
+
+    # A later request of the client, in a new session
+    later = RoutingSession(
+        bind=session.get_bind(), info=session.info
+    )
+    read_your_writes(
+        later, request(cookie.split(";")[0]), Response(), 5
+    )
+    assert later.primary_until > time.time()
+    assert count_event_types(later) == 1
+
+    # Once the window has passed, reads use the replica again
+    later.primary_until = time.time() - 1
+    assert count_event_types(later) == 0
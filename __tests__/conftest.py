@@ -2,23 +2,37 @@
 
 import pytest
 from typing import Generator
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
 
+from configs.Routing import RoutingSession
 from models.BaseModel import Base
 
 
 @pytest.fixture(scope="session")
 def engine():
     """Create a test database engine."""
-    return create_engine(
+    engine = create_engine(
         "sqlite:///:memory:",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
         echo=False,
     )
 
+    # Enforce ON DELETE CASCADE as MySQL does
+    @event.listens_for(engine, "connect")
+    def set_foreign_keys_pragma(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    return engine
+
 
 @pytest.fixture(scope="session")
 def tables(engine):
@@ -33,10 +47,40 @@ def db(engine, tables) -> Generator[Session, None, None]:
     """Create a new database session for a test."""
     connection = engine.connect()
     transaction = connection.begin()
-    session = Session(bind=connection)
+    session = RoutingSession(bind=connection)
 
     yield session
 
     session.close()
     transaction.rollback()
     connection.close()
+
+
+@pytest.fixture
+def async_sessions(tmp_path) -> sessionmaker:
+    """Create async sessions on a new SQLite database file.
+
+    Connections are not pooled, so each test's event loop opens
+    its own.
+    """
+    path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}", poolclass=NullPool
+    )
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def set_foreign_keys_pragma(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    return sessionmaker(
+        async_engine,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        expire_on_commit=False,
+    )
@@ -2,6 +2,7 @@
 
 import pytest
 from datetime import datetime
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
@@ -136,6 +137,7 @@ def test_cascade_delete_from_event_type(
     event = LifeEvent(**sample_life_event)
     db.add(event)
     db.commit()
+    event_id = event.id
 
     # Delete the event type
     event_type = (
@@ -148,6 +150,23 @@ def test_cascade_delete_from_event_type(
 
     # Verify event was deleted
     deleted_event = (
-        db.query(LifeEvent).filter_by(id=event.id).first()
+        db.query(LifeEvent).filter_by(id=event_id).first()
     )
     assert deleted_event is None
+
+
+def test_timestamp_indexes(db: Session):
+    """Test that time range queries are backed by indexes."""
+    indexes = {
+        index["name"]: index["column_names"]
+        for index in inspect(db.get_bind()).get_indexes(
+            "life_events"
+        )
+    }
+
+    assert indexes[
+        "ix_life_events_event_type_id_timestamp"
+    ] == ["event_type_id", "timestamp"]
+    assert indexes["ix_life_events_timestamp"] == [
+        "timestamp"
+    ]
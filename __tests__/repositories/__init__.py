@@ -0,0 +1 @@
+"""Repository test package."""
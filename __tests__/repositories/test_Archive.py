@@ -0,0 +1,291 @@
+"""Test cases for the cold storage of life events."""
+
+import asyncio
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models.EventTypeModel import EventType
+from models.LifeEventModel import LifeEvent
+from repositories import Archive
+from repositories.Archive import (
+    Conditions,
+    SegmentArchive,
+    merge_async_events,
+    merge_events,
+    window,
+)
+from repositories.DataField import DataField
+from repositories.LifeEventRepository import (
+    LifeEventRepository,
+)
+
+
+def event(
+    id: int, timestamp: datetime, **data
+) -> LifeEvent:
+    return LifeEvent(
+        id=id,
+        timestamp=timestamp,
+        event_type_id=data.pop("event_type_id", 1),
+        data=data,
+    )
+
+
+@pytest.fixture
+def archive(tmp_path) -> SegmentArchive:
+    """Create an archive with two months of events."""
+    archive = SegmentArchive(str(tmp_path))
+    archive.write(
+        date(2023, 1, 1),
+        [
+            event(1, datetime(2023, 1, 5), mood=3),
+            event(4, datetime(2023, 1, 20), mood=8),
+        ],
+    )
+    archive.write(
+        date(2023, 2, 1),
+        [event(2, datetime(2023, 2, 1), event_type_id=2)],
+    )
+    # A later run for a month already archived
+    archive.write(
+        date(2023, 1, 1),
+        [event(9, datetime(2023, 1, 10), mood=5)],
+    )
+    return archive
+
+
+def ids(events) -> list:
+    return [event.id for event in events]
+
+
+def test_write_appends_segments(
+    archive: SegmentArchive, tmp_path
+) -> None:
+    """Test that segments are immutable and listed."""
+    names = [
+        segment["name"] for segment in archive.segments()
+    ]
+    assert names == [
+        "life_events-2023-01-0000.jsonl.gz",
+        "life_events-2023-02-0000.jsonl.gz",
+        "life_events-2023-01-0001.jsonl.gz",
+    ]
+    assert archive.archived_until() == date(2023, 3, 1)
+    assert archive.write(date(2023, 3, 1), []) is None
+    assert SegmentArchive(str(tmp_path)).get(9).data == {
+        "mood": 5
+    }
+    assert archive.get(3) is None
+
+
+def test_events_apply_conditions(
+    archive: SegmentArchive,
+) -> None:
+    """Test that archived events are filtered in order."""
+    assert ids(archive.events(Conditions())) == [1, 9, 4, 2]
+    assert ids(
+        archive.events(Conditions(event_type_id=2))
+    ) == [2]
+    assert ids(
+        archive.events(
+            Conditions(
+                start_date=datetime(2023, 1, 6),
+                end_date=datetime(2023, 1, 31),
+            )
+        )
+    ) == [9, 4]
+    assert ids(
+        archive.events(
+            Conditions(
+                data_filters=[
+                    (
+                        DataField(1, "mood", "number"),
+                        "gte",
+                        5.0,
+                    )
+                ]
+            )
+        )
+    ) == [9, 4]
+    assert ids(
+        archive.events(
+            Conditions(after=(datetime(2023, 1, 10), 9))
+        )
+    ) == [4, 2]
+
+
+def test_reaches_only_archived_ranges(
+    archive: SegmentArchive,
+) -> None:
+    """Test that recent ranges skip the archive."""
+    assert archive.reaches(Conditions())
+    assert archive.reaches(
+        Conditions(start_date=datetime(2023, 2, 28))
+    )
+    assert not archive.reaches(
+        Conditions(start_date=datetime(2023, 3, 1))
+    )
+    # Listings of types the archive never held skip it too
+    assert not archive.reaches(Conditions(event_type_id=3))
+
+
+def test_get_opens_only_segments_holding_the_id(
+    archive: SegmentArchive, monkeypatch
+) -> None:
+    """Test that id filters keep lookups out of segments."""
+    opened = []
+    read_segment = Archive._read_segment
+    monkeypatch.setattr(
+        Archive,
+        "_read_segment",
+        lambda path: opened.append(path)
+        or read_segment(path),
+    )
+
+    # Within the January id range, but in no segment
+    assert archive.get(3) is None
+    assert opened == []
+    assert archive.get(4).id == 4
+    assert len(opened) == 1
+
+
+def test_archived_events_are_copies(
+    archive: SegmentArchive,
+) -> None:
+    """Test that changing a read event leaves the cache intact."""
+    archive.get(9).data["mood"] = 0
+    [*_, last] = archive.events(Conditions(event_type_id=1))
+    last.data.clear()
+
+    assert archive.get(9).data == {"mood": 5}
+    assert archive.get(4).data == {"mood": 8}
+
+
+def test_archive_before_moves_months(
+    db: Session, tmp_path
+) -> None:
+    """Test that old months move to segments and leave the table."""
+    event_type = EventType(name="mood")
+    db.add(event_type)
+    db.flush()
+    for day in (5, 40, 70):
+        db.add(
+            LifeEvent(
+                event_type_id=event_type.id,
+                timestamp=datetime(2023, 1, 1)
+                + timedelta(days=day),
+                data={"day": day},
+            )
+        )
+    db.commit()
+    repository = LifeEventRepository(db)
+    repository.archive = SegmentArchive(str(tmp_path))
+
+    assert repository.archive_before(date(2023, 3, 1)) == 2
+    assert [
+        segment["count"]
+        for segment in repository.archive.segments()
+    ] == [1, 1]
+    assert [
+        event.data["day"]
+        for event in db.execute(select(LifeEvent)).scalars()
+    ] == [70]
+
+
+def test_archived_months_count_and_follow_event_types(
+    db: Session, tmp_path
+) -> None:
+    """Test that stats count archived events of live types."""
+    mood, walk = EventType(name="mood"), EventType(
+        name="walk"
+    )
+    db.add_all([mood, walk])
+    db.flush()
+    for event_type, day in (
+        (mood, 5),
+        (walk, 6),
+        (mood, 40),
+    ):
+        db.add(
+            LifeEvent(
+                event_type_id=event_type.id,
+                timestamp=datetime(2023, 1, 1)
+                + timedelta(days=day),
+                data={},
+            )
+        )
+    mood_id, walk_id = mood.id, walk.id
+    db.commit()
+    repository = LifeEventRepository(db)
+    repository.archive = SegmentArchive(str(tmp_path))
+    repository.archive_before(date(2023, 2, 1))
+
+    assert repository.count_by_bucket("month") == [
+        (datetime(2023, 1, 1), mood_id, 1),
+        (datetime(2023, 1, 1), walk_id, 1),
+        (datetime(2023, 2, 1), mood_id, 1),
+    ]
+    [archived_walk] = repository.list(event_type_id=walk_id)
+
+    db.delete(db.get(EventType, walk_id))
+    db.commit()
+    assert repository.get(archived_walk.id) is None
+    assert [
+        event.event_type_id for event in repository.list()
+    ] == [mood_id, mood_id]
+    assert repository.count_by_bucket("week") == [
+        (datetime(2023, 1, 2), mood_id, 1),
+        (datetime(2023, 2, 6), mood_id, 1),
+    ]
+
+
+def test_merge_events_orders_and_deduplicates() -> None:
+    """Test that tiers merge by timestamp and id, once each."""
+    archived = [
+        event(1, datetime(2023, 1, 5)),
+        event(3, datetime(2023, 1, 9)),
+    ]
+    hot = [
+        event(2, datetime(2023, 1, 7)),
+        event(3, datetime(2023, 1, 9)),
+        event(5, datetime(2024, 1, 1)),
+    ]
+    assert ids(merge_events(archived, hot)) == [1, 2, 3, 5]
+
+
+def test_async_merge_reads_the_archive_lazily() -> None:
+    """Test that archived events are read a batch at a time."""
+    read = []
+
+    def archived():
+        for id in range(1, 20, 2):
+            read.append(id)
+            yield event(id, datetime(2023, 1, id))
+
+    async def hot():
+        for id in range(2, 21, 2):
+            # Never more than a batch ahead of the stream
+            assert len(read) <= id // 2 + 3
+            yield event(id, datetime(2023, 1, id))
+
+    async def merged():
+        return [
+            event.id
+            async for event in merge_async_events(
+                archived(), hot(), batch_size=3
+            )
+        ]
+
+    assert asyncio.run(merged()) == list(range(1, 21))
+
+
+def test_window() -> None:
+    """Test that keyset pages ignore the offset."""
+    assert window(10, 20, None) == (20, 30)
+    assert window(10, 20, (datetime(2023, 1, 1), 1)) == (
+        0,
+        10,
+    )
+    assert window(None, 5, None) == (5, None)
@@ -0,0 +1,151 @@
+"""Test cases for AsyncLifeEventRepository."""
+
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import select
+
+from models.DailyEventCountModel import DailyEventCount
+from models.EventTypeModel import EventType
+from models.LifeEventModel import LifeEvent
+from repositories.AsyncLifeEventRepository import (
+    AsyncLifeEventRepository,
+)
+
+
+async def add_event_types(db, *names: str):
+    event_types = [EventType(name=name) for name in names]
+    db.add_all(event_types)
+    await db.commit()
+    return event_types
+
+
+async def daily_counts(db):
+    result = await db.execute(
+        select(
+            DailyEventCount.day,
+            DailyEventCount.event_type_id,
+            DailyEventCount.count,
+        ).order_by(DailyEventCount.day)
+    )
+    return [tuple(row) for row in result]
+
+
+def test_create_get_and_list(async_sessions) -> None:
+    """Test that created events are read back in order."""
+
+    async def scenario():
+        async with async_sessions() as db:
+            [mood] = await add_event_types(db, "mood")
+            repository = AsyncLifeEventRepository(db)
+            for hour in (9, 7, 8):
+                await repository.create(
+                    LifeEvent(
+                        event_type_id=mood.id,
+                        timestamp=datetime(
+                            2024, 5, 15, hour
+                        ),
+                        data={"hour": hour},
+                    )
+                )
+            await repository.create_many(
+                [
+                    {
+                        "event_type_id": mood.id,
+                        "timestamp": datetime(2024, 5, 16),
+                        "data": {"hour": 0},
+                    }
+                ]
+            )
+
+            events = await repository.list(limit=2)
+            rest = await repository.list(
+                after=(events[-1].timestamp, events[-1].id)
+            )
+            fetched = await repository.get(
+                events[0].id, columns=("event_type_id",)
+            )
+            return (
+                events + rest,
+                fetched,
+                await daily_counts(db),
+            )
+
+    events, fetched, counts = asyncio.run(scenario())
+    assert [event.data["hour"] for event in events] == [
+        7,
+        8,
+        9,
+        0,
+    ]
+    assert fetched.timestamp == datetime(2024, 5, 15, 7)
+    assert [count for *_, count in counts] == [3, 1]
+
+
+def test_update_moves_the_daily_count(
+    async_sessions,
+) -> None:
+    """Test that updates write the changed columns and counts."""
+
+    async def scenario():
+        async with async_sessions() as db:
+            mood, walk = await add_event_types(
+                db, "mood", "walk"
+            )
+            repository = AsyncLifeEventRepository(db)
+            event = await repository.create(
+                LifeEvent(
+                    event_type_id=mood.id,
+                    timestamp=datetime(2024, 5, 15, 9),
+                    data={"energy": 3},
+                )
+            )
+            updated = await repository.update(
+                event.id, {"event_type_id": walk.id}
+            )
+            missing = await repository.update(
+                event.id + 1, {"data": {}}
+            )
+            return (
+                walk.id,
+                updated,
+                missing,
+                await daily_counts(db),
+            )
+
+    walk_id, updated, missing, counts = asyncio.run(
+        scenario()
+    )
+    assert updated.event_type_id == walk_id
+    assert updated.data == {"energy": 3}
+    assert missing is None
+    assert [
+        (event_type_id, count)
+        for _, event_type_id, count in counts
+        if count
+    ] == [(walk_id, 1)]
+
+
+def test_delete_removes_the_event(async_sessions) -> None:
+    """Test that deletes drop the event and its count."""
+
+    async def scenario():
+        async with async_sessions() as db:
+            [mood] = await add_event_types(db, "mood")
+            repository = AsyncLifeEventRepository(db)
+            event = await repository.create(
+                LifeEvent(
+                    event_type_id=mood.id,
+                    timestamp=datetime(2024, 5, 15, 9),
+                    data={},
+                )
+            )
+            await repository.delete(event.id)
+            return (
+                await repository.get(event.id),
+                await daily_counts(db),
+            )
+
+    event, counts = asyncio.run(scenario())
+    assert event is None
+    assert not any(count for *_, count in counts)
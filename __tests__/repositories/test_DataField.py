@@ -0,0 +1,172 @@
+"""Test cases for indexed payload field filters."""
+
+import pytest
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql, postgresql
+from sqlalchemy.orm import Session
+
+from models.EventTypeModel import EventType
+from models.LifeEventModel import LifeEvent
+from repositories.DataField import (
+    DataField,
+    data_field_condition,
+    data_field_index,
+    data_field_indexes,
+    declared_fields,
+    indexed_fields_error,
+)
+from seeds.event_types import INITIAL_EVENT_TYPES
+
+
+def seed_schema(name: str):
+    return next(
+        event_type["schema"]
+        for event_type in INITIAL_EVENT_TYPES
+        if event_type["name"] == name
+    )
+
+
+def plan(db: Session, query) -> str:
+    statement = query.compile(
+        dialect=db.get_bind().dialect,
+        compile_kwargs={"literal_binds": True},
+    )
+    return str(
+        db.connection()
+        .exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}")
+        .all()
+    )
+
+
+def test_declared_fields() -> None:
+    """Test that top-level numbers and strings can be filtered."""
+    assert declared_fields(3, seed_schema("exercise")) == {
+        "type": DataField(3, "type", "string", 8),
+        "duration": DataField(3, "duration", "number"),
+        "distance": DataField(3, "distance", "number"),
+        "calories_burned": DataField(
+            3, "calories_burned", "number"
+        ),
+    }
+    assert declared_fields(3, None) == {}
+
+
+def test_only_listed_fields_are_indexed() -> None:
+    """Test that indexes are opt-in and stay out of metadata."""
+    indexes = data_field_indexes(3, seed_schema("exercise"))
+
+    assert [index.name for index in indexes] == [
+        "ix_event_data_3_type_s8",
+        "ix_event_data_3_duration_n",
+    ]
+    assert not set(indexes) & LifeEvent.__table__.indexes
+    assert data_field_indexes(5, seed_schema("note")) == []
+
+
+@pytest.mark.parametrize(
+    "event_schema",
+    [
+        {"x-indexed": "type"},
+        {"x-indexed": ["mood"]},
+        {
+            "properties": {"notes": {"type": "string"}},
+            "x-indexed": ["notes"],
+        },
+        {
+            "properties": {
+                "notes": {
+                    "type": "string",
+                    "maxLength": 4096,
+                }
+            },
+            "x-indexed": ["notes"],
+        },
+    ],
+)
+def test_unindexable_fields_rejected(event_schema) -> None:
+    """Test that only bounded strings and numbers are indexed."""
+    assert indexed_fields_error(event_schema)
+    assert data_field_indexes(1, event_schema) == []
+
+
+def test_indexes_are_per_event_type() -> None:
+    """Test that each index only covers its own event type."""
+    field = DataField(7, "type", "string", 8)
+    index = data_field_index(field)
+
+    assert str(
+        index.dialect_options["postgresql"][
+            "where"
+        ].compile(dialect=postgresql.dialect())
+    ) == ("life_events.event_type_id = 7")
+    # MySQL has no partial indexes, so other types are NULL
+    condition = str(
+        data_field_condition(field, "eq", "run").compile(
+            dialect=mysql.dialect()
+        )
+    )
+    assert (
+        "CASE WHEN life_events.event_type_id = 7"
+        in condition
+    )
+    assert "AS CHAR(8)" in condition
+    unindexed = str(
+        data_field_condition(
+            DataField(7, "notes", "string"), "eq", "x"
+        ).compile(dialect=mysql.dialect())
+    )
+    assert "CAST" not in unindexed
+
+
+def test_filter_uses_index(db: Session) -> None:
+    """Test that payload filters match their expression index."""
+    exercise, note = EventType(name="exercise"), EventType(
+        name="note"
+    )
+    db.add_all([exercise, note])
+    db.flush()
+    for event_type, data in (
+        (exercise, {"type": "run", "duration": 45}),
+        (exercise, {"type": "swim", "duration": 30}),
+        # The same names with other kinds in another type
+        (note, {"type": {"run": True}, "duration": "long"}),
+    ):
+        db.add(
+            LifeEvent(
+                event_type_id=event_type.id,
+                timestamp=datetime(2024, 5, 15),
+                data=data,
+            )
+        )
+    db.flush()
+    fields = declared_fields(
+        exercise.id, seed_schema("exercise")
+    )
+    for index in data_field_indexes(
+        exercise.id, seed_schema("exercise")
+    ):
+        index.create(bind=db.connection())
+
+    query = select(LifeEvent.id).where(
+        data_field_condition(fields["type"], "eq", "run"),
+        data_field_condition(fields["duration"], "gte", 40),
+    )
+    assert len(db.execute(query).all()) == 1
+
+    assert f"ix_event_data_{exercise.id}_type_s8" in plan(
+        db,
+        select(LifeEvent.id).where(
+            data_field_condition(
+                fields["type"], "eq", "run"
+            )
+        ),
+    )
+
+
+def test_unsafe_field_rejected() -> None:
+    """Test that field names are never inlined unchecked."""
+    with pytest.raises(ValueError):
+        data_field_index(
+            DataField(1, "type') OR 1=1 --", "string", 8)
+        )
@@ -0,0 +1,129 @@
+"""Test cases for monthly partitions of life events."""
+
+import pytest
+from datetime import date, datetime
+from types import SimpleNamespace
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models.DailyEventCountModel import DailyEventCount
+from models.EventTypeModel import EventType
+from models.LifeEventModel import LifeEvent
+from repositories.Partition import (
+    _partition_table,
+    add_months,
+    add_partitions_statement,
+    drop_before,
+    drop_partitions_statement,
+    month_range,
+    partition_statement,
+)
+
+
+def test_month_range_crosses_years() -> None:
+    """Test that months are listed across a year boundary."""
+    assert add_months(date(2023, 11, 1), 3) == date(
+        2024, 2, 1
+    )
+    assert month_range(
+        date(2023, 11, 15), date(2024, 1, 1)
+    ) == [
+        date(2023, 11, 1),
+        date(2023, 12, 1),
+        date(2024, 1, 1),
+    ]
+
+
+def test_partition_statements() -> None:
+    """Test the MySQL partition definitions."""
+    months = [date(2023, 12, 1), date(2024, 1, 1)]
+    statement = partition_statement(months)
+    assert "ADD PRIMARY KEY (id, timestamp)" in statement
+    assert (
+        "PARTITION BY RANGE COLUMNS(timestamp)" in statement
+    )
+    assert (
+        "PARTITION p202312 VALUES LESS THAN ('2024-01-01'), "
+        "PARTITION p202401 VALUES LESS THAN ('2024-02-01'), "
+        "PARTITION p_future VALUES LESS THAN (MAXVALUE)"
+    ) in statement
+
+    assert add_partitions_statement([date(2024, 2, 1)]) == (
+        "ALTER TABLE life_events "
+        "REORGANIZE PARTITION p_future INTO "
+        "(PARTITION p202402 VALUES LESS THAN ('2024-03-01'), "
+        "PARTITION p_future VALUES LESS THAN (MAXVALUE))"
+    )
+    assert drop_partitions_statement(months) == (
+        "ALTER TABLE life_events "
+        "DROP PARTITION p202312, p202401"
+    )
+
+
+def test_drop_before_deletes_rows(db: Session) -> None:
+    """Test that unpartitioned tables delete old rows."""
+    event_type = EventType(name="test_type")
+    db.add(event_type)
+    db.flush()
+    for timestamp in (
+        datetime(2024, 1, 31, 23, 59),
+        datetime(2024, 2, 1),
+    ):
+        db.add(
+            LifeEvent(
+                event_type_id=event_type.id,
+                timestamp=timestamp,
+                data={},
+            )
+        )
+        db.add(
+            DailyEventCount(
+                day=timestamp.date(),
+                event_type_id=event_type.id,
+                count=1,
+            )
+        )
+    db.flush()
+
+    drop_before(db.connection(), date(2024, 2, 1))
+
+    assert db.execute(
+        select(LifeEvent.timestamp)
+    ).scalars().all() == [datetime(2024, 2, 1)]
+    assert db.execute(
+        select(DailyEventCount.day)
+    ).scalars().all() == [date(2024, 2, 1)]
+
+
+def test_drop_before_needs_month_start(db: Session) -> None:
+    """Test that cutoffs inside a month are rejected."""
+    with pytest.raises(ValueError):
+        drop_before(db.connection(), date(2024, 2, 15))
+
+
+def test_partitioning_keeps_other_tables_indexes() -> None:
+    """Test that only life_events' search index is dropped."""
+    statements = []
+
+    def execute(statement, *args):
+        statements.append(str(statement))
+        # As if only another table had an index of the name
+        return SimpleNamespace(
+            first=lambda: None,
+            scalars=lambda: [],
+            scalar=lambda: None,
+        )
+
+    connection = SimpleNamespace(
+        dialect=SimpleNamespace(name="mysql"),
+        execute=execute,
+    )
+    _partition_table(connection, 1, date(2024, 5, 15))
+
+    [lookup] = [
+        statement
+        for statement in statements
+        if "information_schema.statistics" in statement
+    ]
+    assert "table_name = 'life_events'" in lookup
+    assert not any("DROP INDEX" in s for s in statements)
@@ -0,0 +1,149 @@
+"""Test cases for writes that read their result back."""
+
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql.base import PGCompiler
+from sqlalchemy.dialects.sqlite.base import SQLiteCompiler
+from sqlalchemy.orm import Session
+
+from models.EventTypeModel import EventType
+from models.LifeEventModel import LifeEvent
+from repositories.EventTypeRepository import (
+    EventTypeRepository,
+)
+from repositories.LifeEventRepository import (
+    LifeEventRepository,
+)
+from repositories.Returning import supports_returning
+
+
+@contextmanager
+def statements(engine):
+    """Collect the SQL statements run on an engine."""
+    executed = []
+
+    def collect(connection, cursor, statement, *args):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", collect)
+    try:
+        yield executed
+    finally:
+        event.remove(
+            engine, "before_cursor_execute", collect
+        )
+
+
+def life_event_reads(executed):
+    return [
+        statement
+        for statement in executed
+        if statement.startswith("SELECT")
+        and "FROM life_events" in statement
+    ]
+
+
+@pytest.fixture
+def returning(db: Session, monkeypatch) -> None:
+    """Let SQLite run UPDATE ... RETURNING, as it can since 3.35."""
+    monkeypatch.setattr(
+        SQLiteCompiler,
+        "returning_clause",
+        PGCompiler.returning_clause,
+    )
+    monkeypatch.setattr(
+        db.get_bind().dialect, "full_returning", True
+    )
+
+
+@pytest.fixture
+def life_event(db: Session) -> LifeEvent:
+    """Create a life event with a committed event type."""
+    event_type = EventType(name="mood")
+    db.add(event_type)
+    db.flush()
+    life_event = LifeEvent(
+        event_type_id=event_type.id,
+        timestamp=datetime(2024, 5, 15, 9),
+        data={"energy": 3},
+    )
+    db.add(life_event)
+    db.commit()
+    db.refresh(life_event)
+    # Updates start from an empty identity map, as requests do
+    db.expunge_all()
+    return life_event
+
+
+def test_update_reads_back_by_rowcount(
+    engine, db: Session, life_event: LifeEvent
+) -> None:
+    """Test that dialects without RETURNING read the row again."""
+    assert not supports_returning(db)
+    repository = LifeEventRepository(db)
+
+    with statements(engine) as executed:
+        updated = repository.update(
+            life_event.id, {"data": {"energy": 4}}
+        )
+    assert updated.data == {"energy": 4}
+    assert updated.timestamp == life_event.timestamp
+    assert len(life_event_reads(executed)) == 1
+
+    assert (
+        repository.update(life_event.id + 1, {"data": {}})
+        is None
+    )
+
+
+def test_update_returns_the_row(
+    engine, db: Session, life_event: LifeEvent, returning
+) -> None:
+    """Test that RETURNING updates read nothing back."""
+    assert supports_returning(db)
+    repository = LifeEventRepository(db)
+
+    with statements(engine) as executed:
+        updated = repository.update(
+            life_event.id, {"data": {"energy": 5}}
+        )
+    assert updated.data == {"energy": 5}
+    assert updated.timestamp == life_event.timestamp
+    assert updated in db
+    assert life_event_reads(executed) == []
+    assert any("RETURNING" in s for s in executed)
+
+    assert (
+        repository.update(life_event.id + 1, {"data": {}})
+        is None
+    )
+    # Relationships still load from the merged instance
+    assert updated.event_type.name == "mood"
+
+
+def test_event_type_update_paths(
+    db: Session, life_event: LifeEvent, monkeypatch
+) -> None:
+    """Test that both event type update paths agree."""
+    repository = EventTypeRepository(db)
+    updated = repository.update(
+        life_event.event_type_id, {"icon": "smile"}
+    )
+    assert (updated.name, updated.icon) == ("mood", "smile")
+
+    monkeypatch.setattr(
+        SQLiteCompiler,
+        "returning_clause",
+        PGCompiler.returning_clause,
+    )
+    monkeypatch.setattr(
+        db.get_bind().dialect, "full_returning", True
+    )
+    updated = repository.update(
+        life_event.event_type_id, {"icon": "frown"}
+    )
+    assert (updated.name, updated.icon) == ("mood", "frown")
+    assert repository.update(404, {"icon": "x"}) is None
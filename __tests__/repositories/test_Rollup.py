@@ -0,0 +1,137 @@
+"""Test cases for the daily event count rollups."""
+
+import pytest
+from collections import Counter
+from datetime import date, datetime
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models.DailyEventCountModel import DailyEventCount
+from models.EventTypeModel import EventType
+from models.LifeEventModel import LifeEvent
+from repositories.Rollup import (
+    delta_statements,
+    move_deltas,
+    rebuild_statements,
+    rollup_key,
+    summary_statement,
+)
+
+
+@pytest.fixture
+def event_type(db: Session) -> EventType:
+    """Create a sample event type for testing."""
+    event_type = EventType(name="test_type")
+    db.add(event_type)
+    db.flush()
+    return event_type
+
+
+def apply(db: Session, deltas) -> None:
+    for statement in delta_statements("sqlite", deltas):
+        db.execute(statement)
+
+
+def counts(db: Session):
+    return {
+        (row.day, row.event_type_id): row.count
+        for row in db.execute(
+            select(DailyEventCount)
+        ).scalars()
+    }
+
+
+def test_deltas_accumulate(
+    db: Session, event_type: EventType
+) -> None:
+    """Test that increments add up and zero counts vanish."""
+    day = date(2024, 5, 15)
+    key = (day, event_type.id)
+
+    apply(db, {key: 2})
+    apply(db, {key: 1})
+    assert counts(db) == {key: 3}
+
+    apply(db, {key: -1})
+    assert counts(db) == {key: 2}
+
+    apply(db, {key: -2})
+    assert counts(db) == {}
+
+
+def test_move_deltas(event_type: EventType) -> None:
+    """Test that only a new day or type moves an event."""
+    old = LifeEvent(
+        timestamp=datetime(2024, 5, 15, 8),
+        event_type_id=event_type.id,
+    )
+    old_key = rollup_key(old.timestamp, old.event_type_id)
+
+    same_day = move_deltas(
+        old, {"timestamp": datetime(2024, 5, 15, 20)}
+    )
+    assert delta_statements("sqlite", same_day) == []
+
+    next_day = move_deltas(
+        old, {"timestamp": datetime(2024, 5, 16, 8)}
+    )
+    assert next_day == Counter(
+        {old_key: -1, (date(2024, 5, 16), event_type.id): 1}
+    )
+
+
+def test_rebuild_and_summary(
+    db: Session, event_type: EventType
+) -> None:
+    """Test that a rebuild matches the events it summarizes."""
+    for timestamp in (
+        datetime(2024, 5, 13, 9),
+        datetime(2024, 5, 15, 9),
+        datetime(2024, 5, 15, 23, 59),
+        datetime(2024, 5, 20, 0, 0),
+    ):
+        db.add(
+            LifeEvent(
+                timestamp=timestamp,
+                event_type_id=event_type.id,
+                data={},
+            )
+        )
+    db.flush()
+
+    for statement in rebuild_statements():
+        db.execute(statement)
+    assert counts(db) == {
+        (date(2024, 5, 13), event_type.id): 1,
+        (date(2024, 5, 15), event_type.id): 2,
+        (date(2024, 5, 20), event_type.id): 1,
+    }
+
+    rows = db.execute(
+        summary_statement("week", end_day=date(2024, 5, 19))
+    ).all()
+    assert [tuple(row) for row in rows] == [
+        (datetime(2024, 5, 13), event_type.id, 3)
+    ]
+
+
+def test_rebuild_since_keeps_older_days(
+    db: Session, event_type: EventType
+) -> None:
+    """Test that days before `since` keep their counts."""
+    apply(db, {(date(2023, 1, 5), event_type.id): 4})
+    db.add(
+        LifeEvent(
+            timestamp=datetime(2024, 5, 13, 9),
+            event_type_id=event_type.id,
+            data={},
+        )
+    )
+    db.flush()
+
+    for statement in rebuild_statements(date(2024, 1, 1)):
+        db.execute(statement)
+    assert counts(db) == {
+        (date(2023, 1, 5), event_type.id): 4,
+        (date(2024, 5, 13), event_type.id): 1,
+    }
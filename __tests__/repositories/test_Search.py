@@ -0,0 +1,136 @@
+"""Test cases for full-text search over event payloads."""
+
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from sqlalchemy import delete, update
+from sqlalchemy.orm import Session
+
+from models.EventTypeModel import EventType
+from models.LifeEventModel import LifeEvent
+from repositories.Search import (
+    SearchUnavailable,
+    create_search_index,
+    search_index_exists,
+    search_statement,
+)
+
+
+@pytest.fixture
+def note_type(db: Session) -> EventType:
+    """Create a note event type with a search index."""
+    create_search_index(db.connection())
+    event_type = EventType(name="note")
+    db.add(event_type)
+    db.flush()
+    return event_type
+
+
+def add_note(
+    db: Session, event_type: EventType, data
+) -> int:
+    event = LifeEvent(
+        event_type_id=event_type.id,
+        timestamp=datetime(2024, 5, 15),
+        data=data,
+    )
+    db.add(event)
+    db.flush()
+    return event.id
+
+
+def search(db: Session, query: str, **kwargs):
+    return [
+        event.id
+        for event, _ in db.execute(
+            search_statement("sqlite", query, **kwargs)
+        )
+    ]
+
+
+def test_search_ranks_matches(
+    db: Session, note_type: EventType
+) -> None:
+    """Test that nested strings are indexed and ranked."""
+    once = add_note(
+        db, note_type, {"content": "a walk in the park"}
+    )
+    twice = add_note(
+        db,
+        note_type,
+        {"content": "park run", "tags": ["park"]},
+    )
+    add_note(db, note_type, {"content": "quiet day"})
+
+    assert search(db, "park") == [twice, once]
+    assert search(db, "park", limit=1, start=1) == [once]
+    assert search(db, "park walk") == [once]
+
+
+def test_search_follows_writes(
+    db: Session, note_type: EventType
+) -> None:
+    """Test that updates and deletes keep the index in sync."""
+    event_id = add_note(db, note_type, {"content": "draft"})
+
+    db.execute(
+        update(LifeEvent)
+        .where(LifeEvent.id == event_id)
+        .values(data={"content": "final"})
+    )
+    assert search(db, "draft") == []
+    assert search(db, "final") == [event_id]
+
+    db.execute(
+        delete(LifeEvent).where(LifeEvent.id == event_id)
+    )
+    assert search(db, "final") == []
+
+
+def test_search_query_syntax_is_literal(
+    db: Session, note_type: EventType
+) -> None:
+    """Test that FTS5 operators in a query are plain words."""
+    event_id = add_note(
+        db, note_type, {"content": 'said "NOT" twice'}
+    )
+
+    assert search(db, 'NOT "') == [event_id]
+
+
+def test_search_unsupported_dialect() -> None:
+    """Test that unsupported databases say search is unavailable."""
+    with pytest.raises(SearchUnavailable):
+        search_statement("oracle", "walk")
+
+
+class RecordingConnection:
+    """Records the SQL run on it, as a connection of a dialect."""
+
+    def __init__(self, dialect_name: str) -> None:
+        self.dialect = SimpleNamespace(name=dialect_name)
+        self.statements = []
+
+    def execute(self, statement, *args):
+        self.statements.append(str(statement))
+        return SimpleNamespace(first=lambda: None)
+
+
+@pytest.mark.parametrize(
+    "dialect_name", ["mysql", "postgresql"]
+)
+def test_search_index_lookup_is_per_table(
+    dialect_name: str,
+) -> None:
+    """Test that another table's index of the name is ignored."""
+    connection = RecordingConnection(dialect_name)
+    assert not search_index_exists(connection)
+    [statement] = connection.statements
+    assert "= 'life_events'" in statement
+
+
+def test_search_index_exists(
+    db: Session, note_type: EventType
+) -> None:
+    """Test that the index is found once created."""
+    assert search_index_exists(db.connection())
@@ -0,0 +1,77 @@
+"""Test cases for table change versions."""
+
+import pytest
+from datetime import datetime
+from sqlalchemy.orm import Session
+
+from models.EventTypeModel import EventType
+from models.LifeEventModel import LifeEvent
+from repositories.LifeEventRepository import (
+    LifeEventRepository,
+)
+from repositories.TableVersion import (
+    bump_statement,
+    versions_statement,
+)
+
+
+def versions(db: Session, *names: str):
+    return {
+        row.name: (row.version, row.updated_at)
+        for row in db.execute(
+            versions_statement(names)
+        ).scalars()
+    }
+
+
+def test_bump_creates_and_increments(db: Session) -> None:
+    """Test that bumps count writes per table."""
+    first = datetime(2024, 5, 15, 9)
+    second = datetime(2024, 5, 15, 10)
+    db.execute(
+        bump_statement("sqlite", ["life_events"], first)
+    )
+    db.execute(
+        bump_statement(
+            "sqlite", ["life_events", "event_types"], second
+        )
+    )
+    db.expire_all()
+
+    assert versions(
+        db, "life_events", "event_types", "other"
+    ) == {
+        "life_events": (2, second),
+        "event_types": (1, second),
+    }
+
+
+def test_version_commits_with_the_write(
+    db: Session, monkeypatch
+) -> None:
+    """Test that a write never commits without its version."""
+    event_type = EventType(name="mood")
+    db.add(event_type)
+    db.commit()
+    repository = LifeEventRepository(db)
+
+    def interrupted(*names: str) -> None:
+        raise SystemExit
+
+    # The process stops between the commit and the invalidation
+    monkeypatch.setattr(
+        repository.versions, "publish", interrupted
+    )
+    with pytest.raises(SystemExit):
+        repository.create(
+            LifeEvent(
+                event_type_id=event_type.id,
+                timestamp=datetime(2024, 5, 15),
+                data={},
+            )
+        )
+
+    assert db.query(LifeEvent).count() == 1
+    assert (
+        versions(db, "life_events")["life_events"][0] == 1
+    )
@@ -0,0 +1 @@
+"""Router test package."""
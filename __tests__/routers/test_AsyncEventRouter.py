@@ -0,0 +1,211 @@
+"""Test cases for the async life event and event type routes."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from configs.AsyncDatabase import get_async_db
+from routers.Conditional import (
+    NotModified,
+    not_modified_handler,
+)
+from routers.v1.AsyncEventRouter import (
+    router as AsyncEventRouter,
+)
+from routers.v1.AsyncEventTypeRouter import (
+    router as AsyncEventTypeRouter,
+)
+from services.EventTypeCache import event_type_cache
+from services.ResultCache import result_cache
+
+
+@pytest.fixture
+def client(async_sessions) -> TestClient:
+    """Create a client of the async routes on a new database."""
+    event_type_cache.invalidate()
+    result_cache.clear()
+
+    async def get_test_db():
+        async with async_sessions() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(AsyncEventRouter)
+    app.include_router(AsyncEventTypeRouter)
+    app.add_exception_handler(
+        NotModified, not_modified_handler
+    )
+    app.dependency_overrides[get_async_db] = get_test_db
+    return TestClient(app)
+
+
+@pytest.fixture
+def mood(client: TestClient) -> int:
+    """Create an event type with a schema."""
+    response = client.post(
+        "/api/v1/event-types/",
+        json={
+            "name": "mood",
+            "event_schema": {
+                "type": "object",
+                "properties": {
+                    "energy": {"type": "integer"}
+                },
+            },
+        },
+    )
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def test_events_round_trip(
+    client: TestClient, mood: int
+) -> None:
+    """Test creating, reading, updating and deleting events."""
+    created = client.post(
+        "/api/v1/events/",
+        json={
+            "event_type_id": mood,
+            "timestamp": "2024-05-15T09:00:00",
+            "data": {"energy": 3},
+        },
+    ).json()
+
+    fetched = client.get(f"/api/v1/events/{created['id']}")
+    assert fetched.json() == created
+
+    updated = client.put(
+        f"/api/v1/events/{created['id']}",
+        json={"data": {"energy": 4}},
+    )
+    assert updated.json()["data"] == {"energy": 4}
+    assert client.get("/api/v1/events/").json() == [
+        updated.json()
+    ]
+
+    assert (
+        client.delete(
+            f"/api/v1/events/{created['id']}"
+        ).status_code
+        == 200
+    )
+    assert (
+        client.get(
+            f"/api/v1/events/{created['id']}"
+        ).status_code
+        == 404
+    )
+
+
+def test_writes_are_checked(
+    client: TestClient, mood: int
+) -> None:
+    """Test that unknown types and invalid data are refused."""
+    unknown = client.post(
+        "/api/v1/events/",
+        json={"event_type_id": mood + 1, "data": {}},
+    )
+    assert unknown.status_code == 404
+
+    invalid = client.post(
+        "/api/v1/events/",
+        json={
+            "event_type_id": mood,
+            "data": {"energy": "x"},
+        },
+    )
+    assert invalid.status_code == 422
+
+    created = client.post(
+        "/api/v1/events/",
+        json={"event_type_id": mood, "data": {"energy": 1}},
+    ).json()
+    invalid_update = client.put(
+        f"/api/v1/events/{created['id']}",
+        json={"data": {"energy": "x"}},
+    )
+    assert invalid_update.status_code == 422
+    assert client.get(
+        f"/api/v1/events/{created['id']}"
+    ).json()["data"] == {"energy": 1}
+
+    batch = client.post(
+        "/api/v1/events/batch",
+        json=[
+            {"event_type_id": mood, "data": {"energy": 1}},
+            {"event_type_id": mood + 1, "data": {}},
+        ],
+    )
+    assert batch.json() == {
+        "created": 1,
+        "errors": [
+            {"index": 1, "detail": "Event type not found"}
+        ],
+    }
+
+
+def test_event_type_events_are_paged(
+    client: TestClient, mood: int
+) -> None:
+    """Test that an event type's events are paged by cursor."""
+    client.post(
+        "/api/v1/events/batch",
+        json=[
+            {
+                "event_type_id": mood,
+                "timestamp": f"2024-05-15T0{hour}:00:00",
+                "data": {"energy": hour},
+            }
+            for hour in range(5)
+        ],
+    )
+    first = client.get(
+        f"/api/v1/event-types/{mood}/events?limit=3"
+    )
+    second = client.get(
+        f"/api/v1/event-types/{mood}/events?limit=3"
+        f"&cursor={first.headers['x-next-cursor']}"
+    )
+    assert [
+        event["data"]["energy"]
+        for event in first.json() + second.json()
+    ] == [0, 1, 2, 3, 4]
+    assert "x-next-cursor" not in second.headers
+
+
+def test_import_progress_is_saved(
+    client: TestClient, mood: int
+) -> None:
+    """Test that a named import saves and resumes progress."""
+    content = (
+        "timestamp,event_type_id,data\n"
+        f'2024-05-15T08:00:00,{mood},"{{""energy"":\n1}}"\n'
+        f'2024-05-15T09:00:00,{mood},"{{}}"\n'
+    )
+    assert (
+        client.get(
+            "/api/v1/events/import/csv-1"
+        ).status_code
+        == 404
+    )
+    imported = client.post(
+        "/api/v1/events/import",
+        params={"format": "csv", "import_id": "csv-1"},
+        data=content.encode(),
+    ).json()
+    assert (imported["lines"], imported["created"]) == (
+        4,
+        2,
+    )
+    assert client.get(
+        "/api/v1/events/import/csv-1"
+    ).json() == {**imported, "errors": []}
+
+    # A retry of the whole body imports nothing twice
+    retried = client.post(
+        "/api/v1/events/import",
+        params={"format": "csv", "import_id": "csv-1"},
+        data=content.encode(),
+    ).json()
+    assert retried == imported
+    assert len(client.get("/api/v1/events/").json()) == 2
@@ -0,0 +1,157 @@
+"""Test cases for Arrow and Parquet exports of life events."""
+
+import asyncio
+import io
+from datetime import datetime
+
+import pytest
+
+import models.LifeEventModel  # Maps EventType.events
+from models.EventTypeModel import EventType
+from models.LifeEventModel import LifeEvent
+from routers.Export import (
+    async_export_chunks,
+    export_chunks,
+)
+from schemas.pydantic.LifeEventSchema import ExportFormat
+
+pyarrow = pytest.importorskip("pyarrow")
+import pyarrow.parquet  # noqa: E402
+
+EVENT_TYPES = [
+    EventType(
+        id=1,
+        name="sleep",
+        event_schema={
+            "type": "object",
+            "properties": {
+                "hours": {"type": "number"},
+                "quality": {"type": ["integer", "null"]},
+                "dreams": {"type": "array"},
+                "rested": {"type": "boolean"},
+            },
+        },
+    ),
+    EventType(
+        id=2,
+        name="walk",
+        event_schema={
+            "type": "object",
+            "properties": {"quality": {"type": "string"}},
+        },
+    ),
+    EventType(id=3, name="note"),
+]
+
+
+def event(id: int, event_type_id: int, **data) -> LifeEvent:
+    return LifeEvent(
+        id=id,
+        timestamp=datetime(2024, 5, 15, 7, id),
+        event_type_id=event_type_id,
+        data=data,
+    )
+
+
+EVENTS = [
+    event(
+        1,
+        1,
+        hours=7,
+        quality=3,
+        dreams=["sea"],
+        rested=True,
+    ),
+    event(2, 1, hours="long", rested=1, extra="kept"),
+    event(3, 2, quality="good"),
+    event(4, 3, text="hello", quality=5),
+]
+
+
+def read(
+    format: ExportFormat, event_types, content=None
+) -> "pyarrow.Table":
+    content = io.BytesIO(
+        content
+        or b"".join(
+            export_chunks(format, EVENTS, event_types)
+        )
+    )
+    if format == ExportFormat.parquet:
+        return pyarrow.parquet.read_table(content)
+    return pyarrow.ipc.open_stream(content).read_all()
+
+
+@pytest.mark.parametrize(
+    "format", [ExportFormat.arrow, ExportFormat.parquet]
+)
+def test_declared_fields_are_typed_columns(format) -> None:
+    """Test that schema fields are columns, and nothing is lost."""
+    table = read(format, EVENT_TYPES[:1])
+    assert table.schema.field("timestamp").type == (
+        pyarrow.timestamp("us")
+    )
+    assert table.schema.field("data.hours").type == (
+        pyarrow.float64()
+    )
+    assert table.schema.field("data.quality").type == (
+        pyarrow.int64()
+    )
+    assert table.schema.field("data.rested").type == (
+        pyarrow.bool_()
+    )
+
+    rows = table.to_pylist()
+    assert rows[0]["data.hours"] == 7.0
+    assert rows[0]["data.dreams"] == '["sea"]'
+    assert rows[0]["data"] is None
+    # Values that do not match their type stay in data
+    assert rows[1]["data.hours"] is None
+    assert rows[1]["data"] == (
+        '{"extra":"kept","hours":"long","rested":1}'
+    )
+    # Fields are only columns for the types declaring them
+    assert rows[3]["data.quality"] is None
+    assert rows[3]["data"] == '{"text":"hello","quality":5}'
+
+
+def test_conflicting_declarations_are_json() -> None:
+    """Test that fields declared with two types are JSON."""
+    table = read(ExportFormat.arrow, EVENT_TYPES)
+    assert table.schema.field("data.quality").type == (
+        pyarrow.string()
+    )
+    assert table.column("data.quality").to_pylist() == [
+        "3",
+        None,
+        '"good"',
+        None,
+    ]
+
+
+@pytest.mark.parametrize(
+    "format", [ExportFormat.arrow, ExportFormat.parquet]
+)
+def test_async_exports_match(format) -> None:
+    """Test that async columnar exports hold the same table."""
+
+    async def scenario():
+        async def stream():
+            for event in EVENTS:
+                yield event
+
+        return [
+            chunk
+            async for chunk in async_export_chunks(
+                format, stream(), EVENT_TYPES
+            )
+        ]
+
+    chunks = asyncio.run(scenario())
+    assert len(chunks) > 1
+    assert (
+        read(
+            format, EVENT_TYPES, b"".join(chunks)
+        ).to_pylist()
+        == read(format, EVENT_TYPES).to_pylist()
+    )
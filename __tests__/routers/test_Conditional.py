@@ -0,0 +1,102 @@
+"""Test cases for conditional GETs of event types."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from configs.database import get_db
+from routers.Conditional import (
+    NotModified,
+    not_modified_handler,
+)
+from routers.v1.EventTypeRouter import (
+    router as EventTypeRouter,
+)
+from services.EventTypeCache import event_type_cache
+from services.ResultCache import result_cache
+
+
+@pytest.fixture
+def client(db: Session) -> TestClient:
+    """Create a client of the event type routes."""
+    event_type_cache.invalidate()
+    result_cache.clear()
+
+    app = FastAPI()
+    app.include_router(EventTypeRouter)
+    app.add_exception_handler(
+        NotModified, not_modified_handler
+    )
+    app.dependency_overrides[get_db] = lambda: db
+    client = TestClient(app)
+    client.post(
+        "/api/v1/event-types/", json={"name": "mood"}
+    )
+    return client
+
+
+def test_current_copies_are_not_modified(
+    client: TestClient,
+) -> None:
+    """Test that a matching ETag is answered with a bare 304."""
+    response = client.get("/api/v1/event-types/")
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+    assert response.headers["last-modified"].endswith(
+        " GMT"
+    )
+
+    for if_none_match in (etag, f'"0", W/{etag}', "*"):
+        cached = client.get(
+            "/api/v1/event-types/",
+            headers={"If-None-Match": if_none_match},
+        )
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+        assert (
+            cached.headers["last-modified"]
+            == response.headers["last-modified"]
+        )
+
+
+def test_writes_change_the_etag(client: TestClient) -> None:
+    """Test that a write within the same second is not missed."""
+    response = client.get("/api/v1/event-types/")
+    client.post(
+        "/api/v1/event-types/", json={"name": "walk"}
+    )
+
+    fresh = client.get(
+        "/api/v1/event-types/",
+        headers={
+            "If-None-Match": response.headers["etag"],
+            "If-Modified-Since": response.headers[
+                "last-modified"
+            ],
+        },
+    )
+    assert fresh.status_code == 200
+    assert [
+        event_type["name"] for event_type in fresh.json()
+    ] == ["mood", "walk"]
+    assert fresh.headers["etag"] != response.headers["etag"]
+
+
+def test_dates_alone_are_not_validators(
+    client: TestClient,
+) -> None:
+    """Test that If-Modified-Since never answers a 304."""
+    response = client.get("/api/v1/event-types/")
+
+    cached = client.get(
+        "/api/v1/event-types/",
+        headers={
+            "If-Modified-Since": response.headers[
+                "last-modified"
+            ]
+        },
+    )
+    assert cached.status_code == 200
+    assert cached.json() == response.json()
@@ -0,0 +1,110 @@
+"""Test cases for streamed exports of life events."""
+
+import asyncio
+import csv
+import io
+import json
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+import routers.Export
+from benchmarks.Serialization import life_events
+from routers.Export import (
+    CSV_COLUMNS,
+    async_export_chunks,
+    export_chunks,
+    export_response,
+)
+from schemas.pydantic.LifeEventSchema import ExportFormat
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+async def stream(events):
+    for event in events:
+        yield event
+
+
+def test_ndjson_has_one_event_per_line(monkeypatch) -> None:
+    """Test that NDJSON exports are sent in chunks of rows."""
+    monkeypatch.setattr(
+        routers.Export, "EXPORT_CHUNK_SIZE", 4
+    )
+    events = life_events(10)
+    chunks = list(
+        export_chunks(ExportFormat.ndjson, events)
+    )
+    assert len(chunks) == 3
+
+    lines = b"".join(chunks).decode("utf-8").splitlines()
+    assert [
+        json.loads(line)["id"] for line in lines
+    ] == list(range(1, 11))
+    assert json.loads(lines[0])["data"] == events[0].data
+
+
+def test_csv_has_a_header_and_json_payloads() -> None:
+    """Test that CSV exports keep payloads as a JSON column."""
+    events = life_events(3)
+    content = b"".join(
+        export_chunks(ExportFormat.csv, iter(events))
+    )
+    rows = list(csv.reader(io.StringIO(content.decode())))
+    assert tuple(rows[0]) == CSV_COLUMNS
+    assert len(rows) == 4
+    assert rows[1][1] == events[0].timestamp.isoformat()
+    assert json.loads(rows[1][3]) == events[0].data
+
+
+def test_async_exports_match(monkeypatch) -> None:
+    """Test that async exports encode the same bytes."""
+    monkeypatch.setattr(
+        routers.Export, "EXPORT_CHUNK_SIZE", 4
+    )
+    events = life_events(9)
+    for format in (ExportFormat.ndjson, ExportFormat.csv):
+        chunks = asyncio.run(
+            collect(
+                async_export_chunks(format, stream(events))
+            )
+        )
+        assert chunks == list(export_chunks(format, events))
+    assert (
+        asyncio.run(
+            collect(
+                async_export_chunks(
+                    ExportFormat.ndjson, stream([])
+                )
+            )
+        )
+        == []
+    )
+
+
+def test_exports_are_downloads() -> None:
+    """Test that exports are streamed as named attachments."""
+    response = export_response(ExportFormat.csv, iter([]))
+    assert response.media_type.startswith("text/csv")
+    assert response.headers["content-disposition"] == (
+        'attachment; filename="life_events.csv"'
+    )
+
+
+def test_csv_content_type_has_one_charset() -> None:
+    """Test that the charset Starlette adds is not repeated."""
+    app = FastAPI()
+
+    @app.get("/export")
+    def export() -> StreamingResponse:
+        return export_response(
+            ExportFormat.csv, iter([b"id\n"])
+        )
+
+    response = TestClient(app).get("/export")
+    assert response.headers["content-type"] == (
+        "text/csv; charset=utf-8"
+    )
@@ -0,0 +1,81 @@
+"""Test cases for serving async routes over sync ones."""
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from routers.Fallback import with_fallback
+
+
+def routes(router: APIRouter):
+    return [
+        (route.path, *sorted(route.methods), route.name)
+        for route in router.routes
+    ]
+
+
+def test_primary_routes_replace_fallback_ones() -> None:
+    """Test that overrides keep the fallback's route order."""
+    fallback = APIRouter()
+    primary = APIRouter()
+
+    @fallback.get("/batch")
+    def sync_batch() -> str:
+        return "sync"
+
+    @fallback.post("/batch")
+    def sync_create_batch() -> str:
+        return "sync"
+
+    @fallback.get("/{id}")
+    def sync_get(id: int) -> str:
+        return "sync"
+
+    @primary.get("/{id}")
+    async def async_get(id: int) -> str:
+        return "async"
+
+    @primary.post("/batch")
+    async def async_create_batch() -> str:
+        return "async"
+
+    @primary.get("/stats")
+    async def async_stats() -> str:
+        return "async"
+
+    merged = with_fallback(primary, fallback)
+    assert routes(merged) == [
+        ("/batch", "GET", "sync_batch"),
+        ("/batch", "POST", "async_create_batch"),
+        ("/{id}", "GET", "async_get"),
+        # Only in the primary, so served last
+        ("/stats", "GET", "async_stats"),
+    ]
+
+    app = FastAPI()
+    app.include_router(merged)
+    client = TestClient(app)
+    # Static paths still match before /{id}
+    assert client.get("/batch").json() == "sync"
+    assert client.post("/batch").json() == "async"
+    assert client.get("/1").json() == "async"
+
+
+def test_event_routes_overlay() -> None:
+    """Test that every sync event route has an async handler."""
+    from routers.v1.AsyncEventRouter import (
+        router as AsyncEventRouter,
+    )
+    from routers.v1.EventRouter import router as EventRouter
+
+    merged = with_fallback(AsyncEventRouter, EventRouter)
+    assert [path for path, *_ in routes(merged)] == [
+        path for path, *_ in routes(EventRouter)
+    ]
+    assert all(
+        route.endpoint
+        in {
+            async_route.endpoint
+            for async_route in AsyncEventRouter.routes
+        }
+        for route in merged.routes
+    )
@@ -0,0 +1,112 @@
+"""Test cases for list pages encoded straight from rows."""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import Response
+
+import routers.FastJSON
+from benchmarks.Serialization import (
+    default_path,
+    event_types,
+    life_events,
+)
+from models.LifeEventModel import LifeEvent
+from routers.FastJSON import (
+    dumps,
+    row_response,
+    rows_response,
+)
+from schemas.pydantic.EventTypeSchema import (
+    EventTypeResponse,
+)
+from schemas.pydantic.LifeEventSchema import (
+    LifeEventResponse,
+)
+
+
+def route_response() -> Response:
+    # As FastAPI injects it into routes
+    response = Response()
+    del response.headers["content-length"]
+    return response
+
+
+def response_content(model, rows):
+    return [
+        {
+            field: getattr(row, field)
+            for field in model.__fields__
+        }
+        for row in rows
+    ]
+
+
+@pytest.mark.parametrize(
+    "model, rows",
+    [
+        (LifeEventResponse, life_events(20)),
+        (EventTypeResponse, event_types(5)),
+        (
+            LifeEventResponse,
+            [
+                LifeEvent(
+                    id=1,
+                    timestamp=datetime(
+                        2024, 5, 15, tzinfo=timezone.utc
+                    ),
+                    event_type_id=1,
+                    data={"n": 1e20, "s": "✓ "},
+                )
+            ],
+        ),
+    ],
+)
+def test_same_json_as_the_default_path(
+    model, rows, monkeypatch
+) -> None:
+    """Test that pages encode to FastAPI's bytes, either way."""
+    expected = asyncio.run(default_path(model)(rows))
+    response = rows_response(model, rows, route_response())
+    assert response.body == expected
+    assert response.media_type == "application/json"
+
+    monkeypatch.setattr(routers.FastJSON, "orjson", None)
+    assert dumps(response_content(model, rows)) == expected
+
+
+def test_route_headers_are_kept() -> None:
+    """Test that headers set by dependencies reach the client."""
+    response = route_response()
+    response.headers["ETag"] = '"1.2"'
+    response.headers["X-Next-Cursor"] = "abc"
+    page = rows_response(LifeEventResponse, [], response)
+    assert page.headers["etag"] == '"1.2"'
+    assert page.headers["x-next-cursor"] == "abc"
+    assert page.headers["content-length"] == "2"
+
+
+def test_sparse_fieldsets_trim_the_json() -> None:
+    """Test that only the requested fields are encoded."""
+    rows = life_events(2)
+    fields = ("id", "event_type_id")
+    page = rows_response(
+        LifeEventResponse, rows, route_response(), fields
+    )
+    assert page.body == dumps(
+        [
+            {
+                "id": row.id,
+                "event_type_id": row.event_type_id,
+            }
+            for row in rows
+        ]
+    )
+    single = row_response(
+        LifeEventResponse,
+        rows[0],
+        route_response(),
+        ["data"],
+    )
+    assert single.body == dumps({"data": rows[0].data})
@@ -0,0 +1,31 @@
+"""Test cases for sparse fieldsets."""
+
+import pytest
+from fastapi import HTTPException
+
+from routers.Fieldset import Fieldset
+from schemas.pydantic.LifeEventSchema import (
+    LifeEventResponse,
+)
+
+
+def test_fields_follow_the_model_order() -> None:
+    """Test that fields resolve in the response model's order."""
+    fieldset = Fieldset(LifeEventResponse)
+    assert fieldset("data, id,,timestamp") == (
+        "id",
+        "timestamp",
+        "data",
+    )
+    assert fieldset(None) is None
+    assert fieldset(" , ") is None
+
+
+def test_unknown_fields_are_rejected() -> None:
+    """Test that fields not in the response model are a 400."""
+    with pytest.raises(HTTPException) as error:
+        Fieldset(LifeEventResponse)("id,score,__dict__")
+    assert error.value.status_code == 400
+    assert error.value.detail == (
+        "Unknown fields: __dict__, score"
+    )
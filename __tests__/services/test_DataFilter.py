@@ -0,0 +1,54 @@
+"""Test cases for payload field filter parsing."""
+
+import pytest
+from fastapi import HTTPException
+
+from models.EventTypeModel import EventType
+from repositories.DataField import DataField
+from services.DataFilter import parse_data_filters
+
+EXERCISE = EventType(
+    id=3,
+    name="exercise",
+    event_schema={
+        "type": "object",
+        "properties": {
+            "type": {"type": "string", "maxLength": 16},
+            "duration": {"type": "number"},
+            "tags": {"type": "array"},
+        },
+        "x-indexed": ["type"],
+    },
+)
+
+
+def test_parse_data_filters() -> None:
+    """Test that values are typed by the declared field."""
+    assert parse_data_filters(
+        ["type:eq:trail:run", "duration:gte:30"], EXERCISE
+    ) == [
+        (
+            DataField(3, "type", "string", 16),
+            "eq",
+            "trail:run",
+        ),
+        (DataField(3, "duration", "number"), "gte", 30.0),
+    ]
+
+
+@pytest.mark.parametrize(
+    "raw_filter",
+    [
+        "type",
+        "tags:eq:x",
+        "mood:eq:happy",
+        "type:like:run",
+        "duration:gt:long",
+    ],
+)
+def test_invalid_data_filter(raw_filter: str) -> None:
+    """Test that undeclared or malformed filters are rejected."""
+    with pytest.raises(HTTPException) as error:
+        parse_data_filters([raw_filter], EXERCISE)
+
+    assert error.value.status_code == 400
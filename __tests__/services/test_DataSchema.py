@@ -0,0 +1,100 @@
+"""Test cases for validating event data against event schemas."""
+
+import pytest
+from fastapi import HTTPException
+
+import models.LifeEventModel  # Maps EventType.events
+from models.EventTypeModel import EventType
+from seeds.event_types import INITIAL_EVENT_TYPES
+from services.DataSchema import (
+    DataValidators,
+    check_event_schema,
+    compile_schema,
+    data_error,
+)
+
+MOOD_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "mood": {"type": "string", "enum": ["good", "bad"]},
+        "energy": {"type": "integer", "minimum": 1},
+    },
+    "required": ["mood"],
+}
+
+
+def mood(**values) -> EventType:
+    return EventType(
+        **{
+            "id": 1,
+            "name": "mood",
+            "event_schema": MOOD_SCHEMA,
+            **values,
+        }
+    )
+
+
+def test_seed_schemas_compile() -> None:
+    """Test that every seeded event schema is valid."""
+    for event_type in INITIAL_EVENT_TYPES:
+        assert compile_schema(event_type["schema"])
+        check_event_schema(event_type["schema"])
+
+
+def test_invalid_schemas_are_rejected() -> None:
+    """Test that a schema that is not JSON Schema is a 400."""
+    with pytest.raises(HTTPException) as error:
+        compile_schema({"type": "nothing"})
+    assert error.value.status_code == 400
+    assert compile_schema(None) is None
+
+
+def test_unbounded_indexed_strings_are_rejected() -> None:
+    """Test that indexed strings need a bounded length."""
+    with pytest.raises(HTTPException) as error:
+        check_event_schema(
+            {
+                "type": "object",
+                "properties": {"notes": {"type": "string"}},
+                "x-indexed": ["notes"],
+            }
+        )
+    assert error.value.status_code == 400
+    assert "notes" in error.value.detail
+
+
+def test_data_errors_name_the_field() -> None:
+    """Test that mismatches report where the data is wrong."""
+    validator = compile_schema(MOOD_SCHEMA)
+    assert data_error(validator, {"mood": "good"}) is None
+    assert "['energy']" in data_error(
+        validator, {"mood": "good", "energy": 0}
+    )
+    assert "'mood' is a required property" in data_error(
+        validator, {}
+    )
+    assert data_error(None, {"anything": 1}) is None
+
+
+def test_validators_are_compiled_once_per_schema() -> None:
+    """Test that validators are reused until the schema changes."""
+    validators = DataValidators()
+    first = validators.get(mood())
+    assert validators.get(mood()) is first
+
+    changed = {**MOOD_SCHEMA, "required": []}
+    assert (
+        validators.get(mood(event_schema=changed))
+        is not first
+    )
+    validators.validate(mood(event_schema=changed), {})
+
+    validators.invalidate(1)
+    assert validators.get(mood()) is not first
+
+
+def test_validate_raises_unprocessable() -> None:
+    """Test that invalid data is a 422."""
+    with pytest.raises(HTTPException) as error:
+        DataValidators().validate(mood(), {"mood": "meh"})
+    assert error.value.status_code == 422
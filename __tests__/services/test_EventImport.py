@@ -0,0 +1,197 @@
+"""Test cases for bulk imports of life events."""
+
+import json
+
+import pytest
+from fastapi import HTTPException
+
+import models.LifeEventModel  # Maps EventType.events
+from models.EventTypeModel import EventType
+from schemas.pydantic.LifeEventSchema import ImportFormat
+from services.EventImport import EventImport
+
+EVENT_TYPES = [
+    EventType(
+        id=1,
+        name="mood",
+        event_schema={
+            "type": "object",
+            "properties": {"energy": {"type": "integer"}},
+        },
+    ),
+    EventType(id=2, name="walk"),
+]
+
+
+def ndjson(*records) -> bytes:
+    return b"".join(
+        json.dumps(record, ensure_ascii=False).encode()
+        + b"\n"
+        for record in records
+    )
+
+
+def run(events: EventImport, *chunks: bytes):
+    batches = [
+        rows
+        for chunk in chunks
+        for rows in events.feed(chunk)
+    ]
+    batches += list(events.close())
+    for rows in batches:
+        events.commit(len(rows))
+    return batches
+
+
+def test_batches_are_cut_at_the_chunk_size() -> None:
+    """Test that rows are committed in chunks, across reads."""
+    content = ndjson(
+        *(
+            {
+                "event_type_id": 2,
+                "data": {"n": n, "at": "café"},
+            }
+            for n in range(7)
+        )
+    )
+    events = EventImport(
+        ImportFormat.ndjson, EVENT_TYPES, chunk_size=3
+    )
+    # Reads that split lines, and characters, anywhere
+    batches = run(
+        events,
+        *(
+            content[i : i + 5]
+            for i in range(0, len(content), 5)
+        ),
+    )
+    assert [len(rows) for rows in batches] == [3, 3, 1]
+    assert [row["data"]["n"] for row in batches[1]] == [
+        3,
+        4,
+        5,
+    ]
+    assert events.response().lines == 7
+
+
+def test_names_resolve_and_bad_lines_are_reported() -> None:
+    """Test that each rejected line is reported, not fatal."""
+    content = (
+        ndjson(
+            {"event_type": "mood", "data": {"energy": 3}},
+            {"event_type": "nope", "data": {}},
+            {
+                "event_type": "mood",
+                "data": {"energy": "high"},
+            },
+            {"event_type_id": 9, "data": {}},
+            {"event_type_id": 2},
+            [1],
+        )
+        + b"\n{not json\n"
+    )
+    events = EventImport(ImportFormat.ndjson, EVENT_TYPES)
+    [rows] = run(events, content)
+
+    assert rows[0]["event_type_id"] == 1
+    response = events.response()
+    assert (response.created, response.rejected) == (1, 6)
+    assert [error.line for error in response.errors] == [
+        2,
+        3,
+        4,
+        5,
+        6,
+        8,
+    ]
+    assert (
+        response.errors[0].detail
+        == "Unknown event type: nope"
+    )
+    assert (
+        response.errors[2].detail == "Event type not found"
+    )
+    assert response.errors[3].detail.startswith(
+        "Invalid data"
+    )
+
+
+def test_csv_reads_exports_and_resumes() -> None:
+    """Test that CSV imports skip lines already imported."""
+    content = (
+        b"id,timestamp,event_type_id,data\r\n"
+        b'1,2024-05-15T08:00:00,1,"{""energy"":1}"\r\n'
+        b'2,2024-05-15T09:00:00,2,"{}"\r\n'
+        b'3,2024-05-15T10:00:00,2,"{}"'
+    )
+    events = EventImport(
+        ImportFormat.csv, EVENT_TYPES, skip=2
+    )
+    [rows] = run(events, content)
+    assert [row["event_type_id"] for row in rows] == [2, 2]
+    assert rows[0]["timestamp"].hour == 9
+    assert events.response().lines == 4
+
+
+def test_csv_needs_a_header() -> None:
+    """Test that CSV imports without the columns are a 400."""
+    events = EventImport(ImportFormat.csv, EVENT_TYPES)
+    with pytest.raises(HTTPException) as error:
+        run(events, b"timestamp,data\n")
+    assert error.value.status_code == 400
+
+
+def test_csv_fields_can_hold_newlines() -> None:
+    """Test that quoted newlines stay in one numbered record."""
+    content = (
+        b"timestamp,event_type,data\r\n"
+        b'2024-05-15T08:00:00,walk,"{""note"":\r\n'
+        b'""a\\nb""}"\r\n'
+        b'2024-05-15T09:00:00,nope,"{}"\r\n'
+        b'2024-05-15T10:00:00,walk,"{\n}"\r\n'
+    )
+    events = EventImport(
+        ImportFormat.csv, EVENT_TYPES, chunk_size=1
+    )
+    # Reads that end inside the quoted fields
+    batches = run(
+        events,
+        *(
+            content[i : i + 7]
+            for i in range(0, len(content), 7)
+        ),
+    )
+    rows = [row for rows in batches for row in rows]
+    assert [row["data"] for row in rows] == [
+        {"note": "a\nb"},
+        {},
+    ]
+    response = events.response()
+    assert [error.line for error in response.errors] == [4]
+    assert response.lines == 6
+
+    # Resuming from the first batch skips the whole record
+    events = EventImport(
+        ImportFormat.csv, EVENT_TYPES, skip=3
+    )
+    [rows] = run(events, content)
+    assert [row["timestamp"].hour for row in rows] == [10]
+
+
+def test_csv_unterminated_quote_is_rejected() -> None:
+    """Test that an open quote is reported from its first line."""
+    events = EventImport(ImportFormat.csv, EVENT_TYPES)
+    run(
+        events,
+        b"timestamp,event_type,data\n"
+        b'2024-05-15T08:00:00,walk,"{}"\n'
+        b'2024-05-15T09:00:00,walk,"{\n'
+        b"}\n",
+    )
+    response = events.response()
+    assert (response.created, response.rejected) == (1, 1)
+    assert response.errors[0].line == 3
+    assert (
+        response.errors[0].detail
+        == "Unterminated quoted field"
+    )
@@ -0,0 +1,57 @@
+"""Test cases for the process-local event type cache."""
+
+from models.EventTypeModel import EventType
+from services.EventTypeCache import EventTypeCache
+
+
+def sample(**values) -> EventType:
+    return EventType(
+        **{
+            "id": 1,
+            "name": "mood",
+            "event_schema": {},
+            **values,
+        }
+    )
+
+
+def test_get_by_id_and_name() -> None:
+    """Test that cached rows are found by id and by name."""
+    cache = EventTypeCache()
+    cache.put(sample(), cache.generation)
+
+    event_type = cache.get(1)
+    assert event_type.name == "mood"
+    assert event_type is not cache.get(1)
+    assert cache.get_by_name("mood").id == 1
+    assert cache.get(2) is None
+
+
+def test_invalidate_forgets_rows_and_names() -> None:
+    """Test that writes drop the row and its old name."""
+    cache = EventTypeCache()
+    cache.put(sample(), cache.generation)
+    cache.invalidate(1)
+    assert cache.get(1) is None
+    assert cache.get_by_name("mood") is None
+
+    cache.put(sample(name="sleep"), cache.generation)
+    cache.invalidate()
+    assert cache.get_by_name("sleep") is None
+
+
+def test_put_skips_rows_loaded_before_a_write() -> None:
+    """Test that a stale load does not repopulate the cache."""
+    cache = EventTypeCache()
+    generation = cache.generation
+    cache.invalidate(1)
+    cache.put(sample(), generation)
+    assert cache.get(1) is None
+
+
+def test_entries_expire() -> None:
+    """Test that entries expire after the TTL."""
+    cache = EventTypeCache(ttl=-1)
+    cache.put(sample(), cache.generation)
+    assert cache.get(1) is None
+    assert cache.get_by_name("mood") is None
@@ -1,11 +1,23 @@
 """Test cases for EventTypeService."""
 
 import pytest
-from typing import Dict, Any
+from datetime import datetime
+from typing import Dict, Any, List
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
+import repositories.LifeEventRepository
 from models.EventTypeModel import EventType
+from models.LifeEventModel import LifeEvent
+from repositories.EventTypeRepository import (
+    EventTypeRepository,
+)
+from repositories.LifeEventRepository import (
+    LifeEventRepository,
+)
+from services.EventTypeCache import event_type_cache
 from services.EventTypeService import EventTypeService
+from services.ResultCache import result_cache
 from schemas.pydantic.EventTypeSchema import (
     EventTypeCreate,
     EventTypeUpdate,
@@ -182,3 +194,94 @@ def test_delete_nonexistent_event_type(
     """Test deleting a non-existent event type."""
     result = service.delete_event_type(999, db)
     assert result is False
+
+
+@pytest.fixture
+def event_type_service(db: Session) -> EventTypeService:
+    """Create a service over repositories sharing the session."""
+    event_type_cache.invalidate()
+    result_cache.clear()
+    return EventTypeService(
+        EventTypeRepository(db), LifeEventRepository(db)
+    )
+
+
+@pytest.fixture
+def typed_events(db: Session) -> List[LifeEvent]:
+    """Create events of two event types, out of order."""
+    note, walk = EventType(name="note"), EventType(
+        name="walk"
+    )
+    db.add_all([note, walk])
+    db.flush()
+    events = [
+        LifeEvent(
+            event_type_id=(
+                walk if hour % 3 == 0 else note
+            ).id,
+            timestamp=datetime(2024, 5, 15, hour),
+            data={"hour": hour},
+        )
+        for hour in (5, 1, 4, 2, 3, 0, 6)
+    ]
+    db.add_all(events)
+    db.commit()
+    return events
+
+
+def hours(events) -> List[int]:
+    return [event.data["hour"] for event in events]
+
+
+def test_get_events_pages_one_type(
+    event_type_service: EventTypeService,
+    typed_events: List[LifeEvent],
+) -> None:
+    """Test that an event type's events are paged by cursor."""
+    note_id = typed_events[1].event_type_id
+    pages = []
+    cursor = None
+    while True:
+        page = event_type_service.get_events(
+            note_id, limit=2, cursor=cursor
+        )
+        pages.append(hours(page))
+        cursor = event_type_service.next_cursor(page, 2)
+        if cursor is None:
+            break
+    assert pages == [[1, 2], [4, 5], []]
+
+    in_range = event_type_service.get_events(
+        note_id,
+        start_date=datetime(2024, 5, 15, 2),
+        end_date=datetime(2024, 5, 15, 4),
+    )
+    assert hours(in_range) == [2, 4]
+
+
+def test_iter_events_streams_in_batches(
+    event_type_service: EventTypeService,
+    typed_events: List[LifeEvent],
+    monkeypatch,
+) -> None:
+    """Test that streamed events match a listing of all pages."""
+    monkeypatch.setattr(
+        repositories.LifeEventRepository,
+        "STREAM_BATCH_SIZE",
+        2,
+    )
+    # Every third hour is a walk
+    walk_id = typed_events[5].event_type_id
+    events = event_type_service.iter_events(walk_id)
+    assert hours(events) == [0, 3, 6]
+
+
+def test_unknown_event_type_events(
+    event_type_service: EventTypeService,
+) -> None:
+    """Test that unknown event types fail before streaming."""
+    with pytest.raises(HTTPException) as error:
+        event_type_service.get_events(404)
+    assert error.value.status_code == 404
+    with pytest.raises(HTTPException):
+        event_type_service.iter_events(404)
@@ -3,12 +3,26 @@
 import pytest
 from datetime import datetime
 from typing import Dict, Any
+from fastapi import HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from models.LifeEventModel import LifeEvent
 from models.EventTypeModel import EventType
+from repositories.DailyEventCountRepository import (
+    DailyEventCountRepository,
+)
+from repositories.EventTypeRepository import (
+    EventTypeRepository,
+)
+from repositories.LifeEventRepository import (
+    LifeEventRepository,
+)
+from services.EventTypeCache import event_type_cache
 from services.LifeEventService import LifeEventService
+from services.ResultCache import result_cache
 from schemas.pydantic.LifeEventSchema import (
+    ImportFormat,
     LifeEventCreate,
     LifeEventUpdate,
 )
@@ -160,3 +174,176 @@ def test_delete_event(
     # Verify deletion
     deleted = service.get_event(event.id, db)
     assert deleted is None
+
+
+@pytest.fixture
+def life_event_service(db: Session) -> LifeEventService:
+    """Create a service over repositories sharing the session."""
+    event_type_cache.invalidate()
+    result_cache.clear()
+    return LifeEventService(
+        LifeEventRepository(db),
+        EventTypeRepository(db),
+        DailyEventCountRepository(db),
+    )
+
+
+def test_create_many_reports_rejected_items(
+    life_event_service: LifeEventService,
+    db: Session,
+    sample_event_type: EventType,
+) -> None:
+    """Test that a batch creates the valid items only."""
+    events = [
+        LifeEventCreate(
+            event_type_id=sample_event_type.id,
+            data={"test_field": "first"},
+        ),
+        LifeEventCreate(
+            event_type_id=sample_event_type.id + 1,
+            data={"test_field": "unknown type"},
+        ),
+        LifeEventCreate(
+            event_type_id=sample_event_type.id,
+            data={"test_field": 3},
+        ),
+        LifeEventCreate(
+            event_type_id=sample_event_type.id,
+            data={"test_field": "last"},
+        ),
+    ]
+    result = life_event_service.create_many(events)
+
+    assert result.created == 2
+    assert [error.index for error in result.errors] == [
+        1,
+        2,
+    ]
+    assert result.errors[0].detail == "Event type not found"
+    assert result.errors[1].detail.startswith(
+        "Invalid event data"
+    )
+    assert [
+        event.data["test_field"]
+        for event in db.execute(
+            select(LifeEvent).order_by(LifeEvent.id)
+        ).scalars()
+    ] == ["first", "last"]
+
+
+def test_create_many_without_valid_items(
+    life_event_service: LifeEventService,
+    db: Session,
+) -> None:
+    """Test that a batch of rejected items inserts nothing."""
+    result = life_event_service.create_many(
+        [LifeEventCreate(event_type_id=404, data={})]
+    )
+    assert result.created == 0
+    assert len(result.errors) == 1
+    assert db.execute(select(LifeEvent)).first() is None
+
+
+def test_import_resumes_from_saved_progress(
+    life_event_service: LifeEventService,
+    db: Session,
+    sample_event_type: EventType,
+) -> None:
+    """Test that a named import resumes where it committed."""
+    content = (
+        b"".join(
+            b'{"event_type_id": %d, "data": {"test_field": "%d"}}\n'
+            % (sample_event_type.id, n)
+            for n in range(5)
+        )
+        + b'{"event_type_id": 404, "data": {}}\n'
+    )
+
+    def interrupted():
+        yield content[:120]
+        raise ConnectionError
+
+    with pytest.raises(ConnectionError):
+        life_event_service.import_events(
+            ImportFormat.ndjson,
+            interrupted(),
+            chunk_size=2,
+            import_id="backfill",
+        )
+    saved = life_event_service.get_import("backfill")
+    assert (saved.lines, saved.created) == (2, 2)
+
+    result = life_event_service.import_events(
+        ImportFormat.ndjson,
+        [content],
+        chunk_size=2,
+        import_id="backfill",
+    )
+    assert (result.lines, result.created) == (6, 5)
+    assert result.rejected == 1
+    assert result.errors[0].line == 6
+    assert life_event_service.get_import("backfill") == (
+        result.copy(update={"errors": []})
+    )
+    assert [
+        event.data["test_field"]
+        for event in db.execute(
+            select(LifeEvent).order_by(LifeEvent.id)
+        ).scalars()
+    ] == ["0", "1", "2", "3", "4"]
+
+    with pytest.raises(HTTPException) as error:
+        life_event_service.get_import("other")
+    assert error.value.status_code == 404
+
+
+def test_search_unavailable_on_partitions(
+    life_event_service: LifeEventService, monkeypatch
+) -> None:
+    """Test that search without an index is a 501."""
+    monkeypatch.setattr(
+        "repositories.LifeEventRepository.PARTITIONED_EVENTS",
+        True,
+    )
+    with pytest.raises(HTTPException) as error:
+        life_event_service.search("walk")
+    assert error.value.status_code == 501
+
+
+def test_update_validates_the_updated_row(
+    life_event_service: LifeEventService,
+    sample_event_type: EventType,
+) -> None:
+    """Test that updates are checked against the stored row."""
+    life_event_service.create_many(
+        [
+            LifeEventCreate(
+                event_type_id=sample_event_type.id,
+                data={"test_field": "first"},
+            )
+        ]
+    )
+    [event] = life_event_service.list()
+
+    with pytest.raises(HTTPException) as error:
+        life_event_service.update(
+            event.id,
+            LifeEventUpdate(data={"test_field": 3}),
+        )
+    assert error.value.status_code == 422
+    with pytest.raises(HTTPException) as error:
+        life_event_service.update(
+            event.id, LifeEventUpdate(event_type_id=404)
+        )
+    assert error.value.detail == "Event type not found"
+    with pytest.raises(HTTPException) as error:
+        life_event_service.update(
+            event.id + 1, LifeEventUpdate(data={})
+        )
+    assert error.value.detail == "Life event not found"
+
+    updated = life_event_service.update(
+        event.id,
+        LifeEventUpdate(data={"test_field": "second"}),
+    )
+    assert updated.data == {"test_field": "second"}
@@ -0,0 +1,27 @@
+"""Test cases for cursor pagination helpers."""
+
+import pytest
+from datetime import datetime
+from fastapi import HTTPException
+
+from services.Pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip() -> None:
+    """Test that a cursor decodes to the position it encodes."""
+    timestamp = datetime(2024, 1, 1, 12, 30, 15, 123456)
+    cursor = encode_cursor(timestamp, 42)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (timestamp, 42)
+
+
+@pytest.mark.parametrize(
+    "cursor", ["", "not-a-cursor", "WzFd", "e30"]
+)
+def test_invalid_cursor(cursor: str) -> None:
+    """Test that malformed cursors are rejected with a 400."""
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+
+    assert error.value.status_code == 400
@@ -0,0 +1,175 @@
+"""Test cases for the listing result cache."""
+
+from datetime import datetime
+
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import load_only
+
+from models.EventTypeModel import EventType
+from models.LifeEventModel import LifeEvent
+from repositories.TableVersion import TableGenerations
+from services.ResultCache import (
+    ResultCache,
+    cache_key,
+    restore_rows,
+    snapshot_rows,
+)
+
+TABLES = ("life_events", "event_types")
+
+
+def new_cache(**kwargs) -> ResultCache:
+    return ResultCache(
+        generations=TableGenerations(), **kwargs
+    )
+
+
+def test_cache_key_normalizes_arguments() -> None:
+    """Test that equivalent arguments share a key."""
+    assert cache_key(
+        "life_events",
+        limit=10,
+        data=["a:eq:1", "b:eq:2"],
+        cursor=None,
+    ) == cache_key(
+        "life_events", data=["b:eq:2", "a:eq:1"], limit=10
+    )
+    assert cache_key("life_events", limit=10) != cache_key(
+        "life_events", limit=20
+    )
+    assert cache_key("event_types", name="mood") != (
+        cache_key("event_types")
+    )
+
+
+def test_hits_and_misses_are_counted() -> None:
+    """Test that cached results are served and counted."""
+    cache = new_cache()
+    assert cache.get("key") is None
+    cache.put("key", TABLES, cache.generation(*TABLES), [1])
+    assert cache.get("key") == [1]
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_writes_to_a_table_invalidate_its_results() -> None:
+    """Test that a bump of any read table makes results stale."""
+    cache = new_cache()
+    cache.put(
+        "events", TABLES, cache.generation(*TABLES), 1
+    )
+    cache.put(
+        "types",
+        ("event_types",),
+        cache.generation("event_types"),
+        2,
+    )
+    cache.generations.bump("life_events")
+    assert cache.get("events") is None
+    assert cache.get("types") == 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_put_skips_results_loaded_before_a_write() -> None:
+    """Test that a stale load does not repopulate the cache."""
+    cache = new_cache()
+    generation = cache.generation(*TABLES)
+    cache.generations.bump("event_types")
+    cache.put("key", TABLES, generation, 1)
+    assert cache.get("key") is None
+
+
+def test_least_recently_used_results_are_evicted() -> None:
+    """Test that the cache keeps at most max_entries results."""
+    cache = new_cache(max_entries=2)
+    generation = cache.generation(*TABLES)
+    cache.put("a", TABLES, generation, 1)
+    cache.put("b", TABLES, generation, 2)
+    cache.get("a")
+    cache.put("c", TABLES, generation, 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["entries"] == 2
+
+
+def test_results_are_bounded_by_rows() -> None:
+    """Test that large listings evict others and are bounded."""
+    cache = new_cache(max_rows=5)
+    generation = cache.generation(*TABLES)
+    cache.put("a", TABLES, generation, (1, 2))
+    cache.put("b", TABLES, generation, (3, 4))
+    cache.put("c", TABLES, generation, (5, 6))
+    assert cache.get("a") is None
+    assert cache.get("b") == (3, 4)
+
+    # Larger than the whole cache, so never kept
+    cache.put("d", TABLES, generation, tuple(range(6)))
+    assert cache.get("d") is None
+    assert cache.stats()["rows"] == 4
+
+
+def test_entries_expire() -> None:
+    """Test that entries expire after the TTL."""
+    cache = new_cache(ttl=-1)
+    cache.put("key", TABLES, cache.generation(*TABLES), 1)
+    assert cache.get("key") is None
+
+
+def test_restored_rows_are_fresh_instances() -> None:
+    """Test that cached rows come back as new model instances."""
+    rows = snapshot_rows(
+        [
+            LifeEvent(
+                id=1,
+                timestamp=datetime(2024, 5, 15),
+                event_type_id=2,
+                data={"x": 1},
+            )
+        ]
+    )
+    first = restore_rows(LifeEvent, rows)
+    second = restore_rows(LifeEvent, rows)
+    assert first[0].data == {"x": 1}
+    assert first[0] is not second[0]
+
+    # Changing a restored payload leaves the cached one intact
+    first[0].data["x"] = 2
+    assert restore_rows(LifeEvent, rows)[0].data == {"x": 1}
+
+    rows = snapshot_rows([EventType(id=2, name="mood")])
+    assert restore_rows(EventType, rows)[0].name == "mood"
+
+
+def test_sparse_rows_are_snapshot_as_loaded(db) -> None:
+    """Test that columns a fieldset skipped are not loaded."""
+    db.add(EventType(id=1, name="mood"))
+    db.add(
+        LifeEvent(
+            id=1,
+            timestamp=datetime(2024, 5, 15),
+            event_type_id=1,
+            data={"x": 1},
+        )
+    )
+    db.flush()
+    db.expunge_all()
+
+    query = select(LifeEvent).options(
+        load_only(
+            LifeEvent.id,
+            LifeEvent.timestamp,
+            LifeEvent.event_type_id,
+        )
+    )
+    rows = db.execute(query).scalars().all()
+    [values] = snapshot_rows(rows)
+    assert values == {
+        "id": 1,
+        "timestamp": datetime(2024, 5, 15),
+        "event_type_id": 1,
+    }
+    assert "data" in inspect(rows[0]).unloaded
@@ -0,0 +1,83 @@
+"""Test cases for time-bucketed life event statistics."""
+
+import pytest
+from datetime import datetime
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models.EventTypeModel import EventType
+from models.LifeEventModel import LifeEvent
+from repositories.TimeBucket import time_bucket
+from schemas.pydantic.LifeEventSchema import StatsInterval
+from services.Stats import stats_response
+
+
+@pytest.mark.parametrize(
+    "interval, expected",
+    [
+        ("hour", datetime(2024, 5, 15, 13)),
+        ("day", datetime(2024, 5, 15)),
+        # 2024-05-15 is a Wednesday
+        ("week", datetime(2024, 5, 13)),
+        ("month", datetime(2024, 5, 1)),
+    ],
+)
+def test_time_bucket(
+    db: Session, interval: str, expected: datetime
+) -> None:
+    """Test that timestamps are truncated in SQL."""
+    event_type = EventType(name="test_type")
+    db.add(event_type)
+    db.flush()
+    db.add(
+        LifeEvent(
+            event_type_id=event_type.id,
+            timestamp=datetime(2024, 5, 15, 13, 45, 10),
+            data={},
+        )
+    )
+    db.flush()
+
+    bucket = time_bucket(interval, LifeEvent.timestamp)
+    assert (
+        db.execute(select(bucket)).scalar_one() == expected
+    )
+
+
+def test_time_bucket_week_starts_on_monday(
+    db: Session,
+) -> None:
+    """Test that a Monday is the start of its own week."""
+    monday = datetime(2024, 5, 13)
+    bucket = time_bucket("week", func.datetime(monday))
+    assert db.execute(select(bucket)).scalar_one() == monday
+
+
+def test_time_bucket_unsupported_interval() -> None:
+    """Test that unknown intervals are rejected."""
+    with pytest.raises(ValueError):
+        time_bucket("decade", LifeEvent.timestamp)
+
+
+def test_stats_response() -> None:
+    """Test that rows are pivoted into aligned series."""
+    first = datetime(2024, 1, 1)
+    second = datetime(2024, 1, 2)
+    response = stats_response(
+        StatsInterval.day,
+        [(first, 1, 3), (first, 2, 1), (second, 2, 5)],
+    )
+
+    assert response.buckets == [first, second]
+    assert [
+        (series.event_type_id, series.counts)
+        for series in response.series
+    ] == [(1, [3, 0]), (2, [1, 5])]
+
+
+def test_stats_response_empty() -> None:
+    """Test that no rows yield no buckets."""
+    response = stats_response(StatsInterval.hour, [])
+
+    assert response.buckets == []
+    assert response.series == []
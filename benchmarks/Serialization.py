@@ -0,0 +1,160 @@
+"""Benchmark of list page serialization.
+
+Compares FastAPI's default path for a list route (a pydantic
+model per row, `response_model` validation, `jsonable_encoder`
+and the stdlib encoder) with `rows_response`, on pages of ORM
+rows. Both must produce the same bytes.
+
+    $ pipenv run benchmark-serialization [rows] [repeat]
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, List, Type
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import BaseModel
+
+from models.EventTypeModel import EventType
+from models.LifeEventModel import LifeEvent
+from routers.FastJSON import orjson, rows_response
+from schemas.pydantic.EventTypeSchema import (
+    EventTypeResponse,
+)
+from schemas.pydantic.LifeEventSchema import (
+    LifeEventResponse,
+)
+
+
+def life_events(count: int) -> List[LifeEvent]:
+    start = datetime(2024, 1, 1, 7, 30, 0, 125000)
+    return [
+        LifeEvent(
+            id=id,
+            timestamp=start + timedelta(minutes=17 * id),
+            event_type_id=id % 5 + 1,
+            data={
+                "mood": "good" if id % 3 else "tired",
+                "energy": id % 10,
+                "duration": 12.5 + id % 60,
+                "notes": f"Entry number {id}, café après",
+                "tags": ["morning", "home"],
+                "location": {"lat": 52.37, "lng": 4.89},
+            },
+        )
+        for id in range(1, count + 1)
+    ]
+
+
+def event_types(count: int) -> List[EventType]:
+    return [
+        EventType(
+            id=id,
+            name=f"type-{id}",
+            description="Tracked every day",
+            event_schema={
+                "type": "object",
+                "properties": {
+                    "mood": {"type": "string"},
+                    "energy": {"type": "integer"},
+                },
+            },
+            icon="sun",
+            color="#ffaa00",
+        )
+        for id in range(1, count + 1)
+    ]
+
+
+def default_path(
+    model: Type[BaseModel],
+) -> Callable[[List[Any]], Awaitable[bytes]]:
+    field = create_response_field(
+        name=f"Response_{model.__name__}", type_=List[model]
+    )
+
+    async def render(rows: List[Any]) -> bytes:
+        content = [model.from_orm(row) for row in rows]
+        content = await serialize_response(
+            field=field, response_content=content
+        )
+        return JSONResponse(content).body
+
+    return render
+
+
+def fast_path(
+    model: Type[BaseModel],
+) -> Callable[[List[Any]], Awaitable[bytes]]:
+    async def render(rows: List[Any]) -> bytes:
+        # As FastAPI injects it into routes
+        response = Response()
+        del response.headers["content-length"]
+        return rows_response(model, rows, response).body
+
+    return render
+
+
+async def best_of(
+    render: Callable[[List[Any]], Awaitable[bytes]],
+    rows: List[Any],
+    repeat: int,
+) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await render(rows)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+async def compare(
+    name: str,
+    model: Type[BaseModel],
+    rows: List[Any],
+    repeat: int,
+) -> None:
+    default, fast = default_path(model), fast_path(model)
+    if await default(rows) != await fast(rows):
+        raise AssertionError(f"{name}: the JSON differs")
+    default_time = await best_of(default, rows, repeat)
+    fast_time = await best_of(fast, rows, repeat)
+    print(
+        f"{name:<12} {len(rows):>6} rows  "
+        f"default {default_time * 1000:8.2f} ms  "
+        f"fast {fast_time * 1000:8.2f} ms  "
+        f"{default_time / fast_time:5.1f}x"
+    )
+
+
+async def main(count: int, repeat: int) -> None:
+    print(
+        "Encoder: "
+        + ("orjson" if orjson is not None else "json")
+    )
+    await compare(
+        "life_events",
+        LifeEventResponse,
+        life_events(count),
+        repeat,
+    )
+    await compare(
+        "event_types",
+        EventTypeResponse,
+        event_types(count),
+        repeat,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+            int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+        )
+    )
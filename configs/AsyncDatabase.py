@@ -0,0 +1,87 @@
+from typing import AsyncGenerator
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    create_async_engine,
+)
+from sqlalchemy.orm import sessionmaker
+
+from configs.database import enable_sqlite_foreign_keys
+from configs.Environment import (
+    get_database_url,
+    get_environment_variables,
+)
+from configs.Pool import MeasuredAsyncPool, pool_options
+from configs.Routing import (
+    RoutingSession,
+    read_your_writes,
+)
+
+# Initialize environment variables
+env = get_environment_variables()
+
+# Construct Database URL for the async driver
+ASYNC_DATABASE_URL = get_database_url(
+    env,
+    env.DATABASE_ASYNC_DIALECT,
+    env.DATABASE_HOSTNAME,
+    env.DATABASE_PORT,
+)
+
+# Create async database engine
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=env.DEBUG_MODE,
+    **pool_options(env, "async", MeasuredAsyncPool),
+)
+enable_sqlite_foreign_keys(async_engine.sync_engine)
+
+# Create optional async read replica engine
+async_read_engine = (
+    create_async_engine(
+        get_database_url(
+            env,
+            env.DATABASE_ASYNC_DIALECT,
+            env.DATABASE_READ_HOSTNAME,
+            env.DATABASE_READ_PORT or env.DATABASE_PORT,
+        ),
+        echo=env.DEBUG_MODE,
+        **pool_options(
+            env, "async-replica", MeasuredAsyncPool
+        ),
+    )
+    if env.DATABASE_READ_HOSTNAME
+    else None
+)
+
+# Create async session factory; rows stay usable after commit
+# because lazy refreshes are not possible outside the event loop
+AsyncSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    bind=async_engine,
+    info={
+        "read_engine": (
+            async_read_engine.sync_engine
+            if async_read_engine
+            else None
+        )
+    },
+)
+
+
+async def get_async_db(
+    request: Request, response: Response
+) -> AsyncGenerator[AsyncSession, None]:
+    """Get an async database session."""
+    async with AsyncSessionLocal() as db:
+        read_your_writes(
+            db.sync_session,
+            request,
+            response,
+            env.DATABASE_READ_YOUR_WRITES_SECONDS,
+        )
+        yield db
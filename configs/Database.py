@@ -1,40 +1,122 @@
-from typing import Generator
-from sqlalchemy import create_engine
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    Optional,
+    Set,
+    Tuple,
+)
+from fastapi import Request, Response
+from sqlalchemy import (
+    Column,
+    Index,
+    create_engine,
+    event,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import sessionmaker, Session
 
-from configs.Environment import get_environment_variables
+from configs.Environment import (
+    get_database_url,
+    get_environment_variables,
+)
+from configs.Invalidation import (
+    connect_invalidation_bus,
+    invalidation_bus,
+)
+from configs.Pool import pool_options
+from configs.Routing import (
+    RoutingSession,
+    read_your_writes,
+)
 
 # Initialize environment variables
 env = get_environment_variables()
 
 # Construct Database URL
-DATABASE_URL = (
-    f"{env.DATABASE_DIALECT}://"
-    f"{env.DATABASE_USERNAME}:"
-    f"{env.DATABASE_PASSWORD}@"
-    f"{env.DATABASE_HOSTNAME}:"
-    f"{env.DATABASE_PORT}/"
-    f"{env.DATABASE_NAME}"
+DATABASE_URL = get_database_url(
+    env,
+    env.DATABASE_DIALECT,
+    env.DATABASE_HOSTNAME,
+    env.DATABASE_PORT,
 )
 
 # Create database engine
 engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True,
     echo=env.DEBUG_MODE,
+    **pool_options(env, "primary"),
+)
+
+
+def enable_sqlite_foreign_keys(bind: Engine) -> None:
+    """Make SQLite enforce ON DELETE CASCADE like other dialects."""
+    if bind.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(bind, "connect")
+    def set_foreign_keys_pragma(
+        dbapi_connection, _
+    ) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+enable_sqlite_foreign_keys(engine)
+
+# Life events partitioned by month, natively on MySQL only
+PARTITIONED_EVENTS = (
+    env.DATABASE_PARTITION_EVENTS
+    and engine.dialect.name == "mysql"
+)
+
+# Optional cold storage for old life events
+ARCHIVE_DIRECTORY = env.ARCHIVE_DIRECTORY
+
+# Create optional read replica engine
+read_engine = (
+    create_engine(
+        get_database_url(
+            env,
+            env.DATABASE_DIALECT,
+            env.DATABASE_READ_HOSTNAME,
+            env.DATABASE_READ_PORT or env.DATABASE_PORT,
+        ),
+        echo=env.DEBUG_MODE,
+        **pool_options(env, "replica"),
+    )
+    if env.DATABASE_READ_HOSTNAME
+    else None
 )
 
-# Create session factory
+# Create session factory; repository reads may use the replica.
+# Rows stay loaded after commit so a create needs no refresh.
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False,
+    class_=RoutingSession,
     bind=engine,
+    info={"read_engine": read_engine},
 )
 
 
-def get_db() -> Generator[Session, None, None]:
+def get_db(
+    request: Request, response: Response
+) -> Generator[Session, None, None]:
     """Get a database session."""
     db = SessionLocal()
+    read_your_writes(
+        db,
+        request,
+        response,
+        env.DATABASE_READ_YOUR_WRITES_SECONDS,
+    )
     try:
         yield db
     finally:
@@ -42,7 +124,350 @@ def get_db() -> Generator[Session, None, None]:
 
 
 def init() -> None:
-    """Initialize database."""
+    """Initialize database.
+
+    Runs in every worker, so it leaves the full-text index, which
+    copies or scans the table, to `create_indexes()`, and new
+    partitions, which lock the table, to `partition_events()`.
+    """
     from models.BaseModel import Base
 
     Base.metadata.create_all(bind=engine)
+
+
+def _index_elements(
+    connection: Connection, index: Index
+) -> str:
+    """Render the columns and expressions of an index."""
+    elements = []
+    for expression in index.expressions:
+        if isinstance(expression, Column):
+            elements.append(expression.name)
+            continue
+        # Expression key parts need their own parentheses
+        compiled = expression.compile(
+            dialect=connection.dialect,
+            compile_kwargs={
+                "literal_binds": True,
+                "include_table": False,
+            },
+        )
+        elements.append(f"({compiled})")
+    return ", ".join(elements)
+
+
+def _index_names(
+    connection: Connection, table_name: str
+) -> Set[str]:
+    """Names of a table's indexes, expression indexes included."""
+    dialect = connection.dialect.name
+    if dialect == "mysql":
+        query = (
+            "SELECT DISTINCT index_name "
+            "FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() "
+            "AND table_name = :table"
+        )
+    elif dialect == "postgresql":
+        query = (
+            "SELECT indexname FROM pg_indexes "
+            "WHERE schemaname = current_schema() "
+            "AND tablename = :table"
+        )
+    elif dialect == "sqlite":
+        query = (
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = :table"
+        )
+    else:
+        return {
+            index["name"]
+            for index in inspect(connection).get_indexes(
+                table_name
+            )
+        }
+    return set(
+        connection.execute(
+            text(query), {"table": table_name}
+        ).scalars()
+    )
+
+
+def _create_index_online(
+    connection: Connection, index: Index
+) -> None:
+    """Create an index without blocking writes where supported."""
+    elements = _index_elements(connection, index)
+    dialect = connection.dialect.name
+    if dialect == "mysql":
+        connection.execute(
+            text(
+                f"ALTER TABLE {index.table.name} "
+                f"ADD INDEX {index.name} ({elements}), "
+                "ALGORITHM=INPLACE, LOCK=NONE"
+            )
+        )
+    elif dialect == "postgresql":
+        where = index.dialect_options["postgresql"]["where"]
+        predicate = (
+            ""
+            if where is None
+            else " WHERE "
+            + str(
+                where.compile(
+                    dialect=connection.dialect,
+                    compile_kwargs={
+                        "literal_binds": True,
+                        "include_table": False,
+                    },
+                )
+            )
+        )
+        connection.execution_options(
+            isolation_level="AUTOCOMMIT"
+        ).execute(
+            text(
+                f"CREATE INDEX CONCURRENTLY {index.name} "
+                f"ON {index.table.name} ({elements})"
+                f"{predicate}"
+            )
+        )
+    else:
+        index.create(bind=connection)
+
+
+def _drop_index_online(
+    connection: Connection, table_name: str, name: str
+) -> None:
+    """Drop an index without blocking writes where supported."""
+    dialect = connection.dialect.name
+    if dialect == "mysql":
+        connection.execute(
+            text(
+                f"ALTER TABLE {table_name} "
+                f"DROP INDEX {name}, "
+                "ALGORITHM=INPLACE, LOCK=NONE"
+            )
+        )
+    elif dialect == "postgresql":
+        connection.execution_options(
+            isolation_level="AUTOCOMMIT"
+        ).execute(text(f"DROP INDEX CONCURRENTLY {name}"))
+    else:
+        connection.execute(text(f"DROP INDEX {name}"))
+
+
+def _create_data_indexes(
+    connection: Connection,
+    event_schemas: Iterable[
+        Tuple[int, Optional[Dict[str, Any]]]
+    ],
+) -> None:
+    """Match the payload field indexes to the event schemas.
+
+    Indexes of fields no longer listed as indexed, of changed
+    field definitions or of deleted event types are dropped.
+    """
+    from repositories.DataField import (
+        INDEX_PREFIXES,
+        data_field_indexes,
+    )
+
+    existing = _index_names(connection, "life_events")
+    wanted = set()
+    for event_type_id, event_schema in event_schemas:
+        for index in data_field_indexes(
+            event_type_id, event_schema
+        ):
+            wanted.add(index.name)
+            if index.name not in existing:
+                _create_index_online(connection, index)
+                existing.add(index.name)
+    for name in sorted(existing - wanted):
+        if name.startswith(INDEX_PREFIXES):
+            _drop_index_online(
+                connection, "life_events", name
+            )
+
+
+def create_indexes() -> None:
+    """Create missing model indexes on an existing database.
+
+    `init()` only creates indexes together with new tables, so
+    deployments that predate an index use this to add it online.
+    Payload fields event types list as indexed get indexes, those
+    no longer listed lose them, and the full-text index is
+    created and backfilled unless the life events are
+    partitioned.
+    """
+    from models.BaseModel import Base
+    from models.EventTypeModel import EventType
+    from repositories.Partition import is_partitioned
+    from repositories.Search import create_search_index
+
+    with engine.connect() as connection:
+        inspector = inspect(connection)
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = _index_names(connection, table.name)
+            for index in table.indexes:
+                if index.name not in existing:
+                    _create_index_online(connection, index)
+
+        event_schemas = connection.execute(
+            select(EventType.id, EventType.event_schema)
+        ).all()
+        _create_data_indexes(connection, event_schemas)
+        if not is_partitioned(connection):
+            create_search_index(connection)
+
+
+def rebuild_rollups() -> None:
+    """Recompute the daily event counts from the life events.
+
+    Backfills the rollups of deployments that predate them; the
+    repositories keep them current from then on.
+    """
+    from repositories.Archive import get_archive
+    from repositories.DailyEventCountRepository import (
+        DailyEventCountRepository,
+    )
+
+    # Archived days have no events left to count
+    archive = get_archive(ARCHIVE_DIRECTORY)
+    since = archive.archived_until() if archive else None
+    with SessionLocal() as db:
+        DailyEventCountRepository(db).rebuild(since)
+
+
+def partition_events() -> None:
+    """Partition the life events by month, on MySQL.
+
+    The first run rebuilds the table; later runs add the
+    partitions of upcoming months, so schedule it at least
+    monthly.
+    """
+    from repositories.Partition import partition_life_events
+
+    if not PARTITIONED_EVENTS:
+        raise RuntimeError(
+            "Set DATABASE_PARTITION_EVENTS on a MySQL database "
+            "before partitioning life events"
+        )
+    with engine.connect() as connection:
+        partition_life_events(
+            connection, env.DATABASE_PARTITION_MONTHS_AHEAD
+        )
+
+
+def drop_events_before(month: str) -> None:
+    """Drop the life events before a month, given as YYYY-MM.
+
+    Partitioned tables drop whole partitions instead of rows.
+    """
+    from datetime import datetime
+
+    from repositories.Partition import drop_before
+    from repositories.TableVersion import bump_statement
+
+    cutoff = datetime.strptime(month, "%Y-%m").date()
+    with engine.begin() as connection:
+        drop_before(connection, cutoff)
+    with engine.begin() as connection:
+        connection.execute(
+            bump_statement(
+                connection.dialect.name, ["life_events"]
+            )
+        )
+    connect_invalidation_bus(env)
+    invalidation_bus.publish("life_events")
+    invalidation_bus.close()
+
+
+def archive_events() -> None:
+    """Move life events older than ARCHIVE_AFTER_DAYS to cold
+    storage, a whole month at a time.
+    """
+    from datetime import date, timedelta
+
+    from repositories.LifeEventRepository import (
+        LifeEventRepository,
+    )
+    from repositories.Partition import month_start
+
+    if not ARCHIVE_DIRECTORY:
+        raise RuntimeError(
+            "Set ARCHIVE_DIRECTORY before archiving life events"
+        )
+    cutoff = month_start(
+        date.today()
+        - timedelta(days=env.ARCHIVE_AFTER_DAYS)
+    )
+    # Running workers drop their cached listings
+    connect_invalidation_bus(env)
+    with SessionLocal() as db:
+        LifeEventRepository(db).archive_before(cutoff)
+    invalidation_bus.close()
+
+
+def import_events(path: str, skip: str = "0") -> None:
+    """Import life events from an NDJSON or CSV file, or from
+    standard input given "-", committing in chunks.
+
+    Progress is printed after each commit; pass its line count
+    as skip to resume an interrupted import.
+    """
+    import sys
+    from functools import partial
+
+    from repositories.DailyEventCountRepository import (
+        DailyEventCountRepository,
+    )
+    from repositories.EventTypeRepository import (
+        EventTypeRepository,
+    )
+    from repositories.LifeEventRepository import (
+        LifeEventRepository,
+    )
+    from schemas.pydantic.LifeEventSchema import (
+        ImportFormat,
+    )
+    from services.LifeEventService import LifeEventService
+
+    format = (
+        ImportFormat.csv
+        if path.endswith(".csv")
+        else ImportFormat.ndjson
+    )
+    connect_invalidation_bus(env)
+    with (
+        SessionLocal() as db,
+        (
+            open(path, "rb")
+            if path != "-"
+            else sys.stdin.buffer
+        ) as file,
+    ):
+        service = LifeEventService(
+            LifeEventRepository(db),
+            EventTypeRepository(db),
+            DailyEventCountRepository(db),
+        )
+        result = service.import_events(
+            format,
+            iter(partial(file.read, 1 << 16), b""),
+            skip=int(skip),
+            progress=lambda progress: print(
+                f"{progress.lines} lines, "
+                f"{progress.created} created, "
+                f"{progress.rejected} rejected",
+                flush=True,
+            ),
+        )
+    invalidation_bus.close()
+    for error in result.errors:
+        print(
+            f"Line {error.line}: {error.detail}",
+            file=sys.stderr,
+        )
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Optional
 import os
 
 from pydantic import BaseSettings
@@ -19,7 +20,22 @@ class EnvironmentSettings(BaseSettings):
     DATABASE_PASSWORD: str
     DATABASE_PORT: int
     DATABASE_USERNAME: str
+    DATABASE_READ_HOSTNAME: Optional[str] = None
+    DATABASE_READ_PORT: Optional[int] = None
+    DATABASE_READ_YOUR_WRITES_SECONDS: float = 5.0
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
     DEBUG_MODE: bool
+    DATABASE_ASYNC: bool = False
+    DATABASE_ASYNC_DIALECT: str = "mysql+aiomysql"
+    DATABASE_PARTITION_EVENTS: bool = False
+    DATABASE_PARTITION_MONTHS_AHEAD: int = 3
+    ARCHIVE_DIRECTORY: Optional[str] = None
+    ARCHIVE_AFTER_DAYS: int = 365
+    INVALIDATION_BUS_URL: Optional[str] = None
 
     class Config:
         env_file = get_env_filename()
@@ -29,3 +45,19 @@ class EnvironmentSettings(BaseSettings):
 @lru_cache
 def get_environment_variables():
     return EnvironmentSettings()
+
+
+def get_database_url(
+    env: EnvironmentSettings,
+    dialect: str,
+    hostname: str,
+    port: int,
+) -> str:
+    return (
+        f"{dialect}://"
+        f"{env.DATABASE_USERNAME}:"
+        f"{env.DATABASE_PASSWORD}@"
+        f"{hostname}:"
+        f"{port}/"
+        f"{env.DATABASE_NAME}"
+    )
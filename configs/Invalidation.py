@@ -0,0 +1,472 @@
+"""Cache invalidations shared by the worker processes.
+
+Every worker caches event types and listing results in process.
+A write publishes its invalidations on the bus: they apply to the
+writing process at once and reach the other workers through a
+transport, which each worker listens to on a background thread.
+
+Two transports are available:
+
+- `sqlite:///path`: a SQLite file polled by the workers of one
+  host, the default.
+- `redis://[:password@]host[:port]` or `unix:///path.sock`:
+  pub/sub on any server speaking the Redis protocol.
+
+Handlers get a table and an optional key. Both are None when
+messages may have been missed, and everything must be dropped.
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+)
+from urllib.parse import urlsplit
+
+from configs.Environment import EnvironmentSettings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "invalidations"
+
+Handler = Callable[[Optional[str], Optional[Any]], None]
+Deliver = Callable[[Optional[str]], None]
+
+
+class Transport(Protocol):
+    def publish(self, payload: str) -> None: ...
+
+    def listen(
+        self, deliver: Deliver, stopped: threading.Event
+    ) -> None:
+        """Deliver messages until stopped, None after a gap."""
+
+    def close(self) -> None: ...
+
+
+class SQLiteTransport:
+    """Messages in a SQLite file shared by the workers of a host.
+
+    Listeners poll for new rows; rows older than `retention`
+    seconds are pruned by publishers.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        poll_interval: float = 0.5,
+        retention: float = 300.0,
+    ) -> None:
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._lock = threading.Lock()
+        self._publisher: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path,
+            timeout=5.0,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        # Readers do not block the writers of other workers
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS invalidations ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "created REAL NOT NULL, "
+            "payload TEXT NOT NULL)"
+        )
+        return connection
+
+    def publish(self, payload: str) -> None:
+        now = time.time()
+        with self._lock:
+            if self._publisher is None:
+                self._publisher = self._connect()
+            self._publisher.execute(
+                "INSERT INTO invalidations (created, payload) "
+                "VALUES (?, ?)",
+                (now, payload),
+            )
+            self._publisher.execute(
+                "DELETE FROM invalidations WHERE created < ?",
+                (now - self.retention,),
+            )
+
+    def listen(
+        self, deliver: Deliver, stopped: threading.Event
+    ) -> None:
+        connection = self._connect()
+        try:
+            # Only messages published from now on
+            last = self._sequence(connection)
+            while not stopped.wait(self.poll_interval):
+                try:
+                    last = self._poll(
+                        connection, last, deliver
+                    )
+                except sqlite3.OperationalError:
+                    # Locked by a writer; retried next poll
+                    continue
+        finally:
+            connection.close()
+
+    def _sequence(
+        self, connection: sqlite3.Connection
+    ) -> int:
+        # The id of the latest message, even once pruned
+        (sequence,) = connection.execute(
+            "SELECT COALESCE(MAX(seq), 0) "
+            "FROM sqlite_sequence "
+            "WHERE name = 'invalidations'"
+        ).fetchone()
+        return sequence
+
+    def _poll(
+        self,
+        connection: sqlite3.Connection,
+        last: int,
+        deliver: Deliver,
+    ) -> int:
+        sequence = self._sequence(connection)
+        rows = connection.execute(
+            "SELECT id, payload FROM invalidations "
+            "WHERE id > ? AND id <= ? ORDER BY id",
+            (last, sequence),
+        ).fetchall()
+        # Some were pruned before this listener read them
+        if len(rows) < sequence - last:
+            deliver(None)
+        for id, payload in rows:
+            deliver(payload)
+        return sequence
+
+    def close(self) -> None:
+        with self._lock:
+            if self._publisher is not None:
+                self._publisher.close()
+                self._publisher = None
+
+
+class RedisError(Exception):
+    """An error reply of a Redis protocol server."""
+
+
+def encode_command(*arguments: str) -> bytes:
+    """A command in the Redis serialization protocol."""
+    parts = [f"*{len(arguments)}\r\n".encode()]
+    for argument in arguments:
+        data = argument.encode("utf-8")
+        parts.append(f"${len(data)}\r\n".encode())
+        parts.append(data + b"\r\n")
+    return b"".join(parts)
+
+
+def read_reply(file: BinaryIO) -> Any:
+    """Read one reply in the Redis serialization protocol."""
+    line = file.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("Connection closed")
+    kind, value = line[:1], line[1:-2]
+    if kind == b"+":
+        return value.decode("utf-8")
+    if kind == b"-":
+        raise RedisError(value.decode("utf-8"))
+    if kind == b":":
+        return int(value)
+    if kind == b"$":
+        length = int(value)
+        if length < 0:
+            return None
+        data = file.read(length + 2)
+        return data[:-2].decode("utf-8")
+    if kind == b"*":
+        length = int(value)
+        if length < 0:
+            return None
+        return [read_reply(file) for _ in range(length)]
+    raise RedisError(f"Unexpected reply: {line!r}")
+
+
+class RedisTransport:
+    """Pub/sub on a server speaking the Redis protocol.
+
+    Listeners reconnect after a lost connection, and report a gap
+    since messages published meanwhile are lost.
+    """
+
+    def __init__(
+        self,
+        address: Any,
+        family: int = socket.AF_INET,
+        password: Optional[str] = None,
+        channel: str = CHANNEL,
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        self.address = address
+        self.family = family
+        self.password = password
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._lock = threading.Lock()
+        self._publisher: Optional[
+            Tuple[socket.socket, BinaryIO]
+        ] = None
+        self._subscriber: Optional[socket.socket] = None
+
+    def _connect(self) -> Tuple[socket.socket, BinaryIO]:
+        sock = socket.socket(
+            self.family, socket.SOCK_STREAM
+        )
+        try:
+            sock.connect(self.address)
+            file = sock.makefile("rb")
+            if self.password:
+                sock.sendall(
+                    encode_command("AUTH", self.password)
+                )
+                read_reply(file)
+        except BaseException:
+            sock.close()
+            raise
+        return sock, file
+
+    def publish(self, payload: str) -> None:
+        command = encode_command(
+            "PUBLISH", self.channel, payload
+        )
+        with self._lock:
+            # One retry, for a connection closed while idle
+            for attempt in range(2):
+                if self._publisher is None:
+                    self._publisher = self._connect()
+                sock, file = self._publisher
+                try:
+                    sock.sendall(command)
+                    read_reply(file)
+                    return
+                except OSError:
+                    sock.close()
+                    self._publisher = None
+                    if attempt:
+                        raise
+
+    def listen(
+        self, deliver: Deliver, stopped: threading.Event
+    ) -> None:
+        connected_before = False
+        while not stopped.is_set():
+            try:
+                sock, file = self._connect()
+            except OSError:
+                stopped.wait(self.reconnect_delay)
+                continue
+            self._subscriber = sock
+            try:
+                sock.sendall(
+                    encode_command(
+                        "SUBSCRIBE", self.channel
+                    )
+                )
+                read_reply(file)
+                if connected_before:
+                    deliver(None)
+                connected_before = True
+                while True:
+                    reply = read_reply(file)
+                    if (
+                        isinstance(reply, list)
+                        and reply[0] == "message"
+                    ):
+                        deliver(reply[2])
+            except (OSError, ValueError, RedisError):
+                if not stopped.is_set():
+                    stopped.wait(self.reconnect_delay)
+            finally:
+                self._subscriber = None
+                sock.close()
+
+    def close(self) -> None:
+        # Unblocks a listener waiting for a message
+        subscriber = self._subscriber
+        if subscriber is not None:
+            try:
+                subscriber.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        with self._lock:
+            if self._publisher is not None:
+                self._publisher[0].close()
+                self._publisher = None
+
+
+def transport_from_url(url: str) -> Transport:
+    """The transport for an INVALIDATION_BUS_URL."""
+    parts = urlsplit(url)
+    if parts.scheme == "sqlite":
+        return SQLiteTransport(parts.path)
+    if parts.scheme == "redis":
+        return RedisTransport(
+            (
+                parts.hostname or "localhost",
+                parts.port or 6379,
+            ),
+            password=parts.password,
+        )
+    if parts.scheme == "unix":
+        return RedisTransport(
+            parts.path,
+            family=socket.AF_UNIX,
+            password=parts.password,
+        )
+    raise ValueError(
+        f"Unsupported invalidation bus URL: {url}"
+    )
+
+
+def invalidation_bus_url(env: EnvironmentSettings) -> str:
+    """The configured bus, or a SQLite file for this host."""
+    return (
+        env.INVALIDATION_BUS_URL
+        or "sqlite:///"
+        + os.path.join(
+            tempfile.gettempdir(),
+            f"{env.APP_NAME.lower()}-invalidations.db",
+        )
+    )
+
+
+class InvalidationBus:
+    """Delivers invalidations to the handlers of every worker."""
+
+    def __init__(self) -> None:
+        self._origin: Tuple[int, str] = (0, "")
+        self.transport: Optional[Transport] = None
+        self._handlers: List[Handler] = []
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def origin(self) -> str:
+        """Tells this process's own messages apart.
+
+        Made on first use in each process, as servers that fork
+        workers after importing the app would share one made at
+        import.
+        """
+        pid = os.getpid()
+        if self._origin[0] != pid:
+            self._origin = (pid, uuid.uuid4().hex)
+        return self._origin[1]
+
+    def subscribe(self, handler: Handler) -> Handler:
+        self._handlers.append(handler)
+        return handler
+
+    def connect(self, transport: Transport) -> None:
+        """Publish to other processes through a transport."""
+        self.transport = transport
+
+    def listen(self) -> None:
+        """Apply other processes' messages in the background."""
+        if (
+            self.transport is None
+            or self._thread is not None
+        ):
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self.transport.listen,
+            args=(self._receive, self._stopped),
+            name="invalidation-bus",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stopped.set()
+        if self.transport is not None:
+            self.transport.close()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+        self.transport = None
+
+    def publish(
+        self, table: str, key: Optional[Any] = None
+    ) -> None:
+        """Invalidate a table, or one key of its caches."""
+        self._apply(table, key)
+        if self.transport is None:
+            return
+        payload = json.dumps(
+            {
+                "origin": self.origin,
+                "table": table,
+                "key": key,
+            }
+        )
+        try:
+            self.transport.publish(payload)
+        except (OSError, RedisError, sqlite3.Error):
+            # The write stands; other workers catch up once
+            # their cached entries expire
+            logger.warning(
+                "Could not publish an invalidation of %s",
+                table,
+                exc_info=True,
+            )
+
+    def _receive(self, payload: Optional[str]) -> None:
+        if payload is None:
+            self._apply(None, None)
+            return
+        try:
+            message = json.loads(payload)
+            origin = message["origin"]
+            table, key = message["table"], message["key"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning(
+                "Invalid invalidation %r", payload
+            )
+            return
+        if origin != self.origin:
+            self._apply(table, key)
+
+    def _apply(
+        self, table: Optional[str], key: Optional[Any]
+    ) -> None:
+        for handler in self._handlers:
+            try:
+                handler(table, key)
+            except Exception:
+                logger.exception(
+                    "Invalidation handler failed"
+                )
+
+
+invalidation_bus = InvalidationBus()
+
+
+def connect_invalidation_bus(
+    env: EnvironmentSettings,
+) -> None:
+    """Publish this process's invalidations to the others."""
+    invalidation_bus.connect(
+        transport_from_url(invalidation_bus_url(env))
+    )
@@ -0,0 +1,117 @@
+"""Connection pool configuration and live pool metrics."""
+
+import threading
+import time
+from typing import Any, Dict, List, Type
+
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from configs.Environment import EnvironmentSettings
+
+# Measured pools by name, as reported by `pool_statistics`
+_pools: Dict[str, "MeasuredPoolMixin"] = {}
+
+
+class PoolMetrics:
+    """Thread-safe counters for connection checkouts."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_checkout(self, wait: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            checkouts = self.checkouts
+            return {
+                "checkouts": checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": (
+                    self.wait_total / checkouts * 1000
+                    if checkouts
+                    else 0.0
+                ),
+                "wait_max_ms": self.wait_max * 1000,
+            }
+
+
+class MeasuredPoolMixin:
+    """Times every checkout, including any pre-ping round trip."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        # `recreate()` builds a new pool under the same name
+        if self._orig_logging_name:
+            _pools[self._orig_logging_name] = self
+
+    def connect(self) -> Any:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(
+            time.perf_counter() - started
+        )
+        return connection
+
+
+class MeasuredQueuePool(MeasuredPoolMixin, QueuePool):
+    """QueuePool with checkout metrics."""
+
+
+class MeasuredAsyncPool(
+    MeasuredPoolMixin, AsyncAdaptedQueuePool
+):
+    """AsyncAdaptedQueuePool with checkout metrics."""
+
+
+def pool_options(
+    env: EnvironmentSettings,
+    name: str,
+    poolclass: Type[QueuePool] = MeasuredQueuePool,
+) -> Dict[str, Any]:
+    """Engine keyword arguments for a measured, sized pool."""
+    return {
+        "poolclass": poolclass,
+        "pool_size": env.DATABASE_POOL_SIZE,
+        "max_overflow": env.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": env.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": env.DATABASE_POOL_RECYCLE,
+        "pool_pre_ping": env.DATABASE_POOL_PRE_PING,
+        "pool_logging_name": name,
+    }
+
+
+def pool_statistics() -> List[Dict[str, Any]]:
+    """Current occupancy and checkout wait times per pool."""
+    statistics = []
+    for name, pool in _pools.items():
+        statistics.append(
+            {
+                "name": name,
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                # Negative while the pool is still filling up
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                **pool.metrics.snapshot(),
+            }
+        )
+    return statistics
@@ -0,0 +1,94 @@
+"""Session that routes replica-safe reads to a read engine."""
+
+import time
+from typing import Any, Optional, Union
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Mapper, Session
+from sqlalchemy.sql import ClauseElement
+from sqlalchemy.sql.dml import UpdateBase
+
+# Bind arguments for reads that may be served by the replica
+REPLICA = {"replica": True}
+
+# Cookie holding the time until which a client that wrote reads
+# from the primary
+PRIMARY_COOKIE = "primary_until"
+
+
+class RoutingSession(Session):
+    """Sends reads executed with `replica=True` to the read engine.
+
+    The read engine comes from `info["read_engine"]`; without one,
+    everything runs on the primary. Once the session writes, later
+    reads stay on the primary too, so a request always sees its own
+    writes (such as the refresh that follows a create). Reads also
+    stay on the primary until `primary_until`, a Unix time, so a
+    client's next requests see its writes despite replica lag.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.has_written = False
+        self.primary_until = 0.0
+
+    def get_bind(
+        self,
+        mapper: Optional[Mapper] = None,
+        clause: Optional[ClauseElement] = None,
+        replica: bool = False,
+        **kwargs: Any,
+    ) -> Union[Engine, Connection]:
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.has_written = True
+
+        read_engine = self.info.get("read_engine")
+        if (
+            replica
+            and read_engine
+            and not self.has_written
+            and time.time() >= self.primary_until
+        ):
+            return read_engine
+        return super().get_bind(
+            mapper=mapper, clause=clause, **kwargs
+        )
+
+
+def read_your_writes(
+    session: RoutingSession,
+    request: Request,
+    response: Response,
+    window: float,
+) -> None:
+    """Keep a client's reads on the primary for `window` seconds
+    after each request that writes.
+
+    The deadline travels in the PRIMARY_COOKIE cookie, so it holds
+    across requests, sessions and workers.
+    """
+    if not session.info.get("read_engine") or window <= 0:
+        return
+    try:
+        session.primary_until = float(
+            request.cookies.get(PRIMARY_COOKIE, 0)
+        )
+    except ValueError:
+        pass
+
+    pinned = False
+
+    @event.listens_for(session, "after_commit")
+    def pin_to_primary(session: RoutingSession) -> None:
+        nonlocal pinned
+        if session.has_written and not pinned:
+            pinned = True
+            response.set_cookie(
+                PRIMARY_COOKIE,
+                f"{time.time() + window:.3f}",
+                max_age=int(window) + 1,
+                httponly=True,
+                samesite="lax",
+            )
@@ -4,8 +4,20 @@ from strawberry.fastapi import GraphQLRouter
 
 from configs.Environment import get_environment_variables
 from configs.GraphQL import get_graphql_context
+from configs.Invalidation import (
+    connect_invalidation_bus,
+    invalidation_bus,
+)
 from configs.database import init
 from metadata.Tags import Tags
+from routers.Conditional import (
+    NotModified,
+    not_modified_handler,
+)
+from routers.Fallback import with_fallback
+from routers.v1.DatabaseRouter import (
+    router as DatabaseRouter,
+)
 from routers.v1.EventRouter import router as EventRouter
 from routers.v1.EventTypeRouter import (
     router as EventTypeRouter,
@@ -23,9 +35,43 @@ app = FastAPI(
     openapi_tags=Tags,
 )
 
+# Serve routes with async handlers when configured; routes
+# without an async variant keep their sync handler
+if env.DATABASE_ASYNC:
+    from routers.v1.AsyncEventRouter import (
+        router as AsyncEventRouter,
+    )
+    from routers.v1.AsyncEventTypeRouter import (
+        router as AsyncEventTypeRouter,
+    )
+
+    EventRouter = with_fallback(
+        AsyncEventRouter, EventRouter
+    )
+    EventTypeRouter = with_fallback(
+        AsyncEventTypeRouter, EventTypeRouter
+    )
+
+# Conditional GETs answer 304 without a body
+app.add_exception_handler(NotModified, not_modified_handler)
+
+
+# Share cache invalidations with the other workers
+@app.on_event("startup")
+def listen_for_invalidations() -> None:
+    connect_invalidation_bus(env)
+    invalidation_bus.listen()
+
+
+@app.on_event("shutdown")
+def stop_listening_for_invalidations() -> None:
+    invalidation_bus.close()
+
+
 # Add Routers
 app.include_router(EventRouter)
 app.include_router(EventTypeRouter)
+app.include_router(DatabaseRouter)
 
 # GraphQL Schema and Application Instance
 schema = Schema(query=Query, mutation=Mutation)
@@ -9,4 +9,8 @@ Tags = [
         "name": "event-types",
         "description": "Operations with event types. Manage different types of life events and their schemas.",
     },
+    {
+        "name": "database",
+        "description": "Operational insight into database connection pools.",
+    },
 ]
@@ -0,0 +1,37 @@
+"""Daily life event count rollup model definition."""
+
+from datetime import date
+
+from sqlalchemy import (
+    Date,
+    ForeignKey,
+    Integer,
+)
+from sqlalchemy.orm import Mapped
+from sqlalchemy.sql.schema import Column
+
+from models.BaseModel import Base
+
+
+class DailyEventCount(Base):
+    """Number of life events per day and event type.
+
+    Maintained by the life event repositories in the same
+    transaction as every write, so summaries never scan events.
+    """
+
+    __tablename__ = "daily_event_counts"
+
+    # Day first, so date ranges are primary key range scans
+    day: Mapped[date] = Column(Date, primary_key=True)
+    event_type_id: Mapped[int] = Column(
+        Integer,
+        ForeignKey("event_types.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    count: Mapped[int] = Column(
+        Integer, nullable=False, default=0
+    )
+
+    def __repr__(self) -> str:
+        return f"<DailyEventCount {self.event_type_id}:{self.day}>"
@@ -38,10 +38,13 @@ class EventType(Base):
     )
 
     # Relationships
+    # Deletes rely on the life_events ON DELETE CASCADE foreign
+    # key instead of loading every event into the session
     events: Mapped[List["LifeEvent"]] = relationship(
         "LifeEvent",
         back_populates="event_type",
         cascade="all, delete",
+        passive_deletes=True,
     )
 
     def __repr__(self) -> str:
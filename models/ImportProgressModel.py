@@ -0,0 +1,41 @@
+"""Bulk import progress model definition."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped
+from sqlalchemy.sql.schema import Column
+
+from models.BaseModel import Base
+
+
+class ImportProgress(Base):
+    """Progress of a named life event import.
+
+    Saved with every chunk the import commits, so a client whose
+    connection dropped can resume from what was committed.
+    """
+
+    __tablename__ = "import_progress"
+
+    name: Mapped[str] = Column(
+        String(255), primary_key=True
+    )
+    lines: Mapped[int] = Column(
+        Integer, nullable=False, default=0
+    )
+    created: Mapped[int] = Column(
+        Integer, nullable=False, default=0
+    )
+    rejected: Mapped[int] = Column(
+        Integer, nullable=False, default=0
+    )
+    updated_at: Mapped[datetime] = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+    )
+
+    def __repr__(self) -> str:
+        return f"<ImportProgress {self.name}:{self.lines}>"
@@ -5,6 +5,7 @@ from sqlalchemy import (
     Integer,
     DateTime,
     ForeignKey,
+    Index,
     JSON,
 )
 from sqlalchemy.orm import relationship, Mapped
@@ -17,6 +18,18 @@ class LifeEvent(Base):
     """Model for life events."""
 
     __tablename__ = "life_events"
+    __table_args__ = (
+        # Serves type-filtered time ranges ordered by timestamp
+        Index(
+            "ix_life_events_event_type_id_timestamp",
+            "event_type_id",
+            "timestamp",
+        ),
+        # Serves unfiltered time ranges and keyset pagination
+        Index("ix_life_events_timestamp", "timestamp"),
+        # Ids of archived events are never reused
+        {"sqlite_autoincrement": True},
+    )
 
     id: Mapped[int] = Column(
         Integer, primary_key=True, index=True
@@ -0,0 +1,30 @@
+"""Table change version model definition."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped
+from sqlalchemy.sql.schema import Column
+
+from models.BaseModel import Base
+
+
+class TableVersion(Base):
+    """Change counter of a table, bumped after every write.
+
+    Lets readers tell whether a table changed without reading
+    it, such as for HTTP validators.
+    """
+
+    __tablename__ = "table_versions"
+
+    name: Mapped[str] = Column(String(64), primary_key=True)
+    version: Mapped[int] = Column(
+        Integer, nullable=False, default=0
+    )
+    updated_at: Mapped[datetime] = Column(
+        DateTime, nullable=False, default=datetime.utcnow
+    )
+
+    def __repr__(self) -> str:
+        return f"<TableVersion {self.name}:{self.version}>"
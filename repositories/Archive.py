@@ -0,0 +1,539 @@
+"""Cold storage for old life events.
+
+Events are moved out of `life_events` a month at a time into
+immutable, gzip-compressed JSON lines segments. A manifest records
+the month, id range, event types and a bloom filter of the ids of
+every segment, so reads only open the segments that can match.
+Listings, exports and bucket stats fall through to the segments.
+Archived events are read only: they keep their daily counts but are
+not searchable, and updates and deletes do not reach them. Events
+of a deleted event type stay in their segments but are no longer
+read.
+"""
+
+import asyncio
+import base64
+import copy
+import gzip
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import tempfile
+from collections import Counter
+from datetime import date, datetime
+from functools import lru_cache
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from models.LifeEventModel import LifeEvent
+from repositories.DataField import OPERATORS
+from repositories.Partition import add_months, month_start
+from repositories.TimeBucket import bucket_start
+
+MANIFEST = "manifest.json"
+
+# Bloom filters of segment ids: with 10 bits per id and 7 hashes,
+# about 1% of lookups of other ids still open the segment
+ID_FILTER_BITS_PER_ID = 10
+ID_FILTER_HASHES = 7
+
+
+def _naive(value: Any) -> Optional[datetime]:
+    # Timestamps are stored without a zone, as in the database
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    return value.replace(tzinfo=None)
+
+
+def _sort_key(event: LifeEvent) -> Tuple[datetime, int]:
+    return event.timestamp, event.id
+
+
+def _field_value(kind: str, value: Any) -> Any:
+    # Values of another JSON type never match, like NULL in SQL
+    if kind == "number":
+        if isinstance(value, bool) or not isinstance(
+            value, (int, float)
+        ):
+            return None
+        return float(value)
+    return value if isinstance(value, str) else None
+
+
+def _id_filter_positions(
+    id: int, size: int
+) -> Iterator[int]:
+    # Double hashing over one digest of the id
+    digest = hashlib.blake2b(
+        str(id).encode("ascii"), digest_size=16
+    ).digest()
+    first = int.from_bytes(digest[:8], "little")
+    second = int.from_bytes(digest[8:], "little") | 1
+    for index in range(ID_FILTER_HASHES):
+        yield (first + index * second) % size
+
+
+def id_filter(ids: List[int]) -> str:
+    """A bloom filter of segment ids, base64 encoded."""
+    bits = bytearray(
+        max(1, -(-len(ids) * ID_FILTER_BITS_PER_ID // 8))
+    )
+    for id in ids:
+        for position in _id_filter_positions(
+            id, len(bits) * 8
+        ):
+            bits[position >> 3] |= 1 << (position & 7)
+    return base64.b64encode(bytes(bits)).decode("ascii")
+
+
+def _may_hold(bits: Optional[bytes], id: int) -> bool:
+    # Segments written before the filters may hold any id
+    if bits is None:
+        return True
+    return all(
+        bits[position >> 3] & (1 << (position & 7))
+        for position in _id_filter_positions(
+            id, len(bits) * 8
+        )
+    )
+
+
+@lru_cache(maxsize=16)
+def _read_segment(path: str) -> Tuple[LifeEvent, ...]:
+    # Segments never change once written, so they cache by path.
+    # The instances are shared: hand out _copy() of them.
+    events = []
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        for line in file:
+            row = json.loads(line)
+            events.append(
+                LifeEvent(
+                    id=row["id"],
+                    timestamp=datetime.fromisoformat(
+                        row["timestamp"]
+                    ),
+                    event_type_id=row["event_type_id"],
+                    data=row["data"],
+                )
+            )
+    return tuple(events)
+
+
+def _copy(event: LifeEvent) -> LifeEvent:
+    # A caller's own instance, so changes never reach the cache
+    return LifeEvent(
+        id=event.id,
+        timestamp=event.timestamp,
+        event_type_id=event.event_type_id,
+        data=copy.deepcopy(event.data),
+    )
+
+
+class Conditions:
+    """The listing filters of life events, in Python."""
+
+    def __init__(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        filters = filters or {}
+        self.event_type_ids = {
+            id
+            for id in (
+                kwargs.get("event_type_id"),
+                filters.get("event_type_id"),
+            )
+            if id
+        }
+        starts = [
+            _naive(value)
+            for value in (
+                kwargs.get("start_date"),
+                filters.get("start_date"),
+            )
+            if value
+        ]
+        self.start_date = max(starts) if starts else None
+        ends = [
+            _naive(value)
+            for value in (
+                kwargs.get("end_date"),
+                filters.get("end_date"),
+            )
+            if value
+        ]
+        self.end_date = min(ends) if ends else None
+        after = kwargs.get("after")
+        self.after = (
+            (_naive(after[0]), after[1]) if after else None
+        )
+        self.data_filters = kwargs.get("data_filters") or []
+        # Event types that still exist; deleting one only
+        # cascades to the table, so its archived events remain
+        self.live_event_type_ids: Optional[Set[int]] = None
+
+    @property
+    def earliest(self) -> Optional[datetime]:
+        """The earliest timestamp that can match."""
+        bounds = [
+            bound
+            for bound in (
+                self.start_date,
+                self.after[0] if self.after else None,
+            )
+            if bound
+        ]
+        return max(bounds) if bounds else None
+
+    def matches(self, event: LifeEvent) -> bool:
+        if (
+            self.live_event_type_ids is not None
+            and event.event_type_id
+            not in self.live_event_type_ids
+        ):
+            return False
+        if any(
+            event.event_type_id != id
+            for id in self.event_type_ids
+        ):
+            return False
+        if (
+            self.start_date
+            and event.timestamp < self.start_date
+        ):
+            return False
+        if (
+            self.end_date
+            and event.timestamp > self.end_date
+        ):
+            return False
+        if self.after and _sort_key(event) <= self.after:
+            return False
+        for field, op, value in self.data_filters:
+            # Fields belong to the event type declaring them
+            if event.event_type_id != field.event_type_id:
+                return False
+            actual = _field_value(
+                field.kind, event.data.get(field.name)
+            )
+            if actual is None or not OPERATORS[op](
+                actual, value
+            ):
+                return False
+        return True
+
+
+class SegmentArchive:
+    """Monthly segments of archived life events in a directory."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._manifest: Tuple[Any, List[Dict[str, Any]]] = (
+            None,
+            [],
+        )
+        # Decoded id filters by segment name
+        self._id_filters: Dict[str, Optional[bytes]] = {}
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _write_atomic(self, name: str, write: Any) -> None:
+        # Readers see either no file or a complete one
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                write(file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary, self._path(name))
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def segments(self) -> List[Dict[str, Any]]:
+        """The manifest entries of every segment, oldest first."""
+        try:
+            stat = os.stat(self._path(MANIFEST))
+        except FileNotFoundError:
+            return []
+        # Every write replaces the file, so it changes the inode
+        version = (stat.st_ino, stat.st_mtime_ns)
+        if version != self._manifest[0]:
+            with open(self._path(MANIFEST)) as file:
+                self._manifest = (version, json.load(file))
+        return self._manifest[1]
+
+    def archived_until(self) -> Optional[date]:
+        """The first day after the latest archived month."""
+        months = [
+            date.fromisoformat(segment["month"])
+            for segment in self.segments()
+        ]
+        return (
+            add_months(max(months), 1) if months else None
+        )
+
+    def _months(
+        self, conditions: Conditions
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        # The segments that can match, by month
+        months: Dict[str, List[Dict[str, Any]]] = {}
+        for segment in self.segments():
+            if not conditions.event_type_ids.issubset(
+                segment["event_type_ids"]
+            ):
+                continue
+            month = date.fromisoformat(segment["month"])
+            if (
+                conditions.earliest
+                and _naive(add_months(month, 1))
+                <= conditions.earliest
+            ):
+                continue
+            if conditions.end_date and (
+                _naive(month) > conditions.end_date
+            ):
+                continue
+            months.setdefault(segment["month"], []).append(
+                segment
+            )
+        return months
+
+    def reaches(self, conditions: Conditions) -> bool:
+        """Whether archived events can match the conditions.
+
+        Decided from the manifest alone. Listings without a
+        start date or cursor begin at the oldest events, which
+        are archived, so they reach the archive; `events()` then
+        opens one month at a time, as far as a page is read.
+        """
+        return bool(self._months(conditions))
+
+    def write(
+        self, month: date, events: Iterable[LifeEvent]
+    ) -> Optional[Dict[str, Any]]:
+        """Write events of a month as a new segment.
+
+        Events are compressed as they are read, so any number
+        fit. Returns the manifest entry, or None without events.
+        """
+        events = iter(events)
+        first = next(events, None)
+        if first is None:
+            return None
+
+        segments = self.segments()
+        month = month_start(month)
+        sequence = sum(
+            segment["month"] == month.isoformat()
+            for segment in segments
+        )
+        name = f"life_events-{month:%Y-%m}-{sequence:04d}.jsonl.gz"
+        ids: List[int] = []
+        event_type_ids = set()
+
+        def write_events(file: Any) -> None:
+            with gzip.GzipFile(
+                fileobj=file, mode="wb"
+            ) as compressed:
+                for event in itertools.chain(
+                    [first], events
+                ):
+                    ids.append(event.id)
+                    event_type_ids.add(event.event_type_id)
+                    row = {
+                        "id": event.id,
+                        "timestamp": event.timestamp.isoformat(),
+                        "event_type_id": event.event_type_id,
+                        "data": event.data,
+                    }
+                    compressed.write(
+                        (
+                            json.dumps(
+                                row, separators=(",", ":")
+                            )
+                            + "\n"
+                        ).encode("utf-8")
+                    )
+
+        self._write_atomic(name, write_events)
+
+        segment = {
+            "name": name,
+            "month": month.isoformat(),
+            "count": len(ids),
+            "min_id": min(ids),
+            "max_id": max(ids),
+            "event_type_ids": sorted(event_type_ids),
+            "id_filter": id_filter(ids),
+        }
+        manifest = json.dumps(
+            segments + [segment], indent=2
+        ).encode("utf-8")
+        self._write_atomic(
+            MANIFEST, lambda file: file.write(manifest)
+        )
+        return segment
+
+    def _id_filter(
+        self, segment: Dict[str, Any]
+    ) -> Optional[bytes]:
+        name = segment["name"]
+        if name not in self._id_filters:
+            encoded = segment.get("id_filter")
+            self._id_filters[name] = (
+                None
+                if encoded is None
+                else base64.b64decode(encoded)
+            )
+        return self._id_filters[name]
+
+    def get(self, id: int) -> Optional[LifeEvent]:
+        for segment in self.segments():
+            if not (
+                segment["min_id"] <= id <= segment["max_id"]
+                and _may_hold(self._id_filter(segment), id)
+            ):
+                continue
+            for event in _read_segment(
+                self._path(segment["name"])
+            ):
+                if event.id == id:
+                    return _copy(event)
+        return None
+
+    def events(
+        self, conditions: Conditions
+    ) -> Iterator[LifeEvent]:
+        """Matching archived events by timestamp and id."""
+        months = self._months(conditions)
+        # Months never overlap, so only one is sorted at a time
+        for month in sorted(months):
+            events = [
+                event
+                for segment in months[month]
+                for event in _read_segment(
+                    self._path(segment["name"])
+                )
+                if conditions.matches(event)
+            ]
+            for event in sorted(events, key=_sort_key):
+                yield _copy(event)
+
+    def count_by_bucket(
+        self, interval: str, conditions: Conditions
+    ) -> Counter:
+        """Matching archived events per bucket and event type."""
+        return Counter(
+            (
+                bucket_start(interval, event.timestamp),
+                event.event_type_id,
+            )
+            for segment in itertools.chain.from_iterable(
+                self._months(conditions).values()
+            )
+            for event in _read_segment(
+                self._path(segment["name"])
+            )
+            if conditions.matches(event)
+        )
+
+
+def merge_events(
+    *sources: Iterable[LifeEvent],
+) -> Iterator[LifeEvent]:
+    """Merge ordered events, each id once.
+
+    An event is in both tiers if archiving stopped between
+    writing its segment and deleting it from the table.
+    """
+    previous = None
+    for event in heapq.merge(*sources, key=_sort_key):
+        if event.id != previous:
+            yield event
+        previous = event.id
+
+
+# Archived events read per trip off the event loop
+ARCHIVE_BATCH_SIZE = 1000
+
+
+async def read_in_batches(
+    events: Iterable[LifeEvent],
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+) -> AsyncIterator[LifeEvent]:
+    """Read events in a worker thread, a batch at a time.
+
+    Segments are decompressed as they are read, so only a batch
+    is held in memory.
+    """
+    events = iter(events)
+    while True:
+        batch = await asyncio.to_thread(
+            lambda: list(
+                itertools.islice(events, batch_size)
+            )
+        )
+        if not batch:
+            return
+        for event in batch:
+            yield event
+
+
+async def merge_async_events(
+    archived: Iterable[LifeEvent],
+    events: AsyncIterator[LifeEvent],
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+) -> AsyncIterator[LifeEvent]:
+    """Merge ordered archived events into a database stream."""
+    archived = read_in_batches(archived, batch_size)
+    pending = await anext(archived, None)
+    async for event in events:
+        while pending is not None and _sort_key(
+            pending
+        ) < _sort_key(event):
+            yield pending
+            pending = await anext(archived, None)
+        if pending is not None and pending.id == event.id:
+            pending = await anext(archived, None)
+        yield event
+    while pending is not None:
+        yield pending
+        pending = await anext(archived, None)
+
+
+def window(
+    limit: Optional[int],
+    start: Optional[int],
+    after: Optional[Tuple[datetime, int]],
+) -> Tuple[int, Optional[int]]:
+    """The slice of the merged events a listing page covers.
+
+    Each tier is read up to its end, as either may fill it.
+    """
+    offset = 0 if after else start or 0
+    return offset, None if limit is None else offset + limit
+
+
+@lru_cache
+def get_archive(
+    directory: Optional[str],
+) -> Optional[SegmentArchive]:
+    """The archive in a directory, shared by the repositories."""
+    return SegmentArchive(directory) if directory else None
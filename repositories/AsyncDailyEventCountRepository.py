@@ -0,0 +1,43 @@
+from typing import Any, Dict, List
+
+from fastapi import Depends
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from configs.AsyncDatabase import get_async_db
+from configs.Routing import REPLICA
+from repositories.Rollup import (
+    RollupKey,
+    delta_statements,
+    summary_statement,
+)
+
+
+class AsyncDailyEventCountRepository:
+    """Async counterpart of DailyEventCountRepository."""
+
+    db: AsyncSession
+
+    def __init__(
+        self, db: AsyncSession = Depends(get_async_db)
+    ) -> None:
+        self.db = db
+
+    async def list(
+        self, interval: str, **kwargs: Any
+    ) -> List[Row]:
+        result = await self.db.execute(
+            summary_statement(interval, **kwargs),
+            bind_arguments=REPLICA,
+        )
+        return result.all()
+
+    async def add(
+        self, deltas: Dict[RollupKey, int]
+    ) -> None:
+        # Part of the caller's transaction; the caller commits
+        dialect_name = self.db.get_bind().dialect.name
+        for statement in delta_statements(
+            dialect_name, deltas
+        ):
+            await self.db.execute(statement)
@@ -0,0 +1,116 @@
+from typing import List, Optional, Dict, Any
+
+from fastapi import Depends
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from configs.AsyncDatabase import get_async_db
+from configs.database import PARTITIONED_EVENTS
+from configs.Routing import REPLICA
+from models.EventTypeModel import EventType
+from models.LifeEventModel import LifeEvent
+from repositories.EventTypeRepository import list_statement
+from repositories.AsyncTableVersionRepository import (
+    AsyncTableVersionRepository,
+)
+from repositories.Returning import (
+    detached_from_row,
+    supports_returning,
+)
+
+
+class AsyncEventTypeRepository:
+    """Async counterpart of EventTypeRepository."""
+
+    db: AsyncSession
+    versions: AsyncTableVersionRepository
+
+    def __init__(
+        self, db: AsyncSession = Depends(get_async_db)
+    ) -> None:
+        self.db = db
+        self.versions = AsyncTableVersionRepository(db)
+
+    async def _commit(self, *tables: str) -> None:
+        await self.versions.bump(*tables)
+        await self.db.commit()
+        await self.versions.publish(*tables)
+
+    async def list(
+        self,
+        limit: Optional[int] = None,
+        start: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[EventType]:
+        query = list_statement(
+            limit, start, filters, **kwargs
+        )
+        result = await self.db.execute(
+            query, bind_arguments=REPLICA
+        )
+        return result.scalars().all()
+
+    async def get(self, id: int) -> Optional[EventType]:
+        result = await self.db.execute(
+            select(EventType).where(EventType.id == id),
+            bind_arguments=REPLICA,
+        )
+        return result.scalar_one_or_none()
+
+    async def create(
+        self, event_type: EventType
+    ) -> EventType:
+        self.db.add(event_type)
+        await self._commit(EventType.__tablename__)
+        return event_type
+
+    async def update(
+        self, id: int, values: Dict[str, Any]
+    ) -> Optional[EventType]:
+        if not values:
+            return await self.db.get(EventType, id)
+
+        statement = (
+            update(EventType)
+            .where(EventType.id == id)
+            .values(**values)
+        )
+        if supports_returning(self.db):
+            result = await self.db.execute(
+                statement.returning(
+                    *EventType.__table__.columns
+                )
+            )
+            row = result.first()
+            await self._commit(EventType.__tablename__)
+            if row is None:
+                return None
+            return await self.db.merge(
+                detached_from_row(EventType, row),
+                load=False,
+            )
+
+        result = await self.db.execute(statement)
+        await self._commit(EventType.__tablename__)
+        if result.rowcount == 0:
+            return None
+        return await self.db.get(
+            EventType, id, populate_existing=True
+        )
+
+    async def delete(self, id: int) -> None:
+        # Related life events go with the ON DELETE CASCADE key,
+        # which partitioned tables cannot have
+        if PARTITIONED_EVENTS:
+            await self.db.execute(
+                delete(LifeEvent).where(
+                    LifeEvent.event_type_id == id
+                )
+            )
+        await self.db.execute(
+            delete(EventType).where(EventType.id == id)
+        )
+        await self._commit(
+            EventType.__tablename__, LifeEvent.__tablename__
+        )
@@ -0,0 +1,384 @@
+import asyncio
+from collections import Counter
+from datetime import datetime
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from fastapi import Depends
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from configs.AsyncDatabase import get_async_db
+from configs.database import (
+    ARCHIVE_DIRECTORY,
+    PARTITIONED_EVENTS,
+)
+from configs.Routing import REPLICA
+from models.EventTypeModel import EventType
+from models.ImportProgressModel import ImportProgress
+from models.LifeEventModel import LifeEvent
+from repositories.Archive import (
+    Conditions,
+    SegmentArchive,
+    get_archive,
+    merge_async_events,
+    merge_events,
+    window,
+)
+from repositories.AsyncDailyEventCountRepository import (
+    AsyncDailyEventCountRepository,
+)
+from repositories.LifeEventRepository import (
+    STREAM_BATCH_SIZE,
+    list_statement,
+    load_columns,
+    merge_counts,
+    stats_statement,
+)
+from repositories.Returning import (
+    detached_from_row,
+    supports_returning,
+)
+from repositories.Rollup import move_deltas, rollup_key
+from repositories.Search import (
+    SearchUnavailable,
+    search_statement,
+)
+from repositories.AsyncTableVersionRepository import (
+    AsyncTableVersionRepository,
+)
+
+
+class AsyncLifeEventRepository:
+    """Async counterpart of LifeEventRepository."""
+
+    db: AsyncSession
+    daily_event_counts: AsyncDailyEventCountRepository
+    versions: AsyncTableVersionRepository
+    archive: Optional[SegmentArchive]
+
+    def __init__(
+        self, db: AsyncSession = Depends(get_async_db)
+    ) -> None:
+        self.db = db
+        # Shares the session, so counts commit with the events
+        self.daily_event_counts = (
+            AsyncDailyEventCountRepository(db)
+        )
+        self.versions = AsyncTableVersionRepository(db)
+        self.archive = get_archive(ARCHIVE_DIRECTORY)
+
+    async def _reaches_archive(
+        self, conditions: Conditions
+    ) -> bool:
+        # Archived events of deleted event types are skipped
+        if not (
+            self.archive
+            and self.archive.reaches(conditions)
+        ):
+            return False
+        result = await self.db.execute(
+            select(EventType.id), bind_arguments=REPLICA
+        )
+        conditions.live_event_type_ids = set(
+            result.scalars()
+        )
+        return True
+
+    async def _commit(self) -> None:
+        await self.versions.bump(LifeEvent.__tablename__)
+        await self.db.commit()
+        await self.versions.publish(LifeEvent.__tablename__)
+
+    async def _locked_rollup_row(
+        self, id: int, *columns: Any
+    ) -> Optional[Row]:
+        # Locked, so concurrent writes cannot move the event
+        # between reading its rollup row and counting it there
+        result = await self.db.execute(
+            select(
+                LifeEvent.timestamp,
+                LifeEvent.event_type_id,
+                *columns,
+            )
+            .where(LifeEvent.id == id)
+            .with_for_update()
+        )
+        return result.first()
+
+    async def list(
+        self,
+        limit: Optional[int] = None,
+        start: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[LifeEvent]:
+        conditions = Conditions(filters, **kwargs)
+        if await self._reaches_archive(conditions):
+            offset, stop = window(
+                limit, start, kwargs.get("after")
+            )
+            result = await self.db.execute(
+                list_statement(
+                    stop, None, filters, **kwargs
+                ),
+                bind_arguments=REPLICA,
+            )
+            events = result.scalars().all()
+            # Segments are read off the event loop
+            return await asyncio.to_thread(
+                lambda: list(
+                    islice(
+                        merge_events(
+                            self.archive.events(conditions),
+                            events,
+                        ),
+                        offset,
+                        stop,
+                    )
+                )
+            )
+
+        query = list_statement(
+            limit, start, filters, **kwargs
+        )
+        result = await self.db.execute(
+            query, bind_arguments=REPLICA
+        )
+        return result.scalars().all()
+
+    async def stream(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[LifeEvent]:
+        # Server-side cursor, so memory stays flat for any result
+        query = list_statement(
+            filters=filters, **kwargs
+        ).execution_options(yield_per=STREAM_BATCH_SIZE)
+        result = await self.db.stream(
+            query, bind_arguments=REPLICA
+        )
+        events = result.scalars()
+        conditions = Conditions(filters, **kwargs)
+        if await self._reaches_archive(conditions):
+            # Segments are read off the event loop, a batch at
+            # a time, as the sync stream reads them
+            events = merge_async_events(
+                self.archive.events(conditions),
+                events,
+                STREAM_BATCH_SIZE,
+            )
+        async for life_event in events:
+            yield life_event
+
+    async def count_by_bucket(
+        self, interval: str, **kwargs: Any
+    ) -> List[Tuple[datetime, int, int]]:
+        result = await self.db.execute(
+            stats_statement(interval, **kwargs),
+            bind_arguments=REPLICA,
+        )
+        rows = result.all()
+        # Archived months count as they do in the rollups
+        conditions = Conditions(**kwargs)
+        if await self._reaches_archive(conditions):
+            return merge_counts(
+                rows,
+                await asyncio.to_thread(
+                    self.archive.count_by_bucket,
+                    interval,
+                    conditions,
+                ),
+            )
+        return rows
+
+    async def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        start: Optional[int] = None,
+        event_type_id: Optional[int] = None,
+    ) -> List[Row]:
+        if PARTITIONED_EVENTS:
+            raise SearchUnavailable(
+                "Full-text search is unavailable on "
+                "partitioned life events"
+            )
+        statement = search_statement(
+            self.db.get_bind().dialect.name,
+            query,
+            limit,
+            start,
+            event_type_id,
+        )
+        result = await self.db.execute(
+            statement, bind_arguments=REPLICA
+        )
+        return result.all()
+
+    async def get(
+        self,
+        id: int,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Optional[LifeEvent]:
+        result = await self.db.execute(
+            select(LifeEvent)
+            .where(LifeEvent.id == id)
+            .options(*load_columns(columns)),
+            bind_arguments=REPLICA,
+        )
+        event = result.scalar_one_or_none()
+        if event is None and self.archive:
+            event = await asyncio.to_thread(
+                self.archive.get, id
+            )
+            if event is not None:
+                result = await self.db.execute(
+                    select(EventType.id).where(
+                        EventType.id == event.event_type_id
+                    ),
+                    bind_arguments=REPLICA,
+                )
+                if result.first() is None:
+                    return None
+        return event
+
+    async def create(
+        self, life_event: LifeEvent
+    ) -> LifeEvent:
+        self.db.add(life_event)
+        # Applies the column defaults before counting the event
+        await self.db.flush()
+        await self.daily_event_counts.add(
+            {
+                rollup_key(
+                    life_event.timestamp,
+                    life_event.event_type_id,
+                ): 1
+            }
+        )
+        await self._commit()
+        return life_event
+
+    async def create_many(
+        self,
+        rows: List[Dict[str, Any]],
+        progress: Optional[ImportProgress] = None,
+    ) -> int:
+        # One executemany INSERT in a single transaction, with
+        # the import progress
+        if progress is not None:
+            await self.db.merge(progress)
+        if rows:
+            await self.db.execute(insert(LifeEvent), rows)
+            await self.daily_event_counts.add(
+                Counter(
+                    rollup_key(
+                        row["timestamp"],
+                        row["event_type_id"],
+                    )
+                    for row in rows
+                )
+            )
+            await self._commit()
+        elif progress is not None:
+            await self.db.commit()
+        return len(rows)
+
+    async def get_import_progress(
+        self, name: str
+    ) -> Optional[ImportProgress]:
+        # From the primary, as in LifeEventRepository
+        return await self.db.get(ImportProgress, name)
+
+    async def update(
+        self,
+        id: int,
+        values: Dict[str, Any],
+        check: Optional[
+            Callable[[Row], Awaitable[None]]
+        ] = None,
+    ) -> Optional[LifeEvent]:
+        if not values:
+            return await self.db.get(LifeEvent, id)
+
+        # Only a new day or event type moves the event's count
+        rollup_row = None
+        if check is not None:
+            rollup_row = await self._locked_rollup_row(
+                id, LifeEvent.data
+            )
+            if rollup_row is None:
+                return None
+            await check(rollup_row)
+        elif (
+            "timestamp" in values
+            or "event_type_id" in values
+        ):
+            rollup_row = await self._locked_rollup_row(id)
+            if rollup_row is None:
+                return None
+
+        statement = (
+            update(LifeEvent)
+            .where(LifeEvent.id == id)
+            .values(**values)
+        )
+        if supports_returning(self.db):
+            result = await self.db.execute(
+                statement.returning(
+                    *LifeEvent.__table__.columns
+                )
+            )
+            row = result.first()
+            if rollup_row is not None:
+                await self.daily_event_counts.add(
+                    move_deltas(rollup_row, values)
+                )
+            await self._commit()
+            if row is None:
+                return None
+            return await self.db.merge(
+                detached_from_row(LifeEvent, row),
+                load=False,
+            )
+
+        result = await self.db.execute(statement)
+        if rollup_row is not None:
+            await self.daily_event_counts.add(
+                move_deltas(rollup_row, values)
+            )
+        await self._commit()
+        if result.rowcount == 0:
+            return None
+        return await self.db.get(
+            LifeEvent, id, populate_existing=True
+        )
+
+    async def delete(self, id: int) -> None:
+        rollup_row = await self._locked_rollup_row(id)
+        await self.db.execute(
+            delete(LifeEvent).where(LifeEvent.id == id)
+        )
+        if rollup_row is not None:
+            await self.daily_event_counts.add(
+                {
+                    rollup_key(
+                        rollup_row.timestamp,
+                        rollup_row.event_type_id,
+                    ): -1
+                }
+            )
+        await self._commit()
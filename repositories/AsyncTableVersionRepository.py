@@ -0,0 +1,49 @@
+import asyncio
+from typing import Dict
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from configs.AsyncDatabase import get_async_db
+from configs.Invalidation import invalidation_bus
+from configs.Routing import REPLICA
+from models.TableVersionModel import TableVersion
+from repositories.TableVersion import (
+    bump_statement,
+    versions_statement,
+)
+
+
+class AsyncTableVersionRepository:
+    """Async counterpart of TableVersionRepository."""
+
+    db: AsyncSession
+
+    def __init__(
+        self, db: AsyncSession = Depends(get_async_db)
+    ) -> None:
+        self.db = db
+
+    async def get(
+        self, *names: str
+    ) -> Dict[str, TableVersion]:
+        result = await self.db.execute(
+            versions_statement(names),
+            bind_arguments=REPLICA,
+        )
+        return {row.name: row for row in result.scalars()}
+
+    async def bump(self, *names: str) -> None:
+        # Part of the caller's transaction, before it commits
+        await self.db.execute(
+            bump_statement(
+                self.db.get_bind().dialect.name, names
+            )
+        )
+
+    async def publish(self, *names: str) -> None:
+        # Off the event loop, as publishing does network I/O
+        for name in names:
+            await asyncio.to_thread(
+                invalidation_bus.publish, name
+            )
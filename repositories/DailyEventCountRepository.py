@@ -0,0 +1,47 @@
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from fastapi import Depends
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from configs.database import get_db
+from configs.Routing import REPLICA
+from repositories.Rollup import (
+    RollupKey,
+    delta_statements,
+    rebuild_statements,
+    summary_statement,
+)
+
+
+class DailyEventCountRepository:
+    """Daily event count rollups of the life events."""
+
+    db: Session
+
+    def __init__(
+        self, db: Session = Depends(get_db)
+    ) -> None:
+        self.db = db
+
+    def list(
+        self, interval: str, **kwargs: Any
+    ) -> List[Row]:
+        query = summary_statement(interval, **kwargs)
+        return self.db.execute(
+            query, bind_arguments=REPLICA
+        ).all()
+
+    def add(self, deltas: Dict[RollupKey, int]) -> None:
+        # Part of the caller's transaction; the caller commits
+        dialect_name = self.db.get_bind().dialect.name
+        for statement in delta_statements(
+            dialect_name, deltas
+        ):
+            self.db.execute(statement)
+
+    def rebuild(self, since: Optional[date] = None) -> None:
+        for statement in rebuild_statements(since):
+            self.db.execute(statement)
+        self.db.commit()
@@ -0,0 +1,332 @@
+"""Indexable expressions over fields of the life event payload.
+
+Every top-level number or string field an event schema declares can
+be filtered. Indexes are opt-in: the schema lists the fields worth
+one under INDEXED_KEYWORD, and each gets an index of its own event
+type, partial on PostgreSQL and SQLite. MySQL has no partial
+indexes, so its expressions are NULL for other types' rows; either
+way a field name reused with another type by another event type
+never reaches the index.
+"""
+
+import operator
+import re
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+from sqlalchemy import (
+    Float,
+    Index,
+    String,
+    literal,
+    literal_column,
+)
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import ColumnElement, and_
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.sql.visitors import InternalTraversal
+
+from models.LifeEventModel import LifeEvent
+
+# JSON schema types of the top-level fields that can be filtered
+FIELD_KINDS = {
+    "integer": "number",
+    "number": "number",
+    "string": "string",
+}
+
+# Event schema keyword listing the fields to index
+INDEXED_KEYWORD = "x-indexed"
+
+# Longest indexed string: MySQL casts keys to a sized CHAR, and
+# PostgreSQL B-tree rows are limited to a few kilobytes
+MAX_INDEXED_LENGTH = 255
+
+# Names of payload field indexes, current and former
+INDEX_PREFIXES = ("ix_event_data_", "ix_life_events_data_")
+
+OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+
+# Field names are inlined into SQL and index names
+_FIELD_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,31}$")
+
+
+class DataField(NamedTuple):
+    """A top-level payload field an event type declares."""
+
+    event_type_id: int
+    name: str
+    kind: str
+    # Longest value of an indexed string field, None otherwise
+    length: Optional[int] = None
+
+
+class json_field(FunctionElement):
+    """A payload field of one event type as a number or string.
+
+    Queries render the same SQL as the expression indexes, so the
+    indexes match them.
+    """
+
+    name = "json_field"
+    inherit_cache = True
+    # The field changes the SQL, so it keys the cache
+    _traverse_internals = (
+        FunctionElement._traverse_internals
+        + [
+            ("field", InternalTraversal.dp_plain_obj),
+        ]
+    )
+
+    def __init__(
+        self,
+        field: DataField,
+        column: Any,
+        event_type_column: Any,
+    ) -> None:
+        if field.kind not in FIELD_KINDS.values():
+            raise ValueError(
+                f"Unsupported kind: {field.kind}"
+            )
+        if not _FIELD_NAME.match(field.name):
+            raise ValueError(
+                f"Unsupported field: {field.name}"
+            )
+        self.field = DataField(
+            int(field.event_type_id),
+            field.name,
+            field.kind,
+            (
+                None
+                if field.length is None
+                else int(field.length)
+            ),
+        )
+        self.type = (
+            Float() if field.kind == "number" else String()
+        )
+        super().__init__(column, event_type_column)
+
+
+def _path(path: str, compiler: Any, **kw: Any) -> str:
+    # Inlined rather than bound, so queries match the index
+    return compiler.process(
+        literal(path), **{**kw, "literal_binds": True}
+    )
+
+
+@compiles(json_field)
+def _compile_default(
+    element: json_field, compiler: Any, **kw: Any
+) -> str:
+    # PostgreSQL; indexes are partial on the event type
+    column = compiler.process(
+        element.clauses.clauses[0], **kw
+    )
+    path = _path(element.field.name, compiler, **kw)
+    value = f"({column} ->> {path})"
+    if element.field.kind == "number":
+        return f"CAST({value} AS DOUBLE PRECISION)"
+    return value
+
+
+@compiles(json_field, "sqlite")
+def _compile_sqlite(
+    element: json_field, compiler: Any, **kw: Any
+) -> str:
+    # json_extract already returns numbers and strings unquoted
+    column = compiler.process(
+        element.clauses.clauses[0], **kw
+    )
+    path = _path(f"$.{element.field.name}", compiler, **kw)
+    return f"json_extract({column}, {path})"
+
+
+@compiles(json_field, "mysql")
+def _compile_mysql(
+    element: json_field, compiler: Any, **kw: Any
+) -> str:
+    column, event_type_column = (
+        compiler.process(clause, **kw)
+        for clause in element.clauses.clauses
+    )
+    field = element.field
+    path = _path(f"$.{field.name}", compiler, **kw)
+    if field.kind == "number":
+        value = f"CAST(JSON_EXTRACT({column}, {path}) AS DOUBLE)"
+    elif field.length is not None:
+        # Functional index key parts need a sized, collated
+        # string; schemas bound indexed strings to the size
+        value = (
+            f"CAST(JSON_UNQUOTE(JSON_EXTRACT({column}, {path})) "
+            f"AS CHAR({field.length})) COLLATE utf8mb4_bin"
+        )
+    else:
+        value = (
+            f"JSON_UNQUOTE(JSON_EXTRACT({column}, {path}))"
+        )
+    # Other types' rows are never cast, so their values cannot
+    # fail the index
+    return (
+        f"(CASE WHEN {event_type_column} = "
+        f"{field.event_type_id} THEN {value} END)"
+    )
+
+
+def _string_length(
+    definition: Dict[str, Any],
+) -> Optional[int]:
+    # The longest value a string field's schema allows
+    if isinstance(definition.get("maxLength"), int):
+        return definition["maxLength"]
+    enum = definition.get("enum")
+    if isinstance(enum, list) and enum:
+        if all(isinstance(value, str) for value in enum):
+            return max(len(value) for value in enum)
+    return None
+
+
+def _properties(
+    event_schema: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    return (event_schema or {}).get("properties") or {}
+
+
+def indexed_fields_error(
+    event_schema: Optional[Dict[str, Any]],
+) -> Optional[str]:
+    """Why a schema's indexed fields cannot be indexed, if so."""
+    indexed = (event_schema or {}).get(INDEXED_KEYWORD, [])
+    if not isinstance(indexed, list) or not all(
+        isinstance(name, str) for name in indexed
+    ):
+        return f"{INDEXED_KEYWORD} must list field names"
+    properties = _properties(event_schema)
+    for name in indexed:
+        definition = properties.get(name)
+        kind = FIELD_KINDS.get(
+            (definition or {}).get("type")
+        )
+        if kind is None or not _FIELD_NAME.match(name):
+            return (
+                f"Indexed field {name} must be a declared "
+                "number or string"
+            )
+        if kind == "string":
+            length = _string_length(definition)
+            if length is None or not (
+                0 < length <= MAX_INDEXED_LENGTH
+            ):
+                return (
+                    f"Indexed string field {name} needs a "
+                    f"maxLength or enum of at most "
+                    f"{MAX_INDEXED_LENGTH} characters"
+                )
+    return None
+
+
+def declared_fields(
+    event_type_id: int,
+    event_schema: Optional[Dict[str, Any]],
+) -> Dict[str, DataField]:
+    """The filterable fields an event type's schema declares."""
+    indexed = (event_schema or {}).get(INDEXED_KEYWORD)
+    if indexed_fields_error(event_schema):
+        indexed = []
+    fields = {}
+    for name, definition in _properties(
+        event_schema
+    ).items():
+        kind = FIELD_KINDS.get(
+            (definition or {}).get("type")
+        )
+        if kind and _FIELD_NAME.match(name):
+            fields[name] = DataField(
+                event_type_id,
+                name,
+                kind,
+                (
+                    _string_length(definition)
+                    if kind == "string"
+                    and name in (indexed or [])
+                    else None
+                ),
+            )
+    return fields
+
+
+def data_field_condition(
+    field: DataField, op: str, value: Any
+) -> ColumnElement:
+    """Compare a payload field of life events with a value."""
+    return and_(
+        # Inlined, so planners can match partial indexes
+        LifeEvent.event_type_id
+        == literal_column(str(int(field.event_type_id))),
+        OPERATORS[op](
+            json_field(
+                field,
+                LifeEvent.data,
+                LifeEvent.event_type_id,
+            ),
+            value,
+        ),
+    )
+
+
+def data_field_index(field: DataField) -> Index:
+    """The expression index serving filters on a payload field.
+
+    Not part of the table metadata, since the fields come from
+    event types rather than the model.
+    """
+    table = LifeEvent.__table__
+    where = table.c.event_type_id == literal_column(
+        str(int(field.event_type_id))
+    )
+    suffix = (
+        "n"
+        if field.kind == "number"
+        else f"s{field.length}"
+    )
+    index = Index(
+        f"{INDEX_PREFIXES[0]}{int(field.event_type_id)}_"
+        f"{field.name}_{suffix}",
+        table.c.event_type_id,
+        json_field(
+            field, table.c.data, table.c.event_type_id
+        ),
+        postgresql_where=where,
+        sqlite_where=where,
+    )
+    table.indexes.discard(index)
+    return index
+
+
+def data_field_indexes(
+    event_type_id: int,
+    event_schema: Optional[Dict[str, Any]],
+) -> List[Index]:
+    """Expression indexes for the fields a schema indexes."""
+    indexed = (event_schema or {}).get(
+        INDEXED_KEYWORD
+    ) or []
+    if indexed_fields_error(event_schema):
+        return []
+    fields = declared_fields(event_type_id, event_schema)
+    return [
+        data_field_index(fields[name]) for name in indexed
+    ]
@@ -1,20 +1,71 @@
 from typing import List, Optional, Dict, Any
 
 from fastapi import Depends
+from sqlalchemy import delete, select, update
 from sqlalchemy.orm import Session, lazyload
+from sqlalchemy.sql import Select
 
-from configs.database import get_db
+from configs.database import PARTITIONED_EVENTS, get_db
+from configs.Routing import REPLICA
 from models.EventTypeModel import EventType
+from models.LifeEventModel import LifeEvent
 from repositories.RepositoryMeta import RepositoryMeta
+from repositories.TableVersionRepository import (
+    TableVersionRepository,
+)
+from repositories.Returning import (
+    detached_from_row,
+    supports_returning,
+)
+
+
+def list_statement(
+    limit: Optional[int] = None,
+    start: Optional[int] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    **kwargs: Any,
+) -> Select:
+    """Build the event type listing query.
+
+    Shared by the sync and async repositories so both apply the
+    same filters and pagination.
+    """
+    query = select(EventType)
+
+    ids = kwargs.get("ids")
+    if ids is not None:
+        query = query.where(EventType.id.in_(ids))
+
+    name = kwargs.get("name")
+    if name:
+        query = query.where(EventType.name == name)
+    elif filters and "name" in filters:
+        query = query.where(
+            EventType.name == filters["name"]
+        )
+
+    if start is not None:
+        query = query.offset(start)
+    if limit is not None:
+        query = query.limit(limit)
+
+    return query
 
 
 class EventTypeRepository(RepositoryMeta[EventType, int]):
     db: Session
+    versions: TableVersionRepository
 
     def __init__(
         self, db: Session = Depends(get_db)
     ) -> None:
         self.db = db
+        self.versions = TableVersionRepository(db)
+
+    def _commit(self, *tables: str) -> None:
+        self.versions.bump(*tables)
+        self.db.commit()
+        self.versions.publish(*tables)
 
     def list(
         self,
@@ -23,48 +74,75 @@ class EventTypeRepository(RepositoryMeta[EventType, int]):
         filters: Optional[Dict[str, Any]] = None,
         **kwargs: Any,
     ) -> List[EventType]:
-        query = self.db.query(EventType)
-
-        name = kwargs.get("name")
-        if name:
-            query = query.filter(EventType.name == name)
-        elif filters and "name" in filters:
-            query = query.filter(
-                EventType.name == filters["name"]
-            )
-
-        if start is not None:
-            query = query.offset(start)
-        if limit is not None:
-            query = query.limit(limit)
-
-        return query.all()
+        query = list_statement(
+            limit, start, filters, **kwargs
+        )
+        return (
+            self.db.execute(query, bind_arguments=REPLICA)
+            .scalars()
+            .all()
+        )
 
     def get(self, id: int) -> Optional[EventType]:
-        return self.db.get(
-            EventType,
-            id,
-            options=[lazyload(EventType.events)],
+        query = (
+            select(EventType)
+            .where(EventType.id == id)
+            .options(lazyload(EventType.events))
         )
+        return self.db.execute(
+            query, bind_arguments=REPLICA
+        ).scalar_one_or_none()
 
     def create(self, event_type: EventType) -> EventType:
         self.db.add(event_type)
-        self.db.commit()
-        self.db.refresh(event_type)
+        self._commit(EventType.__tablename__)
         return event_type
 
     def update(
-        self, id: int, event_type: EventType
-    ) -> EventType:
-        # Handle the id assignment without type issues
-        setattr(event_type, "id", id)
-        self.db.merge(event_type)
-        self.db.commit()
-        return event_type
+        self, id: int, values: Dict[str, Any]
+    ) -> Optional[EventType]:
+        if not values:
+            return self.db.get(EventType, id)
+
+        statement = (
+            update(EventType)
+            .where(EventType.id == id)
+            .values(**values)
+        )
+        if supports_returning(self.db):
+            row = self.db.execute(
+                statement.returning(
+                    *EventType.__table__.columns
+                )
+            ).first()
+            self._commit(EventType.__tablename__)
+            if row is None:
+                return None
+            return self.db.merge(
+                detached_from_row(EventType, row),
+                load=False,
+            )
+
+        result = self.db.execute(statement)
+        self._commit(EventType.__tablename__)
+        if result.rowcount == 0:
+            return None
+        return self.db.get(
+            EventType, id, populate_existing=True
+        )
 
     def delete(self, id: int) -> None:
-        event_type = self.get(id)
-        if event_type:
-            self.db.delete(event_type)
-            self.db.commit()
-            self.db.flush()
+        # Related life events go with the ON DELETE CASCADE key,
+        # which partitioned tables cannot have
+        if PARTITIONED_EVENTS:
+            self.db.execute(
+                delete(LifeEvent).where(
+                    LifeEvent.event_type_id == id
+                )
+            )
+        self.db.execute(
+            delete(EventType).where(EventType.id == id)
+        )
+        self._commit(
+            EventType.__tablename__, LifeEvent.__tablename__
+        )
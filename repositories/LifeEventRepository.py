@@ -1,22 +1,297 @@
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from collections import Counter
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from datetime import date, datetime, time
 
 from fastapi import Depends
-from sqlalchemy.orm import Session, lazyload
-from sqlalchemy import and_
+from sqlalchemy.orm import Session, lazyload, load_only
+from sqlalchemy import (
+    and_,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import Select
 
-from configs.database import get_db
+from configs.database import (
+    ARCHIVE_DIRECTORY,
+    PARTITIONED_EVENTS,
+    get_db,
+)
+from configs.Routing import REPLICA
+from models.EventTypeModel import EventType
+from models.ImportProgressModel import ImportProgress
 from models.LifeEventModel import LifeEvent
+from repositories.Archive import (
+    Conditions,
+    SegmentArchive,
+    get_archive,
+    merge_events,
+    window,
+)
+from repositories.DailyEventCountRepository import (
+    DailyEventCountRepository,
+)
 from repositories.RepositoryMeta import RepositoryMeta
+from repositories.Returning import (
+    detached_from_row,
+    supports_returning,
+)
+from repositories.DataField import data_field_condition
+from repositories.Partition import add_months, month_range
+from repositories.Rollup import move_deltas, rollup_key
+from repositories.Search import (
+    SearchUnavailable,
+    search_statement,
+)
+from repositories.TableVersionRepository import (
+    TableVersionRepository,
+)
+from repositories.TimeBucket import time_bucket
+
+# Rows fetched per round trip when streaming results
+STREAM_BATCH_SIZE = 1000
+
+
+def load_columns(
+    columns: Optional[Sequence[str]],
+) -> List[Any]:
+    """Loader options reading only some life event columns.
+
+    The (timestamp, id) position orders, pages and merges
+    listings, so it is always loaded.
+    """
+    if not columns:
+        return []
+    return [
+        load_only(
+            LifeEvent.id,
+            LifeEvent.timestamp,
+            *(
+                getattr(LifeEvent, column)
+                for column in columns
+            ),
+        )
+    ]
+
+
+def list_statement(
+    limit: Optional[int] = None,
+    start: Optional[int] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    **kwargs: Any,
+) -> Select:
+    """Build the life event listing query.
+
+    Shared by the sync and async repositories so both apply the
+    same filters, ordering and pagination.
+    """
+    query = select(LifeEvent)
+
+    filter_conditions = []
+
+    # Handle direct kwargs
+    event_type_id = kwargs.get("event_type_id")
+    start_date = kwargs.get("start_date")
+    end_date = kwargs.get("end_date")
+    after = kwargs.get("after")
+    data_filters = kwargs.get("data_filters") or []
+    # Sparse fieldsets skip reading the other columns
+    query = query.options(
+        *load_columns(kwargs.get("columns"))
+    )
+
+    if event_type_id:
+        filter_conditions.append(
+            LifeEvent.event_type_id == event_type_id
+        )
+    # Plain range predicates on the timestamp, so partitioned
+    # tables only read the months in range
+    if start_date:
+        filter_conditions.append(
+            LifeEvent.timestamp >= start_date
+        )
+    if end_date:
+        filter_conditions.append(
+            LifeEvent.timestamp <= end_date
+        )
+
+    # (field, op, value) comparisons on declared payload fields,
+    # matching their expression indexes
+    for field, op, value in data_filters:
+        filter_conditions.append(
+            data_field_condition(field, op, value)
+        )
+
+    # Apply additional filters from the filters dict
+    if filters:
+        if "event_type_id" in filters:
+            filter_conditions.append(
+                LifeEvent.event_type_id
+                == filters["event_type_id"]
+            )
+        if "start_date" in filters:
+            filter_conditions.append(
+                LifeEvent.timestamp >= filters["start_date"]
+            )
+        if "end_date" in filters:
+            filter_conditions.append(
+                LifeEvent.timestamp <= filters["end_date"]
+            )
+
+    # Keyset pagination: resume after a (timestamp, id) position.
+    # The leading `timestamp >=` bound keeps the predicate a
+    # plain range over the timestamp indexes on every dialect.
+    if after:
+        after_timestamp, after_id = after
+        filter_conditions.append(
+            LifeEvent.timestamp >= after_timestamp
+        )
+        filter_conditions.append(
+            or_(
+                LifeEvent.timestamp > after_timestamp,
+                LifeEvent.id > after_id,
+            )
+        )
+
+    if filter_conditions:
+        query = query.where(and_(*filter_conditions))
+
+    # Matches the (event_type_id, timestamp) and (timestamp)
+    # indexes, so ranges are read in index order without a sort
+    query = query.order_by(
+        LifeEvent.timestamp, LifeEvent.id
+    )
+
+    if start is not None and not after:
+        query = query.offset(start)
+    if limit is not None:
+        query = query.limit(limit)
+
+    return query
+
+
+def stats_statement(
+    interval: str,
+    event_type_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Select:
+    """Build the event count query per time bucket and event type."""
+    bucket = time_bucket(interval, LifeEvent.timestamp)
+    query = select(
+        bucket.label("bucket"),
+        LifeEvent.event_type_id,
+        func.count().label("count"),
+    )
+
+    filter_conditions = []
+    if event_type_id:
+        filter_conditions.append(
+            LifeEvent.event_type_id == event_type_id
+        )
+    if start_date:
+        filter_conditions.append(
+            LifeEvent.timestamp >= start_date
+        )
+    if end_date:
+        filter_conditions.append(
+            LifeEvent.timestamp <= end_date
+        )
+    if filter_conditions:
+        query = query.where(and_(*filter_conditions))
+
+    return query.group_by(
+        bucket, LifeEvent.event_type_id
+    ).order_by(bucket, LifeEvent.event_type_id)
+
+
+def merge_counts(
+    rows: Iterable[Tuple[datetime, int, int]],
+    archived: Counter,
+) -> List[Tuple[datetime, int, int]]:
+    """Add archived counts to (bucket, event_type_id, count) rows."""
+    counts = Counter(
+        {
+            (bucket, type_id): count
+            for bucket, type_id, count in rows
+        }
+    )
+    counts.update(archived)
+    return [
+        (bucket, type_id, count)
+        for (bucket, type_id), count in sorted(
+            counts.items()
+        )
+    ]
 
 
 class LifeEventRepository(RepositoryMeta[LifeEvent, int]):
     db: Session
+    daily_event_counts: DailyEventCountRepository
+    versions: TableVersionRepository
+    archive: Optional[SegmentArchive]
 
     def __init__(
         self, db: Session = Depends(get_db)
     ) -> None:
         self.db = db
+        # Shares the session, so counts commit with the events
+        self.daily_event_counts = DailyEventCountRepository(
+            db
+        )
+        self.versions = TableVersionRepository(db)
+        self.archive = get_archive(ARCHIVE_DIRECTORY)
+
+    def _commit(self) -> None:
+        self.versions.bump(LifeEvent.__tablename__)
+        self.db.commit()
+        self.versions.publish(LifeEvent.__tablename__)
+
+    def _reaches_archive(
+        self, conditions: Conditions
+    ) -> bool:
+        # Archived events of deleted event types are skipped
+        if not (
+            self.archive
+            and self.archive.reaches(conditions)
+        ):
+            return False
+        conditions.live_event_type_ids = set(
+            self.db.execute(
+                select(EventType.id), bind_arguments=REPLICA
+            ).scalars()
+        )
+        return True
+
+    def _locked_rollup_row(
+        self, id: int, *columns: Any
+    ) -> Optional[Row]:
+        # Locked, so concurrent writes cannot move the event
+        # between reading its rollup row and counting it there
+        return self.db.execute(
+            select(
+                LifeEvent.timestamp,
+                LifeEvent.event_type_id,
+                *columns,
+            )
+            .where(LifeEvent.id == id)
+            .with_for_update()
+        ).first()
 
     def list(
         self,
@@ -25,81 +300,334 @@ class LifeEventRepository(RepositoryMeta[LifeEvent, int]):
         filters: Optional[Dict[str, Any]] = None,
         **kwargs: Any,
     ) -> List[LifeEvent]:
-        query = self.db.query(LifeEvent)
-
-        filter_conditions = []
+        conditions = Conditions(filters, **kwargs)
+        if self._reaches_archive(conditions):
+            offset, stop = window(
+                limit, start, kwargs.get("after")
+            )
+            query = list_statement(
+                stop, None, filters, **kwargs
+            )
+            events = self.db.execute(
+                query, bind_arguments=REPLICA
+            ).scalars()
+            return list(
+                islice(
+                    merge_events(
+                        self.archive.events(conditions),
+                        events,
+                    ),
+                    offset,
+                    stop,
+                )
+            )
 
-        # Handle direct kwargs
-        event_type_id = kwargs.get("event_type_id")
-        start_date = kwargs.get("start_date")
-        end_date = kwargs.get("end_date")
+        query = list_statement(
+            limit, start, filters, **kwargs
+        )
+        return (
+            self.db.execute(query, bind_arguments=REPLICA)
+            .scalars()
+            .all()
+        )
 
-        if event_type_id:
-            filter_conditions.append(
-                LifeEvent.event_type_id == event_type_id
+    def stream(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Iterator[LifeEvent]:
+        # Server-side cursor, so memory stays flat for any result
+        query = list_statement(
+            filters=filters, **kwargs
+        ).execution_options(
+            stream_results=True, yield_per=STREAM_BATCH_SIZE
+        )
+        events = self.db.execute(
+            query, bind_arguments=REPLICA
+        ).scalars()
+        conditions = Conditions(filters, **kwargs)
+        if self._reaches_archive(conditions):
+            events = merge_events(
+                self.archive.events(conditions), events
             )
-        if start_date:
-            filter_conditions.append(
-                LifeEvent.timestamp >= start_date
+        yield from events
+
+    def count_by_bucket(
+        self, interval: str, **kwargs: Any
+    ) -> List[Tuple[datetime, int, int]]:
+        query = stats_statement(interval, **kwargs)
+        rows = self.db.execute(
+            query, bind_arguments=REPLICA
+        ).all()
+        # Archived months count as they do in the rollups
+        conditions = Conditions(**kwargs)
+        if self._reaches_archive(conditions):
+            return merge_counts(
+                rows,
+                self.archive.count_by_bucket(
+                    interval, conditions
+                ),
             )
-        if end_date:
-            filter_conditions.append(
-                LifeEvent.timestamp <= end_date
+        return rows
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        start: Optional[int] = None,
+        event_type_id: Optional[int] = None,
+    ) -> List[Row]:
+        if PARTITIONED_EVENTS:
+            raise SearchUnavailable(
+                "Full-text search is unavailable on "
+                "partitioned life events"
             )
+        statement = search_statement(
+            self.db.get_bind().dialect.name,
+            query,
+            limit,
+            start,
+            event_type_id,
+        )
+        return self.db.execute(
+            statement, bind_arguments=REPLICA
+        ).all()
 
-        # Apply additional filters from the filters dict
-        if filters:
-            if "event_type_id" in filters:
-                filter_conditions.append(
-                    LifeEvent.event_type_id
-                    == filters["event_type_id"]
-                )
-            if "start_date" in filters:
-                filter_conditions.append(
-                    LifeEvent.timestamp
-                    >= filters["start_date"]
+    def get(
+        self,
+        id: int,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Optional[LifeEvent]:
+        query = (
+            select(LifeEvent)
+            .where(LifeEvent.id == id)
+            .options(
+                lazyload(LifeEvent.event_type),
+                *load_columns(columns),
+            )
+        )
+        event = self.db.execute(
+            query, bind_arguments=REPLICA
+        ).scalar_one_or_none()
+        if event is None and self.archive:
+            event = self.archive.get(id)
+            if (
+                event is not None
+                and not self._event_type_exists(
+                    event.event_type_id
                 )
-            if "end_date" in filters:
-                filter_conditions.append(
-                    LifeEvent.timestamp
-                    <= filters["end_date"]
+            ):
+                return None
+        return event
+
+    def _event_type_exists(self, id: int) -> bool:
+        return (
+            self.db.execute(
+                select(EventType.id).where(
+                    EventType.id == id
+                ),
+                bind_arguments=REPLICA,
+            ).first()
+            is not None
+        )
+
+    def create(self, life_event: LifeEvent) -> LifeEvent:
+        self.db.add(life_event)
+        # Applies the column defaults before counting the event
+        self.db.flush()
+        self.daily_event_counts.add(
+            {
+                rollup_key(
+                    life_event.timestamp,
+                    life_event.event_type_id,
+                ): 1
+            }
+        )
+        self._commit()
+        return life_event
+
+    def create_many(
+        self,
+        rows: List[Dict[str, Any]],
+        progress: Optional[ImportProgress] = None,
+    ) -> int:
+        # One executemany INSERT in a single transaction, with
+        # the import progress, so it never runs ahead of the rows
+        if progress is not None:
+            self.db.merge(progress)
+        if rows:
+            self.db.execute(insert(LifeEvent), rows)
+            self.daily_event_counts.add(
+                Counter(
+                    rollup_key(
+                        row["timestamp"],
+                        row["event_type_id"],
+                    )
+                    for row in rows
                 )
+            )
+            self._commit()
+        elif progress is not None:
+            self.db.commit()
+        return len(rows)
 
-        if filter_conditions:
-            query = query.filter(and_(*filter_conditions))
+    def get_import_progress(
+        self, name: str
+    ) -> Optional[ImportProgress]:
+        # From the primary, as a resume must not repeat rows a
+        # replica has yet to see
+        return self.db.get(ImportProgress, name)
 
-        if start is not None:
-            query = query.offset(start)
-        if limit is not None:
-            query = query.limit(limit)
+    def update(
+        self,
+        id: int,
+        values: Dict[str, Any],
+        check: Optional[Callable[[Row], None]] = None,
+    ) -> Optional[LifeEvent]:
+        """Update an event, None if there is none.
 
-        return query.all()
+        `check` is called with the event's timestamp, event type
+        and data, read on the primary and locked until the
+        update commits, and raises to cancel it.
+        """
+        if not values:
+            return self.db.get(LifeEvent, id)
 
-    def get(self, id: int) -> Optional[LifeEvent]:
+        # Only a new day or event type moves the event's count
+        rollup_row = None
+        if check is not None:
+            rollup_row = self._locked_rollup_row(
+                id, LifeEvent.data
+            )
+            if rollup_row is None:
+                return None
+            check(rollup_row)
+        elif (
+            "timestamp" in values
+            or "event_type_id" in values
+        ):
+            rollup_row = self._locked_rollup_row(id)
+            if rollup_row is None:
+                return None
+
+        statement = (
+            update(LifeEvent)
+            .where(LifeEvent.id == id)
+            .values(**values)
+        )
+        if supports_returning(self.db):
+            row = self.db.execute(
+                statement.returning(
+                    *LifeEvent.__table__.columns
+                )
+            ).first()
+            if rollup_row is not None:
+                self.daily_event_counts.add(
+                    move_deltas(rollup_row, values)
+                )
+            self._commit()
+            if row is None:
+                return None
+            return self.db.merge(
+                detached_from_row(LifeEvent, row),
+                load=False,
+            )
+
+        result = self.db.execute(statement)
+        if rollup_row is not None:
+            self.daily_event_counts.add(
+                move_deltas(rollup_row, values)
+            )
+        self._commit()
+        if result.rowcount == 0:
+            return None
         return self.db.get(
-            LifeEvent,
-            id,
-            options=[lazyload(LifeEvent.event_type)],
+            LifeEvent, id, populate_existing=True
         )
 
-    def create(self, life_event: LifeEvent) -> LifeEvent:
-        self.db.add(life_event)
-        self.db.commit()
-        self.db.refresh(life_event)
-        return life_event
+    def archive_before(self, cutoff: date) -> int:
+        """Move the events before a month to the archive.
 
-    def update(
-        self, id: int, life_event: LifeEvent
-    ) -> LifeEvent:
-        # Handle the id assignment without type issues
-        setattr(life_event, "id", id)
-        self.db.merge(life_event)
-        self.db.commit()
-        return life_event
+        Each month is streamed into a segment before its rows are
+        deleted. Archived events keep their daily counts.
+        """
+        if self.archive is None:
+            raise RuntimeError("No archive is configured")
+        end = datetime.combine(cutoff, time())
+        first = self.db.execute(
+            select(func.min(LifeEvent.timestamp)).where(
+                LifeEvent.timestamp < end
+            )
+        ).scalar()
+        if first is None:
+            return 0
+
+        archived = 0
+        for month in month_range(
+            first, add_months(cutoff, -1)
+        ):
+            query = (
+                select(LifeEvent)
+                .where(
+                    LifeEvent.timestamp
+                    >= datetime.combine(month, time()),
+                    LifeEvent.timestamp
+                    < datetime.combine(
+                        add_months(month, 1), time()
+                    ),
+                )
+                .order_by(LifeEvent.timestamp, LifeEvent.id)
+                .execution_options(
+                    stream_results=True,
+                    yield_per=STREAM_BATCH_SIZE,
+                )
+            )
+            ids: List[int] = []
+
+            def collect_ids(
+                events: Iterable[LifeEvent],
+            ) -> Iterator[LifeEvent]:
+                for event in events:
+                    ids.append(event.id)
+                    yield event
+
+            if not self.archive.write(
+                month,
+                collect_ids(
+                    self.db.execute(query).scalars()
+                ),
+            ):
+                continue
+            for offset in range(
+                0, len(ids), STREAM_BATCH_SIZE
+            ):
+                self.db.execute(
+                    delete(LifeEvent).where(
+                        LifeEvent.id.in_(
+                            ids[
+                                offset : offset
+                                + STREAM_BATCH_SIZE
+                            ]
+                        )
+                    )
+                )
+            self._commit()
+            self.db.expunge_all()
+            archived += len(ids)
+        return archived
 
     def delete(self, id: int) -> None:
-        life_event = self.get(id)
-        if life_event:
-            self.db.delete(life_event)
-            self.db.commit()
-            self.db.flush()
+        rollup_row = self._locked_rollup_row(id)
+        self.db.execute(
+            delete(LifeEvent).where(LifeEvent.id == id)
+        )
+        if rollup_row is not None:
+            self.daily_event_counts.add(
+                {
+                    rollup_key(
+                        rollup_row.timestamp,
+                        rollup_row.event_type_id,
+                    ): -1
+                }
+            )
+        self._commit()
@@ -0,0 +1,297 @@
+"""Monthly partitions of the life events table.
+
+MySQL partitions `life_events` natively by RANGE COLUMNS on the
+timestamp, one partition per month plus a catch-all for the
+future. Range predicates on the timestamp prune partitions, so
+the listing, stats and keyset queries only read the months they
+cover, and dropping old months is a metadata operation.
+
+Partitioned InnoDB tables support neither foreign keys nor
+FULLTEXT indexes: event types delete their events explicitly and
+full-text search is unavailable on partitioned storage.
+
+Other dialects keep one table, and retention falls back to
+deleting rows.
+"""
+
+from contextlib import contextmanager
+from datetime import date, datetime, time
+from typing import Iterator, List, Optional, Union
+
+from sqlalchemy import delete, text
+from sqlalchemy.engine import Connection
+
+from models.DailyEventCountModel import DailyEventCount
+from models.LifeEventModel import LifeEvent
+from repositories.Search import (
+    SEARCH_INDEX,
+    search_index_exists,
+)
+
+FUTURE_PARTITION = "p_future"
+
+# Named lock serializing partition changes between processes
+PARTITION_LOCK = "friday.life_events.partitions"
+
+
+def month_start(value: Union[date, datetime]) -> date:
+    """The first day of the month of a date."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """The first day of the month `months` after `month`."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_range(first: date, last: date) -> List[date]:
+    """Every month from `first` to `last`, both included."""
+    months = []
+    month = month_start(first)
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def partition_name(month: date) -> str:
+    """The name of the partition holding a month."""
+    return f"p{month:%Y%m}"
+
+
+def _definitions(months: List[date]) -> str:
+    # The first partition also holds anything older
+    partitions = [
+        f"PARTITION {partition_name(month)} VALUES LESS THAN "
+        f"('{add_months(month, 1):%Y-%m-%d}')"
+        for month in months
+    ]
+    partitions.append(
+        f"PARTITION {FUTURE_PARTITION} "
+        "VALUES LESS THAN (MAXVALUE)"
+    )
+    return ", ".join(partitions)
+
+
+def partition_statement(months: List[date]) -> str:
+    """Repartition `life_events` by month on MySQL.
+
+    Every unique key of a partitioned table must include the
+    partitioning column, so the timestamp joins the primary key.
+    """
+    return (
+        "ALTER TABLE life_events "
+        "DROP PRIMARY KEY, ADD PRIMARY KEY (id, timestamp) "
+        "PARTITION BY RANGE COLUMNS(timestamp) "
+        f"({_definitions(months)})"
+    )
+
+
+def add_partitions_statement(months: List[date]) -> str:
+    """Split new months off the future partition."""
+    return (
+        "ALTER TABLE life_events "
+        f"REORGANIZE PARTITION {FUTURE_PARTITION} "
+        f"INTO ({_definitions(months)})"
+    )
+
+
+def drop_partitions_statement(months: List[date]) -> str:
+    """Drop the partitions of whole months."""
+    names = ", ".join(
+        partition_name(month) for month in months
+    )
+    return f"ALTER TABLE life_events DROP PARTITION {names}"
+
+
+def partition_months(connection: Connection) -> List[date]:
+    """The months `life_events` is partitioned into, in order.
+
+    Empty when the table is not partitioned.
+    """
+    if connection.dialect.name != "mysql":
+        return []
+    names = connection.execute(
+        text(
+            "SELECT partition_name "
+            "FROM information_schema.partitions "
+            "WHERE table_schema = DATABASE() "
+            "AND table_name = 'life_events' "
+            "AND partition_name IS NOT NULL "
+            "ORDER BY partition_ordinal_position"
+        )
+    ).scalars()
+    return [
+        datetime.strptime(name, "p%Y%m").date()
+        for name in names
+        if name != FUTURE_PARTITION
+    ]
+
+
+def is_partitioned(connection: Connection) -> bool:
+    """Whether `life_events` is partitioned by month."""
+    if connection.dialect.name != "mysql":
+        return False
+    return (
+        connection.execute(
+            text(
+                "SELECT partition_name "
+                "FROM information_schema.partitions "
+                "WHERE table_schema = DATABASE() "
+                "AND table_name = 'life_events' "
+                "AND partition_name = :name"
+            ),
+            {"name": FUTURE_PARTITION},
+        ).first()
+        is not None
+    )
+
+
+@contextmanager
+def partition_lock(
+    connection: Connection,
+) -> Iterator[None]:
+    """Hold the lock on partition changes, or fail at once."""
+    acquired = connection.execute(
+        text("SELECT GET_LOCK(:name, 0)"),
+        {"name": PARTITION_LOCK},
+    ).scalar()
+    if acquired != 1:
+        raise RuntimeError(
+            "Life events are being partitioned by another "
+            "process"
+        )
+    try:
+        yield
+    finally:
+        connection.execute(
+            text("SELECT RELEASE_LOCK(:name)"),
+            {"name": PARTITION_LOCK},
+        )
+
+
+def add_partitions(
+    connection: Connection,
+    months_ahead: int,
+    today: Optional[date] = None,
+) -> None:
+    """Partition up to `months_ahead` months past this one.
+
+    Splitting the future partition is cheap while it is empty,
+    which holds as long as this runs before the months ahead run
+    out; any rows it holds by then are copied.
+    """
+    existing = partition_months(connection)
+    if not existing:
+        return
+    last = add_months(
+        month_start(today or date.today()), months_ahead
+    )
+    months = month_range(add_months(existing[-1], 1), last)
+    if months:
+        connection.execute(
+            text(add_partitions_statement(months))
+        )
+
+
+def partition_life_events(
+    connection: Connection,
+    months_ahead: int,
+    today: Optional[date] = None,
+) -> None:
+    """Convert `life_events` to monthly partitions on MySQL.
+
+    Rebuilds the table once; partitions for months already
+    covered are only topped up.
+    """
+    if connection.dialect.name != "mysql":
+        raise NotImplementedError(
+            "Native partitioning is only supported on MySQL"
+        )
+    with partition_lock(connection):
+        if is_partitioned(connection):
+            add_partitions(connection, months_ahead, today)
+        else:
+            _partition_table(
+                connection, months_ahead, today
+            )
+
+
+def _partition_table(
+    connection: Connection,
+    months_ahead: int,
+    today: Optional[date],
+) -> None:
+    foreign_keys = connection.execute(
+        text(
+            "SELECT constraint_name "
+            "FROM information_schema.referential_constraints "
+            "WHERE constraint_schema = DATABASE() "
+            "AND table_name = 'life_events'"
+        )
+    ).scalars()
+    for name in list(foreign_keys):
+        connection.execute(
+            text(
+                "ALTER TABLE life_events "
+                f"DROP FOREIGN KEY {name}"
+            )
+        )
+
+    if search_index_exists(connection):
+        connection.execute(
+            text(
+                "ALTER TABLE life_events "
+                f"DROP INDEX {SEARCH_INDEX}, "
+                "DROP COLUMN search_text"
+            )
+        )
+
+    first = connection.execute(
+        text("SELECT MIN(timestamp) FROM life_events")
+    ).scalar()
+    current = month_start(today or date.today())
+    months = month_range(
+        month_start(first) if first else current,
+        add_months(current, months_ahead),
+    )
+    connection.execute(text(partition_statement(months)))
+
+
+def drop_before(
+    connection: Connection, cutoff: date
+) -> None:
+    """Remove life events and daily counts before a month.
+
+    Whole partitions are dropped where the table is partitioned;
+    elsewhere the rows are deleted.
+    """
+    if cutoff != month_start(cutoff):
+        raise ValueError(
+            f"Cutoff is not the start of a month: {cutoff}"
+        )
+
+    start = datetime.combine(cutoff, time())
+    expired = [
+        month
+        for month in partition_months(connection)
+        if month < cutoff
+    ]
+    if is_partitioned(connection):
+        if expired:
+            connection.execute(
+                text(drop_partitions_statement(expired))
+            )
+    else:
+        connection.execute(
+            delete(LifeEvent).where(
+                LifeEvent.timestamp < start
+            )
+        )
+    # Counts of dropped days would outlive their events
+    connection.execute(
+        delete(DailyEventCount).where(
+            DailyEventCount.day < cutoff
+        )
+    )
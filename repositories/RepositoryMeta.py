@@ -53,6 +53,8 @@ class RepositoryMeta(Generic[M, K]):
 
     # Updates an existing instance of the Model
     @abstractmethod
-    def update(self, id: K, instance: M) -> M:
-        """Update an existing instance of the Model."""
+    def update(
+        self, id: K, values: Dict[str, Any]
+    ) -> Optional[M]:
+        """Update the given columns of an existing instance."""
         pass
@@ -0,0 +1,27 @@
+"""Helpers for writes that read their result back in one trip."""
+
+from typing import Any, Type, TypeVar
+
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import (
+    Session,
+    make_transient_to_detached,
+)
+
+M = TypeVar("M")
+
+
+def supports_returning(db: Session) -> bool:
+    """Whether UPDATE ... RETURNING is available on the primary."""
+    return db.get_bind().dialect.full_returning
+
+
+def detached_from_row(model: Type[M], row: Row) -> M:
+    """Build a detached instance from a RETURNING row.
+
+    Merging it with `load=False` attaches it to a session without
+    a SELECT, so relationships can still lazy load afterwards.
+    """
+    instance = model(**row._mapping)
+    make_transient_to_detached(instance)
+    return instance
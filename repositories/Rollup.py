@@ -0,0 +1,188 @@
+"""Statements that maintain and read the daily event counts."""
+
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import (
+    and_,
+    delete,
+    func,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import Executable, Select
+
+from models.DailyEventCountModel import DailyEventCount
+from models.LifeEventModel import LifeEvent
+from repositories.TimeBucket import time_bucket
+
+RollupKey = Tuple[date, int]
+
+
+def rollup_key(
+    timestamp: datetime, event_type_id: int
+) -> RollupKey:
+    """The daily count row a life event is counted in."""
+    return timestamp.date(), event_type_id
+
+
+def move_deltas(
+    old: Row, values: Dict[str, Any]
+) -> "Counter[RollupKey]":
+    """Count changes for an event updated with `values`."""
+    deltas: "Counter[RollupKey]" = Counter()
+    deltas[
+        rollup_key(old.timestamp, old.event_type_id)
+    ] -= 1
+    deltas[
+        rollup_key(
+            values.get("timestamp", old.timestamp),
+            values.get("event_type_id", old.event_type_id),
+        )
+    ] += 1
+    return deltas
+
+
+def _upsert(
+    dialect_name: str, rows: List[Dict[str, Any]]
+) -> Executable:
+    """INSERT rows, adding to the count of existing ones."""
+    if dialect_name == "mysql":
+        statement = mysql.insert(DailyEventCount).values(
+            rows
+        )
+        return statement.on_duplicate_key_update(
+            count=DailyEventCount.count
+            + statement.inserted.count
+        )
+    if dialect_name in ("postgresql", "sqlite"):
+        dialect = (
+            postgresql
+            if dialect_name == "postgresql"
+            else sqlite
+        )
+        statement = dialect.insert(DailyEventCount).values(
+            rows
+        )
+        return statement.on_conflict_do_update(
+            index_elements=[
+                DailyEventCount.day,
+                DailyEventCount.event_type_id,
+            ],
+            set_={
+                "count": DailyEventCount.count
+                + statement.excluded.count
+            },
+        )
+    raise NotImplementedError(
+        f"Daily event counts are not supported on {dialect_name}"
+    )
+
+
+def delta_statements(
+    dialect_name: str, deltas: Dict[RollupKey, int]
+) -> List[Executable]:
+    """Statements that apply `deltas` to the daily counts."""
+    # Sorted, so concurrent writers lock rows in the same order
+    keys = sorted(
+        key for key, delta in deltas.items() if delta
+    )
+
+    statements = []
+    increments = [
+        {
+            "day": day,
+            "event_type_id": event_type_id,
+            "count": deltas[(day, event_type_id)],
+        }
+        for day, event_type_id in keys
+        if deltas[(day, event_type_id)] > 0
+    ]
+    if increments:
+        statements.append(_upsert(dialect_name, increments))
+
+    for day, event_type_id in keys:
+        delta = deltas[(day, event_type_id)]
+        if delta > 0:
+            continue
+        row = and_(
+            DailyEventCount.day == day,
+            DailyEventCount.event_type_id == event_type_id,
+        )
+        statements.append(
+            update(DailyEventCount)
+            .where(row)
+            .values(count=DailyEventCount.count + delta)
+        )
+        # Days without events have no row
+        statements.append(
+            delete(DailyEventCount).where(
+                row, DailyEventCount.count <= 0
+            )
+        )
+    return statements
+
+
+def summary_statement(
+    interval: str,
+    event_type_id: Optional[int] = None,
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None,
+) -> Select:
+    """Build the count query per time bucket from the rollups."""
+    bucket = time_bucket(interval, DailyEventCount.day)
+    query = select(
+        bucket.label("bucket"),
+        DailyEventCount.event_type_id,
+        func.sum(DailyEventCount.count).label("count"),
+    )
+
+    filter_conditions = []
+    if event_type_id:
+        filter_conditions.append(
+            DailyEventCount.event_type_id == event_type_id
+        )
+    if start_day:
+        filter_conditions.append(
+            DailyEventCount.day >= start_day
+        )
+    if end_day:
+        filter_conditions.append(
+            DailyEventCount.day <= end_day
+        )
+    if filter_conditions:
+        query = query.where(and_(*filter_conditions))
+
+    return query.group_by(
+        bucket, DailyEventCount.event_type_id
+    ).order_by(bucket, DailyEventCount.event_type_id)
+
+
+def rebuild_statements(
+    since: Optional[date] = None,
+) -> List[Executable]:
+    """Statements that recompute the daily counts from events.
+
+    Days before `since`, such as archived ones, are kept.
+    """
+    day = func.date(LifeEvent.timestamp)
+    counts = select(
+        day, LifeEvent.event_type_id, func.count()
+    ).group_by(day, LifeEvent.event_type_id)
+    stale = delete(DailyEventCount)
+    if since:
+        counts = counts.where(
+            LifeEvent.timestamp
+            >= datetime.combine(since, datetime.min.time())
+        )
+        stale = stale.where(DailyEventCount.day >= since)
+    return [
+        stale,
+        insert(DailyEventCount).from_select(
+            ["day", "event_type_id", "count"], counts
+        ),
+    ]
@@ -0,0 +1,197 @@
+"""Full-text search over the text in life event payloads.
+
+The index is kept in sync by the database itself, so every write
+path, batch inserts and cascading deletes included, is covered:
+
+- MySQL: a stored generated column of the payload values with a
+  FULLTEXT index.
+- SQLite: an FTS5 table fed by triggers on `life_events`.
+- PostgreSQL: a GIN index over the payload's string values.
+"""
+
+from typing import Optional
+
+from sqlalchemy import (
+    column,
+    func,
+    literal_column,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Select
+
+from models.LifeEventModel import LifeEvent
+
+SEARCH_INDEX = "ix_life_events_search"
+SEARCH_TABLE = "life_events_fts"
+
+# String values anywhere in the payload, as one document
+_SQLITE_DOCUMENT = (
+    "(SELECT group_concat(value, ' ') "
+    "FROM json_tree({row}.data) WHERE type = 'text')"
+)
+_POSTGRESQL_DOCUMENT = "jsonb_to_tsvector('simple', data::jsonb, '[\"string\"]')"
+
+_SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5(content)",
+    f"CREATE TRIGGER {SEARCH_TABLE}_insert "
+    "AFTER INSERT ON life_events BEGIN "
+    f"INSERT INTO {SEARCH_TABLE} (rowid, content) VALUES "
+    f"(new.id, {_SQLITE_DOCUMENT.format(row='new')}); END",
+    f"CREATE TRIGGER {SEARCH_TABLE}_update "
+    "AFTER UPDATE OF data ON life_events BEGIN "
+    f"UPDATE {SEARCH_TABLE} "
+    f"SET content = {_SQLITE_DOCUMENT.format(row='new')} "
+    "WHERE rowid = old.id; END",
+    # Also fires for ON DELETE CASCADE from event types
+    f"CREATE TRIGGER {SEARCH_TABLE}_delete "
+    "AFTER DELETE ON life_events BEGIN "
+    f"DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id; END",
+    f"INSERT INTO {SEARCH_TABLE} (rowid, content) "
+    f"SELECT id, {_SQLITE_DOCUMENT.format(row='life_events')} "
+    "FROM life_events",
+]
+
+_MYSQL_DDL = [
+    # Stored, as FULLTEXT indexes cannot cover virtual columns.
+    # Adding it copies the table once.
+    "ALTER TABLE life_events "
+    "ADD COLUMN search_text LONGTEXT GENERATED ALWAYS AS "
+    "(JSON_UNQUOTE(JSON_EXTRACT(data, '$**.*'))) STORED, "
+    f"ADD FULLTEXT INDEX {SEARCH_INDEX} (search_text)",
+]
+
+
+class SearchUnavailable(Exception):
+    """Full-text search is not available on this database."""
+
+
+def search_index_exists(connection: Connection) -> bool:
+    """Whether `life_events` has its full-text index."""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        query = (
+            "SELECT name FROM sqlite_master "
+            "WHERE name = :name"
+        )
+        name = SEARCH_TABLE
+    elif dialect == "mysql":
+        # Index names are only unique per table
+        query = (
+            "SELECT index_name "
+            "FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() "
+            "AND table_name = 'life_events' "
+            "AND index_name = :name"
+        )
+        name = SEARCH_INDEX
+    else:
+        query = (
+            "SELECT indexname FROM pg_indexes "
+            "WHERE schemaname = current_schema() "
+            "AND tablename = 'life_events' "
+            "AND indexname = :name"
+        )
+        name = SEARCH_INDEX
+    return (
+        connection.execute(
+            text(query), {"name": name}
+        ).first()
+        is not None
+    )
+
+
+def create_search_index(connection: Connection) -> None:
+    """Create the full-text index and backfill it, if missing."""
+    if search_index_exists(connection):
+        return
+
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        statements = _SQLITE_DDL
+    elif dialect == "mysql":
+        statements = _MYSQL_DDL
+    elif dialect == "postgresql":
+        connection = connection.execution_options(
+            isolation_level="AUTOCOMMIT"
+        )
+        statements = [
+            f"CREATE INDEX CONCURRENTLY {SEARCH_INDEX} "
+            f"ON life_events USING GIN ({_POSTGRESQL_DOCUMENT})"
+        ]
+    else:
+        raise SearchUnavailable(
+            f"Full-text search is not supported on {dialect}"
+        )
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def _fts5_query(query: str) -> str:
+    # Every word as a quoted phrase, so user input is never
+    # parsed as FTS5 query syntax
+    return " ".join(
+        '"' + word.replace('"', '""') + '"'
+        for word in query.split()
+    )
+
+
+def search_statement(
+    dialect_name: str,
+    query: str,
+    limit: Optional[int] = None,
+    start: Optional[int] = None,
+    event_type_id: Optional[int] = None,
+) -> Select:
+    """Build the ranked search query for (LifeEvent, score) rows.
+
+    Higher scores are better matches.
+    """
+    if dialect_name == "sqlite":
+        fts = table(SEARCH_TABLE, column("rowid"))
+        # bm25 is lower for better matches
+        score = -func.bm25(literal_column(SEARCH_TABLE))
+        statement = (
+            select(LifeEvent, score.label("score"))
+            .join(fts, fts.c.rowid == LifeEvent.id)
+            .where(
+                literal_column(SEARCH_TABLE).op("MATCH")(
+                    _fts5_query(query)
+                )
+            )
+        )
+    elif dialect_name == "mysql":
+        score = match(
+            literal_column("life_events.search_text"),
+            against=query,
+        ).in_natural_language_mode()
+        statement = select(
+            LifeEvent, score.label("score")
+        ).where(score)
+    elif dialect_name == "postgresql":
+        document = literal_column(_POSTGRESQL_DOCUMENT)
+        terms = func.plainto_tsquery("simple", query)
+        score = func.ts_rank(document, terms)
+        statement = select(
+            LifeEvent, score.label("score")
+        ).where(document.op("@@")(terms))
+    else:
+        raise SearchUnavailable(
+            f"Full-text search is not supported on {dialect_name}"
+        )
+
+    if event_type_id:
+        statement = statement.where(
+            LifeEvent.event_type_id == event_type_id
+        )
+    statement = statement.order_by(
+        literal_column("score").desc(), LifeEvent.id
+    )
+    if start:
+        statement = statement.offset(start)
+    if limit is not None:
+        statement = statement.limit(limit)
+    return statement
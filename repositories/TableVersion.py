@@ -0,0 +1,105 @@
+"""Statements that bump and read table change versions.
+
+Writes also bump a process-local generation per table, which
+in-process caches compare without a query. Invalidations of
+tables published by other workers bump it as well.
+"""
+
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.sql import Executable, Select
+
+from configs.Invalidation import invalidation_bus
+from models.TableVersionModel import TableVersion
+
+
+def bump_statement(
+    dialect_name: str,
+    names: Iterable[str],
+    now: Optional[datetime] = None,
+) -> Executable:
+    """Increment the versions of tables, creating missing rows."""
+    now = now or datetime.utcnow()
+    # Sorted, so concurrent writers lock rows in the same order
+    rows = [
+        {"name": name, "version": 1, "updated_at": now}
+        for name in sorted(set(names))
+    ]
+    if dialect_name == "mysql":
+        statement = mysql.insert(TableVersion).values(rows)
+        return statement.on_duplicate_key_update(
+            version=TableVersion.version + 1,
+            updated_at=statement.inserted.updated_at,
+        )
+    if dialect_name in ("postgresql", "sqlite"):
+        dialect = (
+            postgresql
+            if dialect_name == "postgresql"
+            else sqlite
+        )
+        statement = dialect.insert(TableVersion).values(
+            rows
+        )
+        return statement.on_conflict_do_update(
+            index_elements=[TableVersion.name],
+            set_={
+                "version": TableVersion.version + 1,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+    raise NotImplementedError(
+        f"Table versions are not supported on {dialect_name}"
+    )
+
+
+def versions_statement(names: Iterable[str]) -> Select:
+    """Build the query for the version rows of tables."""
+    return select(TableVersion).where(
+        TableVersion.name.in_(list(names))
+    )
+
+
+class TableGenerations:
+    """Process-local counters, bumped on every table write."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._generations: Dict[str, int] = {}
+
+    def get(self, *names: str) -> Tuple[int, ...]:
+        with self._lock:
+            # Known from now on, so `bump_all` reaches it
+            return tuple(
+                self._generations.setdefault(name, 0)
+                for name in names
+            )
+
+    def bump(self, *names: str) -> None:
+        with self._lock:
+            for name in names:
+                self._generations[name] = (
+                    self._generations.get(name, 0) + 1
+                )
+
+    def bump_all(self) -> None:
+        with self._lock:
+            for name in self._generations:
+                self._generations[name] += 1
+
+
+table_generations = TableGenerations()
+
+
+@invalidation_bus.subscribe
+def _invalidate_tables(
+    table: Optional[str], key: Optional[Any]
+) -> None:
+    # Keyed invalidations concern single cache entries
+    if table is None:
+        table_generations.bump_all()
+    elif key is None:
+        table_generations.bump(table)
@@ -0,0 +1,49 @@
+from typing import Dict
+
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from configs.database import get_db
+from configs.Invalidation import invalidation_bus
+from configs.Routing import REPLICA
+from models.TableVersionModel import TableVersion
+from repositories.TableVersion import (
+    bump_statement,
+    versions_statement,
+)
+
+
+class TableVersionRepository:
+    """Change versions of the tables behind the API."""
+
+    db: Session
+
+    def __init__(
+        self, db: Session = Depends(get_db)
+    ) -> None:
+        self.db = db
+
+    def get(self, *names: str) -> Dict[str, TableVersion]:
+        query = versions_statement(names)
+        return {
+            row.name: row
+            for row in self.db.execute(
+                query, bind_arguments=REPLICA
+            ).scalars()
+        }
+
+    def bump(self, *names: str) -> None:
+        # Part of the caller's transaction, before it commits: a
+        # committed write always comes with its new version, even
+        # if the process dies right after
+        self.db.execute(
+            bump_statement(
+                self.db.get_bind().dialect.name, names
+            )
+        )
+
+    def publish(self, *names: str) -> None:
+        # Drops the cached results of the tables, in every
+        # worker, once the write has committed
+        for name in names:
+            invalidation_bus.publish(name)
@@ -0,0 +1,116 @@
+"""Portable truncation of timestamps to the start of a bucket."""
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import DateTime, literal
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.sql.visitors import InternalTraversal
+
+INTERVALS = ("hour", "day", "week", "month")
+
+# Buckets are rendered as "YYYY-MM-DD HH:MM:SS" where the dialect
+# has no native truncation, so they read back as datetimes
+_FORMATS = {
+    "hour": "%Y-%m-%d %H:00:00",
+    "day": "%Y-%m-%d 00:00:00",
+    "week": "%Y-%m-%d 00:00:00",
+    "month": "%Y-%m-01 00:00:00",
+}
+
+
+class time_bucket(FunctionElement):
+    """Start of the hour, day, week or month of a timestamp.
+
+    Weeks start on Monday on every dialect.
+    """
+
+    type = DateTime()
+    name = "time_bucket"
+    inherit_cache = True
+    # The interval changes the SQL, so it is part of the cache key
+    _traverse_internals = (
+        FunctionElement._traverse_internals
+        + [("interval", InternalTraversal.dp_string)]
+    )
+
+    def __init__(self, interval: str, column: Any) -> None:
+        if interval not in INTERVALS:
+            raise ValueError(
+                f"Unsupported interval: {interval}"
+            )
+        self.interval = interval
+        super().__init__(column)
+
+
+def _format(
+    element: time_bucket, compiler: Any, **kw: Any
+) -> str:
+    # Inlined rather than bound, so the SELECT and GROUP BY
+    # expressions compare equal, with `%` escaped per driver
+    return compiler.process(
+        literal(_FORMATS[element.interval]),
+        **{**kw, "literal_binds": True},
+    )
+
+
+@compiles(time_bucket)
+def _compile_default(
+    element: time_bucket, compiler: Any, **kw: Any
+) -> str:
+    # PostgreSQL; date_trunc weeks also start on Monday
+    column = compiler.process(element.clauses, **kw)
+    return f"date_trunc('{element.interval}', {column})"
+
+
+@compiles(time_bucket, "sqlite")
+def _compile_sqlite(
+    element: time_bucket, compiler: Any, **kw: Any
+) -> str:
+    column = compiler.process(element.clauses, **kw)
+    format = _format(element, compiler, **kw)
+    if element.interval == "week":
+        # `weekday 1` moves forward to Monday, unless already one
+        return (
+            f"strftime({format}, {column}, "
+            "'-6 days', 'weekday 1')"
+        )
+    return f"strftime({format}, {column})"
+
+
+@compiles(time_bucket, "mysql")
+def _compile_mysql(
+    element: time_bucket, compiler: Any, **kw: Any
+) -> str:
+    column = compiler.process(element.clauses, **kw)
+    if element.interval == "week":
+        return (
+            f"CAST(DATE_SUB(DATE({column}), "
+            f"INTERVAL WEEKDAY({column}) DAY) AS DATETIME)"
+        )
+    format = _format(element, compiler, **kw)
+    return (
+        f"CAST(DATE_FORMAT({column}, {format}) AS DATETIME)"
+    )
+
+
+def bucket_start(
+    interval: str, timestamp: datetime
+) -> datetime:
+    """The bucket of a timestamp, as `time_bucket` computes it."""
+    if interval not in INTERVALS:
+        raise ValueError(
+            f"Unsupported interval: {interval}"
+        )
+    start = timestamp.replace(
+        minute=0, second=0, microsecond=0
+    )
+    if interval == "hour":
+        return start
+    start = start.replace(hour=0)
+    if interval == "week":
+        return start - timedelta(days=start.weekday())
+    if interval == "month":
+        return start.replace(day=1)
+    return start
@@ -0,0 +1,26 @@
+from fastapi import Depends, Request, Response
+
+from repositories.AsyncTableVersionRepository import (
+    AsyncTableVersionRepository,
+)
+from routers.Conditional import (
+    Conditional,
+    check_conditional,
+)
+
+
+class AsyncConditional(Conditional):
+    """Async counterpart of Conditional."""
+
+    async def __call__(
+        self,
+        request: Request,
+        response: Response,
+        repository: AsyncTableVersionRepository = Depends(),
+    ) -> None:
+        check_conditional(
+            request,
+            response,
+            self.tables,
+            await repository.get(*self.tables),
+        )
@@ -0,0 +1,279 @@
+"""Columnar exports of life events, as Arrow IPC or Parquet.
+
+`id`, `timestamp` and `event_type_id` are typed columns, and every
+payload field declared in the exported event types' schemas is a
+typed `data.<field>` column. Undeclared fields, and values that do
+not match their declared type, are kept as JSON in a `data` column,
+so nothing is lost. Each chunk of rows read from the cursor is
+encoded as one record batch, a row group in Parquet, and sent as
+soon as it is written. Needs pyarrow.
+"""
+
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Set,
+)
+
+from fastapi import HTTPException
+
+from models.EventTypeModel import EventType
+from routers.FastJSON import dumps
+from schemas.pydantic.LifeEventSchema import ExportFormat
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+COLUMNAR_FORMATS = (
+    ExportFormat.arrow,
+    ExportFormat.parquet,
+)
+
+INT64_RANGE = range(-(2**63), 2**63)
+
+# Arrow columns for JSON Schema types; other declared fields are
+# JSON string columns
+KINDS = {
+    "integer": "int64",
+    "number": "float64",
+    "boolean": "bool",
+    "string": "string",
+}
+
+# Python types of the values each kind of column holds
+TYPES = {
+    "int64": {int, type(None)},
+    "float64": {int, float, type(None)},
+    "bool": {bool, type(None)},
+    "string": {str, type(None)},
+}
+
+
+def _kind(schema: Any) -> str:
+    types = (
+        schema.get("type")
+        if isinstance(schema, dict)
+        else None
+    )
+    if isinstance(types, list):
+        types = [type for type in types if type != "null"]
+        types = types[0] if len(types) == 1 else None
+    return KINDS.get(types, "json")
+
+
+def _arrow_type(kind: str) -> Any:
+    return {
+        "int64": pyarrow.int64,
+        "float64": pyarrow.float64,
+        "bool": pyarrow.bool_,
+    }.get(kind, pyarrow.string)()
+
+
+def _json(value: Any) -> str:
+    return dumps(value).decode("utf-8")
+
+
+class ColumnLayout:
+    """The columns of an export of some event types."""
+
+    def __init__(
+        self, event_types: Iterable[EventType]
+    ) -> None:
+        kinds: Dict[str, str] = {}
+        owners: Dict[str, Set[int]] = {}
+        self.declared: Dict[int, FrozenSet[str]] = {}
+        for event_type in event_types:
+            properties = (
+                event_type.event_schema or {}
+            ).get("properties") or {}
+            for field, schema in properties.items():
+                kind = _kind(schema)
+                # Fields declared with different types are JSON
+                kinds[field] = (
+                    kind
+                    if kinds.get(field, kind) == kind
+                    else "json"
+                )
+                owners.setdefault(field, set()).add(
+                    event_type.id
+                )
+            self.declared[event_type.id] = frozenset(
+                properties
+            )
+        self.fields = list(kinds)
+        self.kinds = list(kinds.values())
+        # Event types declaring each field
+        self.owners = [owners[field] for field in kinds]
+        self.schema = pyarrow.schema(
+            [
+                ("id", pyarrow.int64()),
+                ("timestamp", pyarrow.timestamp("us")),
+                ("event_type_id", pyarrow.int64()),
+                *(
+                    (f"data.{field}", _arrow_type(kind))
+                    for field, kind in zip(
+                        self.fields, self.kinds
+                    )
+                ),
+                ("data", pyarrow.string()),
+            ]
+        )
+
+    def batch(self, rows: List[Any]) -> Any:
+        """One record batch of rows, built column by column."""
+        payloads = [row.data for row in rows]
+        event_type_ids = [row.event_type_id for row in rows]
+        empty: FrozenSet[str] = frozenset()
+        rest = [
+            {
+                field: value
+                for field, value in data.items()
+                if field not in self.declared.get(id, empty)
+            }
+            for data, id in zip(payloads, event_type_ids)
+        ]
+        arrays = [
+            pyarrow.array(
+                [row.id for row in rows], pyarrow.int64()
+            ),
+            pyarrow.array(
+                [row.timestamp for row in rows],
+                pyarrow.timestamp("us"),
+            ),
+            pyarrow.array(event_type_ids, pyarrow.int64()),
+        ]
+        for field, kind, owners, column in zip(
+            self.fields,
+            self.kinds,
+            self.owners,
+            self.schema.types[3:],
+        ):
+            values = [
+                data.get(field) if id in owners else None
+                for data, id in zip(
+                    payloads, event_type_ids
+                )
+            ]
+            arrays.append(
+                self._array(
+                    field, kind, column, values, rest
+                )
+            )
+        arrays.append(
+            pyarrow.array(
+                [
+                    _json(others) if others else None
+                    for others in rest
+                ],
+                pyarrow.string(),
+            )
+        )
+        return pyarrow.RecordBatch.from_arrays(
+            arrays, schema=self.schema
+        )
+
+    def _array(
+        self,
+        field: str,
+        kind: str,
+        column: Any,
+        values: List[Any],
+        rest: List[Dict[str, Any]],
+    ) -> Any:
+        if kind == "json":
+            return pyarrow.array(
+                [
+                    None if value is None else _json(value)
+                    for value in values
+                ],
+                column,
+            )
+        # Checked a whole column at a time, then value by value
+        # only when some do not fit
+        if set(map(type, values)) <= TYPES[kind]:
+            try:
+                return pyarrow.array(values, column)
+            except OverflowError:
+                pass
+        for index, value in enumerate(values):
+            if value is None:
+                continue
+            if type(value) not in TYPES[kind] or (
+                kind == "int64" and value not in INT64_RANGE
+            ):
+                # Kept as it is in the data column
+                rest[index][field] = value
+                values[index] = None
+        return pyarrow.array(values, column)
+
+
+class _Sink:
+    # File object the writers write to, drained after each batch
+    def __init__(self) -> None:
+        self.chunks: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data: Any) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class ColumnarWriter:
+    """Encodes an export batch by batch, as Arrow IPC or Parquet."""
+
+    def __init__(
+        self,
+        format: ExportFormat,
+        event_types: Iterable[EventType],
+    ) -> None:
+        if pyarrow is None:
+            raise HTTPException(
+                status_code=501,
+                detail="Arrow and Parquet exports need pyarrow",
+            )
+        self.layout = ColumnLayout(event_types)
+        self.sink = _Sink()
+        if format == ExportFormat.parquet:
+            self.writer = pyarrow.parquet.ParquetWriter(
+                self.sink,
+                self.layout.schema,
+                compression="zstd",
+            )
+        else:
+            self.writer = pyarrow.ipc.new_stream(
+                self.sink, self.layout.schema
+            )
+
+    def open(self) -> bytes:
+        return self.sink.take()
+
+    def write(self, rows: List[Any]) -> bytes:
+        self.writer.write_batch(self.layout.batch(rows))
+        return self.sink.take()
+
+    def close(self) -> bytes:
+        self.writer.close()
+        return self.sink.take()
@@ -0,0 +1,105 @@
+"""Conditional GETs answered from table change versions.
+
+Routes depend on `Conditional` (`AsyncConditional` for async
+routers) with the tables their responses are read from. The
+dependency sets a strong `ETag` and `Last-Modified` from the
+tables' versions and, when the client's copy is current, raises
+`NotModified` before the route queries or serializes anything.
+
+Only `If-None-Match` can make a copy current: HTTP dates have
+whole seconds, so a write later in the second a copy was read in
+would leave `If-Modified-Since` unchanged.
+"""
+
+from datetime import timezone
+from email.utils import format_datetime
+from typing import Dict, Mapping, Sequence
+
+from fastapi import Depends, Request, Response
+
+from models.TableVersionModel import TableVersion
+from repositories.TableVersionRepository import (
+    TableVersionRepository,
+)
+
+
+class NotModified(Exception):
+    """The client's cached representation is still current."""
+
+    def __init__(self, headers: Dict[str, str]) -> None:
+        self.headers = headers
+
+
+async def not_modified_handler(
+    request: Request, exc: NotModified
+) -> Response:
+    # A 304 has no body, unlike an HTTPException response
+    return Response(status_code=304, headers=exc.headers)
+
+
+def _validators(
+    tables: Sequence[str],
+    versions: Mapping[str, TableVersion],
+) -> Dict[str, str]:
+    rows = [versions.get(table) for table in tables]
+    etag = ".".join(
+        str(row.version if row else 0) for row in rows
+    )
+    headers = {"ETag": f'"{etag}"'}
+    modified = [row.updated_at for row in rows if row]
+    if modified:
+        headers["Last-Modified"] = format_datetime(
+            max(modified).replace(tzinfo=timezone.utc),
+            usegmt=True,
+        )
+    return headers
+
+
+def _is_current(
+    request: Request, headers: Mapping[str, str]
+) -> bool:
+    # If-Modified-Since is ignored, see above
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    # Weak comparison, as for every GET
+    tags = {
+        tag.strip().removeprefix("W/")
+        for tag in if_none_match.split(",")
+    }
+    return "*" in tags or headers["ETag"] in tags
+
+
+def check_conditional(
+    request: Request,
+    response: Response,
+    tables: Sequence[str],
+    versions: Mapping[str, TableVersion],
+) -> None:
+    """Set the validators, or raise NotModified if current."""
+    headers = _validators(tables, versions)
+    if _is_current(request, headers):
+        raise NotModified(headers)
+    response.headers.update(headers)
+
+
+class Conditional:
+    """Validators for responses read from `tables`."""
+
+    def __init__(self, *tables: str) -> None:
+        self.tables = tables
+
+    def __call__(
+        self,
+        request: Request,
+        response: Response,
+        repository: TableVersionRepository = Depends(),
+    ) -> None:
+        # Read before the route's data, so the validators are
+        # never newer than the response
+        check_conditional(
+            request,
+            response,
+            self.tables,
+            repository.get(*self.tables),
+        )
@@ -0,0 +1,183 @@
+"""Streamed exports of life events.
+
+Events are encoded as they are read from a server-side cursor and
+sent in chunks of EXPORT_CHUNK_SIZE rows, so an export holds one
+chunk in memory whatever its size. Rows are written as NDJSON or
+CSV here, and as Arrow IPC or Parquet by `routers.Columnar`.
+"""
+
+import csv
+import io
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    List,
+    Union,
+)
+
+from fastapi.responses import StreamingResponse
+
+from models.EventTypeModel import EventType
+from routers.Columnar import (
+    COLUMNAR_FORMATS,
+    ColumnarWriter,
+)
+from routers.FastJSON import dumps, model_rows
+from schemas.pydantic.LifeEventSchema import (
+    ExportFormat,
+    LifeEventResponse,
+)
+
+# Rows encoded per chunk sent to the client
+EXPORT_CHUNK_SIZE = 1000
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+    ExportFormat.arrow: "application/vnd.apache.arrow.stream",
+    ExportFormat.parquet: "application/vnd.apache.parquet",
+}
+
+CSV_COLUMNS = tuple(LifeEventResponse.__fields__)
+
+
+def _ndjson(rows: List[Any]) -> bytes:
+    return b"".join(
+        dumps(row) + b"\n"
+        for row in model_rows(LifeEventResponse, rows)
+    )
+
+
+def _csv(rows: List[Any]) -> bytes:
+    # Payloads are nested, so they are one JSON column
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for row in model_rows(LifeEventResponse, rows):
+        writer.writerow(
+            [
+                row["id"],
+                row["timestamp"].isoformat(),
+                row["event_type_id"],
+                dumps(row["data"]).decode("utf-8"),
+            ]
+        )
+    return buffer.getvalue().encode("utf-8")
+
+
+class RowWriter:
+    """Encodes an export chunk by chunk, as NDJSON or CSV."""
+
+    def __init__(self, format: ExportFormat) -> None:
+        self.format = format
+
+    def open(self) -> bytes:
+        if self.format == ExportFormat.csv:
+            return (",".join(CSV_COLUMNS) + "\n").encode(
+                "utf-8"
+            )
+        return b""
+
+    def write(self, rows: List[Any]) -> bytes:
+        return encode_chunk(self.format, rows)
+
+    def close(self) -> bytes:
+        return b""
+
+
+def encode_chunk(
+    format: ExportFormat, rows: List[Any]
+) -> bytes:
+    """Encode rows of an export in the given format."""
+    if format == ExportFormat.csv:
+        return _csv(rows)
+    return _ndjson(rows)
+
+
+def export_writer(
+    format: ExportFormat,
+    event_types: Iterable[EventType] = (),
+) -> Union[RowWriter, ColumnarWriter]:
+    """The writer of an export, with the event types whose
+    payload fields columnar formats spread into columns.
+    """
+    if format in COLUMNAR_FORMATS:
+        return ColumnarWriter(format, event_types)
+    return RowWriter(format)
+
+
+def export_chunks(
+    format: ExportFormat,
+    events: Iterable[Any],
+    event_types: Iterable[EventType] = (),
+) -> Iterator[bytes]:
+    """The encoded chunks of an export of events."""
+    # Created first, so a missing encoder fails the request
+    return _chunks(
+        export_writer(format, event_types), events
+    )
+
+
+def _chunks(
+    writer: Union[RowWriter, ColumnarWriter],
+    events: Iterable[Any],
+) -> Iterator[bytes]:
+    header = writer.open()
+    if header:
+        yield header
+    events = iter(events)
+    while rows := list(islice(events, EXPORT_CHUNK_SIZE)):
+        yield writer.write(rows)
+    footer = writer.close()
+    if footer:
+        yield footer
+
+
+def async_export_chunks(
+    format: ExportFormat,
+    events: AsyncIterable[Any],
+    event_types: Iterable[EventType] = (),
+) -> AsyncIterator[bytes]:
+    """Async counterpart of export_chunks."""
+    return _async_chunks(
+        export_writer(format, event_types), events
+    )
+
+
+async def _async_chunks(
+    writer: Union[RowWriter, ColumnarWriter],
+    events: AsyncIterable[Any],
+) -> AsyncIterator[bytes]:
+    header = writer.open()
+    if header:
+        yield header
+    rows = []
+    async for event in events:
+        rows.append(event)
+        if len(rows) == EXPORT_CHUNK_SIZE:
+            yield writer.write(rows)
+            rows = []
+    if rows:
+        yield writer.write(rows)
+    footer = writer.close()
+    if footer:
+        yield footer
+
+
+def export_response(
+    format: ExportFormat, chunks: Any
+) -> StreamingResponse:
+    """Stream chunks as a downloadable file."""
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": (
+                "attachment; "
+                f'filename="life_events.{format.value}"'
+            )
+        },
+    )
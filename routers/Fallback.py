@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+
+
+def with_fallback(
+    primary: APIRouter, fallback: APIRouter
+) -> APIRouter:
+    """Serve `primary` routes, falling back to `fallback` ones.
+
+    Routes keep the fallback's order, so static paths such as
+    `/batch` still match before parameterised ones like `/{id}`.
+    """
+    overrides = {
+        (route.path, frozenset(route.methods)): route
+        for route in primary.routes
+    }
+    merged = APIRouter()
+    for route in fallback.routes:
+        key = (route.path, frozenset(route.methods))
+        merged.routes.append(overrides.pop(key, route))
+    merged.routes.extend(overrides.values())
+    return merged
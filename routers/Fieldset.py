@@ -0,0 +1,57 @@
+"""Sparse fieldsets for REST reads.
+
+Routes depend on `Fieldset` with their response model, so clients
+can ask for some fields only, e.g. `?fields=id,timestamp`. Services
+pass the fields on to repositories, which load only those columns,
+and responses are encoded with just those fields.
+"""
+
+from typing import Optional, Tuple, Type
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+
+from routers.FastJSON import model_fields
+
+
+class Fieldset:
+    """Dependency resolving `fields` against a response model.
+
+    Resolves to the requested fields in the model's order, or to
+    None when every field is wanted.
+    """
+
+    def __init__(self, model: Type[BaseModel]) -> None:
+        self.model = model
+
+    def __call__(
+        self,
+        fields: Optional[str] = Query(
+            None,
+            description="Comma-separated fields to return, "
+            "e.g. `id,timestamp,event_type_id`",
+        ),
+    ) -> Optional[Tuple[str, ...]]:
+        if not fields:
+            return None
+        requested = {
+            field.strip()
+            for field in fields.split(",")
+            if field.strip()
+        }
+        known = model_fields(self.model)
+        unknown = requested.difference(known)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail="Unknown fields: "
+                + ", ".join(sorted(unknown)),
+            )
+        return (
+            tuple(
+                field
+                for field in known
+                if field in requested
+            )
+            or None
+        )
@@ -0,0 +1,44 @@
+"""Request bodies read as they arrive, for bulk imports."""
+
+from typing import Any, Dict, Iterator
+
+from anyio.from_thread import run
+from fastapi import Request
+
+from schemas.pydantic.LifeEventSchema import ImportFormat
+
+MEDIA_TYPES = {
+    ImportFormat.ndjson: "application/x-ndjson",
+    ImportFormat.csv: "text/csv",
+}
+
+# Documents the raw request body, which routes read themselves
+IMPORT_OPENAPI: Dict[str, Any] = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            media_type: {
+                "schema": {
+                    "type": "string",
+                    "format": "binary",
+                }
+            }
+            for media_type in MEDIA_TYPES.values()
+        },
+    }
+}
+
+
+def request_chunks(request: Request) -> Iterator[bytes]:
+    """The body of a request as it arrives, for sync routes.
+
+    Sync routes run in a worker thread, so each chunk is awaited
+    on the event loop.
+    """
+    stream = request.stream()
+    while True:
+        try:
+            chunk = run(stream.__anext__)
+        except StopAsyncIteration:
+            return
+        yield chunk
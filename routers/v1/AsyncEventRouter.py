@@ -0,0 +1,328 @@
+from typing import List, Optional, Tuple
+from datetime import date, datetime
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
+from services.EventImport import IMPORT_CHUNK_SIZE
+from services.AsyncLifeEventService import (
+    AsyncLifeEventService,
+)
+from schemas.pydantic.LifeEventSchema import (
+    ExportFormat,
+    ImportFormat,
+    LifeEventBatchResponse,
+    LifeEventResponse,
+    LifeEventSearchResult,
+    LifeEventStatsResponse,
+    StatsInterval,
+    SummaryInterval,
+    LifeEventCreate,
+    LifeEventImportResponse,
+    LifeEventUpdate,
+)
+from routers.AsyncConditional import AsyncConditional
+from routers.Columnar import COLUMNAR_FORMATS
+from routers.Export import (
+    MEDIA_TYPES,
+    async_export_chunks,
+    export_response,
+)
+from routers.FastJSON import row_response, rows_response
+from routers.Fieldset import Fieldset
+from routers.Import import IMPORT_OPENAPI
+
+router = APIRouter(
+    prefix="/api/v1/events",
+    tags=["Life Events"],
+)
+
+
+@router.post("/", response_model=LifeEventResponse)
+async def create_event(
+    event: LifeEventCreate,
+    service: AsyncLifeEventService = Depends(),
+) -> LifeEventResponse:
+    """Create a new life event."""
+    db_event = await service.create(event)
+    return LifeEventResponse.from_orm(db_event)
+
+
+@router.post(
+    "/batch", response_model=LifeEventBatchResponse
+)
+async def create_events(
+    events: List[LifeEventCreate],
+    service: AsyncLifeEventService = Depends(),
+) -> LifeEventBatchResponse:
+    """Create many life events in one transaction."""
+    return await service.create_many(events)
+
+
+@router.post(
+    "/import",
+    response_model=LifeEventImportResponse,
+    openapi_extra=IMPORT_OPENAPI,
+)
+async def import_events(
+    request: Request,
+    format: ImportFormat = ImportFormat.ndjson,
+    skip: Optional[int] = Query(
+        None,
+        ge=0,
+        description="Lines already imported, to resume an import",
+    ),
+    import_id: Optional[str] = Query(
+        None,
+        min_length=1,
+        max_length=255,
+        description="Name to save the import's progress under",
+    ),
+    chunk_size: int = Query(
+        IMPORT_CHUNK_SIZE,
+        ge=1,
+        le=10000,
+        description="Events committed at a time",
+    ),
+    service: AsyncLifeEventService = Depends(),
+) -> LifeEventImportResponse:
+    """Import life events from an NDJSON or CSV body.
+
+    The body is read as it arrives and committed every
+    `chunk_size` events; `skip` resumes an import from the
+    `lines` an earlier one reached. With an `import_id`, the
+    progress is saved with every commit, and a retry without
+    `skip` resumes from it.
+    """
+    return await service.import_events(
+        format,
+        request.stream(),
+        skip=skip,
+        chunk_size=chunk_size,
+        import_id=import_id,
+    )
+
+
+@router.get(
+    "/import/{import_id}",
+    response_model=LifeEventImportResponse,
+)
+async def get_import(
+    import_id: str,
+    service: AsyncLifeEventService = Depends(),
+) -> LifeEventImportResponse:
+    """Get the progress saved for an import."""
+    return await service.get_import(import_id)
+
+
+@router.get(
+    "/",
+    response_model=List[LifeEventResponse],
+    # Payload filters are checked against event type schemas
+    dependencies=[
+        Depends(
+            AsyncConditional("life_events", "event_types")
+        )
+    ],
+)
+async def list_events(
+    response: Response,
+    event_type_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    limit: Optional[int] = 100,
+    start: Optional[int] = 0,
+    cursor: Optional[str] = None,
+    data: Optional[List[str]] = Query(
+        None,
+        description="`field:op:value` filters on payload fields "
+        "declared by the event type, op being one of eq, ne, "
+        "gt, gte, lt or lte",
+    ),
+    fields: Optional[Tuple[str, ...]] = Depends(
+        Fieldset(LifeEventResponse)
+    ),
+    service: AsyncLifeEventService = Depends(),
+) -> Response:
+    """List all life events.
+
+    Pass the `X-Next-Cursor` header of a page back as `cursor` to
+    fetch the next page; `start` is ignored when a cursor is given.
+    `data` filters need an `event_type_id`, e.g.
+    `?event_type_id=3&data=type:eq:run&data=duration:gte:30`.
+    `fields` returns, and reads, only some fields of each event.
+    """
+    db_events = await service.list(
+        event_type_id=event_type_id,
+        start_date=start_date,
+        end_date=end_date,
+        limit=limit,
+        start=start,
+        cursor=cursor,
+        data=data,
+        fields=fields,
+    )
+    next_cursor = service.next_cursor(db_events, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows_response(
+        LifeEventResponse, db_events, response, fields
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {
+                media_type: {}
+                for media_type in MEDIA_TYPES.values()
+            }
+        }
+    },
+)
+async def export_events(
+    format: ExportFormat = ExportFormat.ndjson,
+    event_type_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    data: Optional[List[str]] = Query(
+        None,
+        description="`field:op:value` filters on payload fields, "
+        "as for listing",
+    ),
+    service: AsyncLifeEventService = Depends(),
+) -> StreamingResponse:
+    """Export every matching life event, oldest first.
+
+    Streams newline-delimited JSON, or CSV with the payload as a
+    JSON column, with flat memory for any number of events. Arrow
+    and Parquet exports type the payload fields declared by the
+    event types as columns of their own.
+    """
+    events = await service.iter_events(
+        event_type_id=event_type_id,
+        start_date=start_date,
+        end_date=end_date,
+        data=data,
+    )
+    event_types = (
+        await service.export_event_types(event_type_id)
+        if format in COLUMNAR_FORMATS
+        else ()
+    )
+    return export_response(
+        format,
+        async_export_chunks(format, events, event_types),
+    )
+
+
+@router.get("/stats", response_model=LifeEventStatsResponse)
+async def get_event_stats(
+    interval: StatsInterval = StatsInterval.day,
+    event_type_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    service: AsyncLifeEventService = Depends(),
+) -> LifeEventStatsResponse:
+    """Count life events per event type and time bucket."""
+    return await service.stats(
+        interval=interval,
+        event_type_id=event_type_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+
+@router.get(
+    "/stats/daily", response_model=LifeEventStatsResponse
+)
+async def get_daily_event_stats(
+    interval: SummaryInterval = SummaryInterval.day,
+    event_type_id: Optional[int] = None,
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None,
+    service: AsyncLifeEventService = Depends(),
+) -> LifeEventStatsResponse:
+    """Count life events per event type over whole days.
+
+    Served from the daily rollups; `end_day` is inclusive.
+    """
+    return await service.daily_stats(
+        interval=interval,
+        event_type_id=event_type_id,
+        start_day=start_day,
+        end_day=end_day,
+    )
+
+
+@router.get(
+    "/search", response_model=List[LifeEventSearchResult]
+)
+async def search_events(
+    q: str,
+    event_type_id: Optional[int] = None,
+    limit: Optional[int] = 100,
+    start: Optional[int] = 0,
+    service: AsyncLifeEventService = Depends(),
+) -> List[LifeEventSearchResult]:
+    """Search the text of life event payloads, best match first."""
+    results = await service.search(
+        q,
+        event_type_id=event_type_id,
+        limit=limit,
+        start=start,
+    )
+    return [
+        LifeEventSearchResult(
+            **LifeEventResponse.from_orm(event).dict(),
+            score=score,
+        )
+        for event, score in results
+    ]
+
+
+@router.get(
+    "/{event_id}",
+    response_model=LifeEventResponse,
+    dependencies=[Depends(AsyncConditional("life_events"))],
+)
+async def get_event(
+    response: Response,
+    event_id: int,
+    fields: Optional[Tuple[str, ...]] = Depends(
+        Fieldset(LifeEventResponse)
+    ),
+    service: AsyncLifeEventService = Depends(),
+) -> Response:
+    """Get a specific life event."""
+    db_event = await service.get(event_id, fields=fields)
+    return row_response(
+        LifeEventResponse, db_event, response, fields
+    )
+
+
+@router.put("/{event_id}", response_model=LifeEventResponse)
+async def update_event(
+    event_id: int,
+    event: LifeEventUpdate,
+    service: AsyncLifeEventService = Depends(),
+) -> LifeEventResponse:
+    """Update a life event."""
+    db_event = await service.update(event_id, event)
+    return LifeEventResponse.from_orm(db_event)
+
+
+@router.delete("/{event_id}")
+async def delete_event(
+    event_id: int,
+    service: AsyncLifeEventService = Depends(),
+) -> None:
+    """Delete a life event."""
+    return await service.delete(event_id)
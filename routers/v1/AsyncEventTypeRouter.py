@@ -0,0 +1,137 @@
+from typing import List, Optional, Tuple
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Response
+from services.AsyncEventTypeService import (
+    AsyncEventTypeService,
+)
+from schemas.pydantic.EventTypeSchema import (
+    EventTypeResponse,
+    EventTypeCreate,
+    EventTypeUpdate,
+)
+from schemas.pydantic.LifeEventSchema import (
+    LifeEventResponse,
+)
+from routers.AsyncConditional import AsyncConditional
+from routers.FastJSON import rows_response
+from routers.Fieldset import Fieldset
+
+router = APIRouter(
+    prefix="/api/v1/event-types",
+    tags=["Event Types"],
+)
+
+
+@router.post("/", response_model=EventTypeResponse)
+async def create_event_type(
+    event_type: EventTypeCreate,
+    service: AsyncEventTypeService = Depends(),
+) -> EventTypeResponse:
+    """Create a new event type."""
+    db_event_type = await service.create(event_type)
+    return EventTypeResponse.from_orm(db_event_type)
+
+
+@router.get(
+    "/",
+    response_model=List[EventTypeResponse],
+    dependencies=[Depends(AsyncConditional("event_types"))],
+)
+async def list_event_types(
+    response: Response,
+    name: Optional[str] = None,
+    limit: Optional[int] = 100,
+    start: Optional[int] = 0,
+    service: AsyncEventTypeService = Depends(),
+) -> Response:
+    """List all event types."""
+    db_event_types = await service.list(
+        name=name,
+        limit=limit,
+        start=start,
+    )
+    return rows_response(
+        EventTypeResponse, db_event_types, response
+    )
+
+
+@router.get(
+    "/{event_type_id}",
+    response_model=EventTypeResponse,
+    dependencies=[Depends(AsyncConditional("event_types"))],
+)
+async def get_event_type(
+    event_type_id: int,
+    service: AsyncEventTypeService = Depends(),
+) -> EventTypeResponse:
+    """Get a specific event type."""
+    db_event_type = await service.get(event_type_id)
+    return EventTypeResponse.from_orm(db_event_type)
+
+
+@router.get(
+    "/{event_type_id}/events",
+    response_model=List[LifeEventResponse],
+    dependencies=[
+        Depends(
+            AsyncConditional("life_events", "event_types")
+        )
+    ],
+)
+async def list_event_type_events(
+    response: Response,
+    event_type_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    limit: Optional[int] = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = Depends(
+        Fieldset(LifeEventResponse)
+    ),
+    service: AsyncEventTypeService = Depends(),
+) -> Response:
+    """List the events of an event type.
+
+    Pass the `X-Next-Cursor` header of a page back as `cursor` to
+    fetch the next page; `fields` returns, and reads, only some
+    fields of each event.
+    """
+    db_events = await service.get_events(
+        event_type_id,
+        start_date=start_date,
+        end_date=end_date,
+        limit=limit,
+        cursor=cursor,
+        fields=fields,
+    )
+    next_cursor = service.next_cursor(db_events, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows_response(
+        LifeEventResponse, db_events, response, fields
+    )
+
+
+@router.put(
+    "/{event_type_id}", response_model=EventTypeResponse
+)
+async def update_event_type(
+    event_type_id: int,
+    event_type: EventTypeUpdate,
+    service: AsyncEventTypeService = Depends(),
+) -> EventTypeResponse:
+    """Update an event type."""
+    db_event_type = await service.update(
+        event_type_id, event_type
+    )
+    return EventTypeResponse.from_orm(db_event_type)
+
+
+@router.delete("/{event_type_id}")
+async def delete_event_type(
+    event_type_id: int,
+    service: AsyncEventTypeService = Depends(),
+) -> None:
+    """Delete an event type."""
+    return await service.delete(event_type_id)
@@ -0,0 +1,37 @@
+from typing import List
+
+from fastapi import APIRouter
+
+from configs.Pool import pool_statistics
+from schemas.pydantic.DatabaseSchema import (
+    PoolStatusResponse,
+    ResultCacheStatusResponse,
+)
+from services.ResultCache import result_cache
+
+router = APIRouter(
+    prefix="/api/v1/database",
+    tags=["Database"],
+)
+
+
+@router.get(
+    "/pool", response_model=List[PoolStatusResponse]
+)
+def get_pool_status() -> List[PoolStatusResponse]:
+    """Report connection pool occupancy and checkout waits."""
+    return [
+        PoolStatusResponse(**statistics)
+        for statistics in pool_statistics()
+    ]
+
+
+@router.get(
+    "/cache", response_model=ResultCacheStatusResponse
+)
+def get_cache_status() -> ResultCacheStatusResponse:
+    """Report listing result cache hits, misses and evictions.
+
+    Counts are per worker process.
+    """
+    return ResultCacheStatusResponse(**result_cache.stats())
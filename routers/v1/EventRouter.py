@@ -1,13 +1,42 @@
-from typing import List, Optional
-from datetime import datetime
+from typing import List, Optional, Tuple
+from datetime import date, datetime
 
-from fastapi import APIRouter, Depends
+from fastapi import (
+    APIRouter,
+    Depends,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
+from services.EventImport import IMPORT_CHUNK_SIZE
 from services.LifeEventService import LifeEventService
 from schemas.pydantic.LifeEventSchema import (
+    ExportFormat,
+    ImportFormat,
+    LifeEventBatchResponse,
     LifeEventResponse,
+    LifeEventSearchResult,
+    LifeEventStatsResponse,
+    StatsInterval,
+    SummaryInterval,
     LifeEventCreate,
+    LifeEventImportResponse,
     LifeEventUpdate,
 )
+from routers.Conditional import Conditional
+from routers.Columnar import COLUMNAR_FORMATS
+from routers.Export import (
+    MEDIA_TYPES,
+    export_chunks,
+    export_response,
+)
+from routers.FastJSON import row_response, rows_response
+from routers.Fieldset import Fieldset
+from routers.Import import (
+    IMPORT_OPENAPI,
+    request_chunks,
+)
 
 router = APIRouter(
     prefix="/api/v1/events",
@@ -25,37 +54,256 @@ def create_event(
     return LifeEventResponse.from_orm(db_event)
 
 
-@router.get("/", response_model=List[LifeEventResponse])
+@router.post(
+    "/batch", response_model=LifeEventBatchResponse
+)
+def create_events(
+    events: List[LifeEventCreate],
+    service: LifeEventService = Depends(),
+) -> LifeEventBatchResponse:
+    """Create many life events in one transaction."""
+    return service.create_many(events)
+
+
+@router.post(
+    "/import",
+    response_model=LifeEventImportResponse,
+    openapi_extra=IMPORT_OPENAPI,
+)
+def import_events(
+    request: Request,
+    format: ImportFormat = ImportFormat.ndjson,
+    skip: Optional[int] = Query(
+        None,
+        ge=0,
+        description="Lines already imported, to resume an import",
+    ),
+    import_id: Optional[str] = Query(
+        None,
+        min_length=1,
+        max_length=255,
+        description="Name to save the import's progress under",
+    ),
+    chunk_size: int = Query(
+        IMPORT_CHUNK_SIZE,
+        ge=1,
+        le=10000,
+        description="Events committed at a time",
+    ),
+    service: LifeEventService = Depends(),
+) -> LifeEventImportResponse:
+    """Import life events from an NDJSON or CSV body.
+
+    The body is read as it arrives and committed every
+    `chunk_size` events; `skip` resumes an import from the
+    `lines` an earlier one reached. With an `import_id`, the
+    progress is saved with every commit, and a retry without
+    `skip` resumes from it.
+    """
+    return service.import_events(
+        format,
+        request_chunks(request),
+        skip=skip,
+        chunk_size=chunk_size,
+        import_id=import_id,
+    )
+
+
+@router.get(
+    "/import/{import_id}",
+    response_model=LifeEventImportResponse,
+)
+def get_import(
+    import_id: str,
+    service: LifeEventService = Depends(),
+) -> LifeEventImportResponse:
+    """Get the progress saved for an import."""
+    return service.get_import(import_id)
+
+
+@router.get(
+    "/",
+    response_model=List[LifeEventResponse],
+    # Payload filters are checked against event type schemas
+    dependencies=[
+        Depends(Conditional("life_events", "event_types"))
+    ],
+)
 def list_events(
+    response: Response,
     event_type_id: Optional[int] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     limit: Optional[int] = 100,
     start: Optional[int] = 0,
+    cursor: Optional[str] = None,
+    data: Optional[List[str]] = Query(
+        None,
+        description="`field:op:value` filters on payload fields "
+        "declared by the event type, op being one of eq, ne, "
+        "gt, gte, lt or lte",
+    ),
+    fields: Optional[Tuple[str, ...]] = Depends(
+        Fieldset(LifeEventResponse)
+    ),
     service: LifeEventService = Depends(),
-) -> List[LifeEventResponse]:
-    """List all life events."""
+) -> Response:
+    """List all life events.
+
+    Pass the `X-Next-Cursor` header of a page back as `cursor` to
+    fetch the next page; `start` is ignored when a cursor is given.
+    `data` filters need an `event_type_id`, e.g.
+    `?event_type_id=3&data=type:eq:run&data=duration:gte:30`.
+    `fields` returns, and reads, only some fields of each event.
+    """
     db_events = service.list(
         event_type_id=event_type_id,
         start_date=start_date,
         end_date=end_date,
         limit=limit,
         start=start,
+        cursor=cursor,
+        data=data,
+        fields=fields,
+    )
+    next_cursor = service.next_cursor(db_events, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows_response(
+        LifeEventResponse, db_events, response, fields
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {
+                media_type: {}
+                for media_type in MEDIA_TYPES.values()
+            }
+        }
+    },
+)
+def export_events(
+    format: ExportFormat = ExportFormat.ndjson,
+    event_type_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    data: Optional[List[str]] = Query(
+        None,
+        description="`field:op:value` filters on payload fields, "
+        "as for listing",
+    ),
+    service: LifeEventService = Depends(),
+) -> StreamingResponse:
+    """Export every matching life event, oldest first.
+
+    Streams newline-delimited JSON, or CSV with the payload as a
+    JSON column, with flat memory for any number of events. Arrow
+    and Parquet exports type the payload fields declared by the
+    event types as columns of their own.
+    """
+    events = service.iter_events(
+        event_type_id=event_type_id,
+        start_date=start_date,
+        end_date=end_date,
+        data=data,
+    )
+    event_types = (
+        service.export_event_types(event_type_id)
+        if format in COLUMNAR_FORMATS
+        else ()
+    )
+    return export_response(
+        format, export_chunks(format, events, event_types)
+    )
+
+
+@router.get("/stats", response_model=LifeEventStatsResponse)
+def get_event_stats(
+    interval: StatsInterval = StatsInterval.day,
+    event_type_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    service: LifeEventService = Depends(),
+) -> LifeEventStatsResponse:
+    """Count life events per event type and time bucket."""
+    return service.stats(
+        interval=interval,
+        event_type_id=event_type_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+
+@router.get(
+    "/stats/daily", response_model=LifeEventStatsResponse
+)
+def get_daily_event_stats(
+    interval: SummaryInterval = SummaryInterval.day,
+    event_type_id: Optional[int] = None,
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None,
+    service: LifeEventService = Depends(),
+) -> LifeEventStatsResponse:
+    """Count life events per event type over whole days.
+
+    Served from the daily rollups; `end_day` is inclusive.
+    """
+    return service.daily_stats(
+        interval=interval,
+        event_type_id=event_type_id,
+        start_day=start_day,
+        end_day=end_day,
+    )
+
+
+@router.get(
+    "/search", response_model=List[LifeEventSearchResult]
+)
+def search_events(
+    q: str,
+    event_type_id: Optional[int] = None,
+    limit: Optional[int] = 100,
+    start: Optional[int] = 0,
+    service: LifeEventService = Depends(),
+) -> List[LifeEventSearchResult]:
+    """Search the text of life event payloads, best match first."""
+    results = service.search(
+        q,
+        event_type_id=event_type_id,
+        limit=limit,
+        start=start,
     )
     return [
-        LifeEventResponse.from_orm(event)
-        for event in db_events
+        LifeEventSearchResult(
+            **LifeEventResponse.from_orm(event).dict(),
+            score=score,
+        )
+        for event, score in results
     ]
 
 
-@router.get("/{event_id}", response_model=LifeEventResponse)
+@router.get(
+    "/{event_id}",
+    response_model=LifeEventResponse,
+    dependencies=[Depends(Conditional("life_events"))],
+)
 def get_event(
+    response: Response,
     event_id: int,
+    fields: Optional[Tuple[str, ...]] = Depends(
+        Fieldset(LifeEventResponse)
+    ),
     service: LifeEventService = Depends(),
-) -> LifeEventResponse:
+) -> Response:
     """Get a specific life event."""
-    db_event = service.get(event_id)
-    return LifeEventResponse.from_orm(db_event)
+    db_event = service.get(event_id, fields=fields)
+    return row_response(
+        LifeEventResponse, db_event, response, fields
+    )
 
 
 @router.put("/{event_id}", response_model=LifeEventResponse)
@@ -1,12 +1,19 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from datetime import datetime
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from services.EventTypeService import EventTypeService
 from schemas.pydantic.EventTypeSchema import (
     EventTypeResponse,
     EventTypeCreate,
     EventTypeUpdate,
 )
+from schemas.pydantic.LifeEventSchema import (
+    LifeEventResponse,
+)
+from routers.Conditional import Conditional
+from routers.FastJSON import rows_response
+from routers.Fieldset import Fieldset
 
 router = APIRouter(
     prefix="/api/v1/event-types",
@@ -24,27 +31,33 @@ def create_event_type(
     return EventTypeResponse.from_orm(db_event_type)
 
 
-@router.get("/", response_model=List[EventTypeResponse])
+@router.get(
+    "/",
+    response_model=List[EventTypeResponse],
+    dependencies=[Depends(Conditional("event_types"))],
+)
 def list_event_types(
+    response: Response,
     name: Optional[str] = None,
     limit: Optional[int] = 100,
     start: Optional[int] = 0,
     service: EventTypeService = Depends(),
-) -> List[EventTypeResponse]:
+) -> Response:
     """List all event types."""
     db_event_types = service.list(
         name=name,
         limit=limit,
         start=start,
     )
-    return [
-        EventTypeResponse.from_orm(event_type)
-        for event_type in db_event_types
-    ]
+    return rows_response(
+        EventTypeResponse, db_event_types, response
+    )
 
 
 @router.get(
-    "/{event_type_id}", response_model=EventTypeResponse
+    "/{event_type_id}",
+    response_model=EventTypeResponse,
+    dependencies=[Depends(Conditional("event_types"))],
 )
 def get_event_type(
     event_type_id: int,
@@ -55,6 +68,47 @@ def get_event_type(
     return EventTypeResponse.from_orm(db_event_type)
 
 
+@router.get(
+    "/{event_type_id}/events",
+    response_model=List[LifeEventResponse],
+    dependencies=[
+        Depends(Conditional("life_events", "event_types"))
+    ],
+)
+def list_event_type_events(
+    response: Response,
+    event_type_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    limit: Optional[int] = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = Depends(
+        Fieldset(LifeEventResponse)
+    ),
+    service: EventTypeService = Depends(),
+) -> Response:
+    """List the events of an event type.
+
+    Pass the `X-Next-Cursor` header of a page back as `cursor` to
+    fetch the next page; `fields` returns, and reads, only some
+    fields of each event.
+    """
+    db_events = service.get_events(
+        event_type_id,
+        start_date=start_date,
+        end_date=end_date,
+        limit=limit,
+        cursor=cursor,
+        fields=fields,
+    )
+    next_cursor = service.next_cursor(db_events, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows_response(
+        LifeEventResponse, db_events, response, fields
+    )
+
+
 @router.put(
     "/{event_type_id}", response_model=EventTypeResponse
 )
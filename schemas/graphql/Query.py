@@ -8,6 +8,15 @@ from schemas.graphql.types.models import (
     LifeEvent,
     LifeEventFilter,
 )
+from repositories.DailyEventCountRepository import (
+    DailyEventCountRepository,
+)
+from repositories.EventTypeRepository import (
+    EventTypeRepository,
+)
+from repositories.LifeEventRepository import (
+    LifeEventRepository,
+)
 from services.EventTypeService import EventTypeService
 from services.LifeEventService import LifeEventService
 
@@ -64,11 +73,18 @@ class Query:
     ) -> List[LifeEvent]:
         """Get life events with optional filtering"""
         db = get_db(info)
-        service = LifeEventService(db)
-        filters = filter.__dict__ if filter else {}
-        db_events = service.get_events(
-            filters=filters,
-            skip=filter.offset if filter else 0,
-            limit=filter.limit if filter else 100,
+        service = LifeEventService(
+            LifeEventRepository(db),
+            EventTypeRepository(db),
+            DailyEventCountRepository(db),
+        )
+        filter = filter or LifeEventFilter()
+        db_events = service.list(
+            event_type_id=filter.event_type_id,
+            start_date=filter.start_date,
+            end_date=filter.end_date,
+            limit=filter.limit,
+            start=filter.offset,
+            data=filter.data,
         )
         return [LifeEvent.from_db(e) for e in db_events]
@@ -271,6 +271,12 @@ class LifeEventFilter:
         default=None, description="Filter by tags"
     )
 
+    data: Optional[List[str]] = strawberry.field(
+        default=None,
+        description="`field:op:value` filters on payload fields "
+        "declared by the event type; needs event_type_id",
+    )
+
     limit: int = strawberry.field(
         default=50,
         description="Maximum number of events to return",
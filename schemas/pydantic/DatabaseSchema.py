@@ -0,0 +1,77 @@
+from pydantic import BaseModel, Field
+
+
+class PoolStatusResponse(BaseModel):
+    """Response schema for connection pool status."""
+
+    name: str = Field(
+        ..., description="Name of the engine pool"
+    )
+    size: int = Field(
+        ...,
+        description="Configured number of pooled connections",
+    )
+    checked_out: int = Field(
+        ..., description="Connections currently in use"
+    )
+    idle: int = Field(
+        ..., description="Connections waiting in the pool"
+    )
+    overflow: int = Field(
+        ...,
+        description="Connections open beyond the pool size",
+    )
+    max_overflow: int = Field(
+        ..., description="Configured overflow limit"
+    )
+    checkouts: int = Field(
+        ...,
+        description="Checkouts since the pool was created",
+    )
+    timeouts: int = Field(
+        ...,
+        description="Checkouts that hit the pool timeout",
+    )
+    wait_avg_ms: float = Field(
+        ...,
+        description="Average checkout wait in milliseconds",
+    )
+    wait_max_ms: float = Field(
+        ...,
+        description="Longest checkout wait in milliseconds",
+    )
+
+
+class ResultCacheStatusResponse(BaseModel):
+    """Response schema for the listing result cache."""
+
+    entries: int = Field(
+        ..., description="Results currently cached"
+    )
+    max_entries: int = Field(
+        ..., description="Configured number of results kept"
+    )
+    rows: int = Field(
+        ...,
+        description="Rows of the results currently cached",
+    )
+    max_rows: int = Field(
+        ..., description="Configured number of rows kept"
+    )
+    ttl: float = Field(
+        ..., description="Seconds a result is served for"
+    )
+    hits: int = Field(
+        ..., description="Listings served from the cache"
+    )
+    misses: int = Field(
+        ..., description="Listings read from the database"
+    )
+    evictions: int = Field(
+        ...,
+        description="Results dropped as stale, expired or "
+        "least recently used",
+    )
+    hit_ratio: float = Field(
+        ..., description="Share of listings served cached"
+    )
@@ -1,5 +1,6 @@
 from datetime import datetime
-from typing import Dict, Any, Optional
+from enum import Enum
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -63,3 +64,117 @@ class LifeEventResponse(BaseModel):
         """Pydantic config."""
 
         orm_mode = True
+
+
+class LifeEventSearchResult(LifeEventResponse):
+    """A life event matching a search, with its relevance."""
+
+    score: float = Field(
+        ...,
+        description="Relevance; higher is a better match",
+    )
+
+
+class LifeEventBatchError(BaseModel):
+    """A rejected item of a life event batch."""
+
+    index: int = Field(
+        ..., description="Position of the item in the batch"
+    )
+    detail: str = Field(
+        ..., description="Reason the item was rejected"
+    )
+
+
+class LifeEventBatchResponse(BaseModel):
+    """Response schema for a life event batch."""
+
+    created: int = Field(
+        ..., description="Number of life events created"
+    )
+    errors: List[LifeEventBatchError] = Field(
+        default_factory=list,
+        description="Items that were not created",
+    )
+
+
+class StatsInterval(str, Enum):
+    """Width of a life event statistics bucket."""
+
+    hour = "hour"
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+class SummaryInterval(str, Enum):
+    """Width of a bucket served from the daily event counts."""
+
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+class ExportFormat(str, Enum):
+    """Encoding of a life event export."""
+
+    ndjson = "ndjson"
+    csv = "csv"
+    arrow = "arrow"
+    parquet = "parquet"
+
+
+class ImportFormat(str, Enum):
+    """Encoding of a life event import."""
+
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class LifeEventImportError(BaseModel):
+    """A rejected line of a life event import."""
+
+    line: int = Field(
+        ..., description="Line number in the import, from 1"
+    )
+    detail: str = Field(
+        ..., description="Reason the line was rejected"
+    )
+
+
+class LifeEventImportResponse(BaseModel):
+    """Progress of a life event import."""
+
+    lines: int = Field(
+        ...,
+        description="Lines read and committed, to pass as "
+        "`skip` when resuming",
+    )
+    created: int = Field(
+        ..., description="Number of life events created"
+    )
+    rejected: int = Field(
+        ..., description="Number of lines rejected"
+    )
+    errors: List[LifeEventImportError] = Field(
+        default_factory=list,
+        description="The first rejected lines",
+    )
+
+
+class LifeEventStatsSeries(BaseModel):
+    """Event counts of one event type, aligned with the buckets."""
+
+    event_type_id: int
+    counts: List[int]
+
+
+class LifeEventStatsResponse(BaseModel):
+    """Response schema for time-bucketed life event counts."""
+
+    interval: StatsInterval
+    buckets: List[datetime] = Field(
+        ...,
+        description="Start of each bucket that has events, ascending",
+    )
+    series: List[LifeEventStatsSeries]
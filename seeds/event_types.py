@@ -64,6 +64,7 @@ INITIAL_EVENT_TYPES = [
                 "location": {"type": "string"},
                 "mood": {"type": "string"},
             },
+            "x-indexed": ["meal_type"],
         },
     },
     {
@@ -97,6 +98,7 @@ INITIAL_EVENT_TYPES = [
                     },
                 },
             },
+            "x-indexed": ["type", "duration"],
         },
     },
     {
@@ -142,6 +144,7 @@ INITIAL_EVENT_TYPES = [
                 "interruptions": {"type": "integer"},
                 "notes": {"type": "string"},
             },
+            "x-indexed": ["quality"],
         },
     },
 ]
@@ -0,0 +1,56 @@
+"""Parsing of filters on life event payload fields."""
+
+from typing import Any, List, Tuple
+
+from fastapi import HTTPException
+
+from models.EventTypeModel import EventType
+from repositories.DataField import (
+    OPERATORS,
+    DataField,
+    declared_fields,
+)
+
+# (field, op, value), as the repositories expect them
+DataFilter = Tuple[DataField, str, Any]
+
+
+def _invalid(detail: str) -> HTTPException:
+    return HTTPException(status_code=400, detail=detail)
+
+
+def parse_data_filters(
+    raw_filters: List[str],
+    event_type: EventType,
+) -> List[DataFilter]:
+    """Parse `field:op:value` filters against an event type.
+
+    Only top-level number and string fields its schema declares
+    can be filtered; those it lists as indexed are served by
+    expression indexes.
+    """
+    fields = declared_fields(
+        event_type.id, event_type.event_schema
+    )
+    data_filters = []
+    for raw_filter in raw_filters:
+        parts = raw_filter.split(":", 2)
+        if len(parts) != 3:
+            raise _invalid(
+                f"Invalid data filter: {raw_filter}"
+            )
+        field, op, value = parts
+        if field not in fields:
+            raise _invalid(f"Unknown data field: {field}")
+        if op not in OPERATORS:
+            raise _invalid(f"Unknown data operator: {op}")
+
+        if fields[field].kind == "number":
+            try:
+                value = float(value)
+            except ValueError:
+                raise _invalid(
+                    f"Data field {field} is a number"
+                )
+        data_filters.append((fields[field], op, value))
+    return data_filters
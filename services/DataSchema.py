@@ -0,0 +1,133 @@
+"""Validation of life event payloads against event schemas."""
+
+import copy
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from jsonschema.protocols import Validator
+from jsonschema.exceptions import SchemaError
+from jsonschema.validators import validator_for
+
+from configs.Invalidation import invalidation_bus
+from models.EventTypeModel import EventType
+from repositories.DataField import indexed_fields_error
+
+
+def compile_schema(
+    event_schema: Optional[Dict[str, Any]],
+) -> Optional[Validator]:
+    """A validator for an event schema, None without one.
+
+    Checks the schema itself, once, and raises a 400 if it is
+    not valid JSON Schema.
+    """
+    if not event_schema:
+        return None
+    cls = validator_for(event_schema)
+    try:
+        cls.check_schema(event_schema)
+    except SchemaError as error:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid event schema: {error.message}",
+        )
+    return cls(
+        event_schema, format_checker=cls.FORMAT_CHECKER
+    )
+
+
+def check_event_schema(
+    event_schema: Optional[Dict[str, Any]],
+) -> None:
+    """Raise a 400 unless an event type's schema can be used.
+
+    Beyond being valid JSON Schema, the fields it lists as
+    indexed must be indexable.
+    """
+    compile_schema(event_schema)
+    error = indexed_fields_error(event_schema)
+    if error:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid event schema: {error}",
+        )
+
+
+def data_error(
+    validator: Optional[Validator], data: Dict[str, Any]
+) -> Optional[str]:
+    """Why data does not match a schema, None if it does."""
+    if validator is None:
+        return None
+    error = next(validator.iter_errors(data), None)
+    if error is None:
+        return None
+    path = "".join(f"[{part!r}]" for part in error.path)
+    return f"Invalid event data{path}: {error.message}"
+
+
+class DataValidators:
+    """Compiled validators per event type, shared across requests.
+
+    Each is reused while its event type's schema is unchanged;
+    invalidations of an event type drop its validator.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._validators: Dict[
+            int, Tuple[Dict[str, Any], Optional[Validator]]
+        ] = {}
+
+    def get(
+        self, event_type: EventType
+    ) -> Optional[Validator]:
+        with self._lock:
+            entry = self._validators.get(event_type.id)
+        # Cheaper than compiling, and catches schemas changed by
+        # other workers before their invalidation arrives
+        if entry is not None and (
+            entry[0] == event_type.event_schema
+        ):
+            return entry[1]
+        schema = copy.deepcopy(event_type.event_schema)
+        validator = compile_schema(schema)
+        with self._lock:
+            self._validators[event_type.id] = (
+                schema,
+                validator,
+            )
+        return validator
+
+    def validate(
+        self, event_type: EventType, data: Dict[str, Any]
+    ) -> None:
+        """Raise a 422 unless data matches the event schema."""
+        error = data_error(self.get(event_type), data)
+        if error:
+            raise HTTPException(
+                status_code=422, detail=error
+            )
+
+    def invalidate(self, id: Optional[int] = None) -> None:
+        with self._lock:
+            if id is None:
+                self._validators.clear()
+            else:
+                self._validators.pop(id, None)
+
+
+data_validators = DataValidators()
+
+
+@invalidation_bus.subscribe
+def _invalidate_validators(
+    table: Optional[str], key: Optional[Any]
+) -> None:
+    if table is None:
+        data_validators.invalidate()
+    elif (
+        table == EventType.__tablename__ and key is not None
+    ):
+        data_validators.invalidate(key)
@@ -0,0 +1,283 @@
+"""Bulk imports of life events from NDJSON or CSV streams.
+
+Streams are split into lines as their chunks arrive, one event per
+record, so an import holds at most a chunk of rows in memory. An
+NDJSON record is a line; a CSV record spans lines while a quoted
+field holds newlines, and is numbered by the line it starts on. Event
+type names are resolved against the event types loaded once at the
+start, and rows are validated as they are parsed. Callers commit
+each batch of rows from `feed` and `close`, then record it with
+`commit`, so `lines`, which only counts whole records, is always a
+safe point to resume from.
+
+NDJSON lines are objects, and CSV files have a header row, with
+`timestamp`, `data` (a JSON object) and either `event_type_id` or
+the `event_type` name; other fields, such as exported ids, are
+ignored. Both match the format of event exports.
+"""
+
+import csv
+import json
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from models.EventTypeModel import EventType
+from models.ImportProgressModel import ImportProgress
+from schemas.pydantic.LifeEventSchema import (
+    ImportFormat,
+    LifeEventCreate,
+    LifeEventImportError,
+    LifeEventImportResponse,
+)
+from services.DataSchema import data_error, data_validators
+
+# Rows inserted per commit
+IMPORT_CHUNK_SIZE = 1000
+
+# Rejected lines reported back, the rest are only counted
+IMPORT_ERROR_LIMIT = 100
+
+CSV_REQUIRED_COLUMNS = {"timestamp", "data"}
+
+# Longest CSV record, so an unterminated quote cannot buffer the
+# rest of the stream
+CSV_RECORD_LIMIT = 1 << 20
+
+
+def _validation_error(error: ValidationError) -> str:
+    first = error.errors()[0]
+    field = ".".join(str(part) for part in first["loc"])
+    return f"Invalid {field}: {first['msg']}"
+
+
+class EventImport:
+    """An import in progress, with the rows awaiting a commit.
+
+    A resumed import passes the counts it reached, so they run on
+    from there.
+    """
+
+    def __init__(
+        self,
+        format: ImportFormat,
+        event_types: Iterable[EventType],
+        skip: int = 0,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        created: int = 0,
+        rejected: int = 0,
+    ) -> None:
+        self.format = format
+        self.event_types = {
+            event_type.id: event_type
+            for event_type in event_types
+        }
+        self.event_type_ids = {
+            event_type.name: event_type.id
+            for event_type in self.event_types.values()
+        }
+        self.skip = skip
+        self.chunk_size = chunk_size
+        self.columns: Optional[List[str]] = None
+        self.pending = b""
+        # Lines of a CSV record still inside a quoted field
+        self.record: List[str] = []
+        self.record_size = 0
+        self.rows: List[Dict[str, Any]] = []
+        self.line = 0
+        # The line the record being read starts on
+        self.start = 0
+        self.lines = skip
+        self.created = created
+        self.rejected = rejected
+        self.errors: List[LifeEventImportError] = []
+
+    def feed(
+        self, chunk: bytes
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Read a chunk of the stream, yielding full batches."""
+        # A newline byte is never part of a UTF-8 character, so
+        # lines split before they are decoded
+        lines = (self.pending + chunk).split(b"\n")
+        self.pending = lines.pop()
+        for line in lines:
+            self._add_line(line)
+            if len(self.rows) >= self.chunk_size:
+                yield self._take()
+
+    def close(self) -> Iterator[List[Dict[str, Any]]]:
+        """End the stream, yielding the last batch."""
+        if self.pending:
+            self._add_line(self.pending)
+            self.pending = b""
+        if self.record:
+            self._end_record()
+            self._reject("Unterminated quoted field")
+        yield self._take()
+
+    def commit(self, created: int) -> None:
+        """Record that the last batch was committed."""
+        self.created += created
+        self.lines = self.line
+
+    def progress(
+        self, name: str, rows: List[Dict[str, Any]]
+    ) -> ImportProgress:
+        """The progress to save with a batch of rows."""
+        return ImportProgress(
+            name=name,
+            lines=self.line,
+            created=self.created + len(rows),
+            rejected=self.rejected,
+        )
+
+    def response(self) -> LifeEventImportResponse:
+        return LifeEventImportResponse(
+            lines=self.lines,
+            created=self.created,
+            rejected=self.rejected,
+            errors=self.errors,
+        )
+
+    def _take(self) -> List[Dict[str, Any]]:
+        rows, self.rows = self.rows, []
+        return rows
+
+    def _add_line(self, line: bytes) -> None:
+        self.line += 1
+        if not self.record:
+            self.start = self.line
+        try:
+            text = line.decode(
+                "utf-8-sig" if self.line == 1 else "utf-8"
+            )
+        except UnicodeDecodeError as error:
+            self._end_record()
+            self._reject(str(error))
+            return
+        if self.format == ImportFormat.ndjson:
+            self._add(text)
+            return
+        self.record.append(text + "\n")
+        self.record_size += len(line)
+        # Doubled quotes escape, so an odd count leaves a quoted
+        # field open across the newline
+        if sum(part.count('"') for part in self.record) % 2:
+            if self.record_size > CSV_RECORD_LIMIT:
+                self._end_record()
+                self._reject("Unterminated quoted field")
+            return
+        self._add(self._end_record())
+
+    def _end_record(self) -> str:
+        record = "".join(self.record)
+        self.record = []
+        self.record_size = 0
+        return record
+
+    def _add(self, text: str) -> None:
+        if (
+            self.format == ImportFormat.csv
+            and self.columns is None
+        ):
+            self.columns = self._header(text)
+            return
+        if self.line <= self.skip or not text.strip():
+            return
+        try:
+            self.rows.append(self._row(self._record(text)))
+        except ValidationError as error:
+            self._reject(_validation_error(error))
+        except json.JSONDecodeError as error:
+            self._reject(f"Invalid JSON: {error.msg}")
+        except ValueError as error:
+            self._reject(str(error))
+
+    def _reject(self, detail: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < IMPORT_ERROR_LIMIT:
+            self.errors.append(
+                LifeEventImportError(
+                    line=self.start, detail=detail
+                )
+            )
+
+    def _header(self, text: str) -> List[str]:
+        columns = next(csv.reader([text.strip()]), [])
+        if not CSV_REQUIRED_COLUMNS <= set(columns) or not {
+            "event_type_id",
+            "event_type",
+        } & set(columns):
+            raise HTTPException(
+                status_code=400,
+                detail="CSV imports need timestamp, data and "
+                "event_type_id or event_type columns",
+            )
+        return columns
+
+    def _record(self, text: str) -> Dict[str, Any]:
+        if self.format == ImportFormat.ndjson:
+            record = json.loads(text.rstrip("\r"))
+            if not isinstance(record, dict):
+                raise ValueError("Expected a JSON object")
+            return record
+
+        # The reader keeps newlines inside quoted fields and
+        # drops the record's own line ending
+        values = next(
+            csv.reader(text.splitlines(keepends=True))
+        )
+        if len(values) != len(self.columns):
+            raise ValueError(
+                f"Expected {len(self.columns)} columns"
+            )
+        record = {
+            column: value
+            for column, value in zip(self.columns, values)
+            if value != ""
+        }
+        if "data" in record:
+            record["data"] = json.loads(record["data"])
+        return record
+
+    def _row(
+        self, record: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        name = record.pop("event_type", None)
+        if (
+            "event_type_id" not in record
+            and name is not None
+        ):
+            if name not in self.event_type_ids:
+                raise ValueError(
+                    f"Unknown event type: {name}"
+                )
+            record["event_type_id"] = self.event_type_ids[
+                name
+            ]
+        event = LifeEventCreate.parse_obj(record)
+
+        event_type = self.event_types.get(
+            event.event_type_id
+        )
+        if event_type is None:
+            raise ValueError("Event type not found")
+        # Compiled once per event type for the whole import
+        error = data_error(
+            data_validators.get(event_type), event.data
+        )
+        if error:
+            raise ValueError(error)
+        return {
+            "event_type_id": event.event_type_id,
+            "timestamp": event.timestamp,
+            "data": event.data,
+        }
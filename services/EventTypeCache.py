@@ -0,0 +1,111 @@
+"""Process-local cache of event types by id and name."""
+
+import copy
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from configs.Invalidation import invalidation_bus
+from models.EventTypeModel import EventType
+
+# Bounds how long another process's writes go unnoticed
+EVENT_TYPE_TTL = 60.0
+
+_COLUMNS = tuple(
+    column.key for column in EventType.__table__.columns
+)
+
+
+class EventTypeCache:
+    """Snapshots of event type rows, shared across requests.
+
+    Lookups return a fresh, session-less EventType to be read,
+    not changed. Writes through the event type services publish
+    invalidations on the bus, which reach every worker; should
+    the bus lose messages, entries still expire after
+    EVENT_TYPE_TTL.
+    """
+
+    def __init__(self, ttl: float = EVENT_TYPE_TTL) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._by_id: Dict[
+            int, Tuple[float, Dict[str, Any]]
+        ] = {}
+        self._by_name: Dict[str, int] = {}
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """Changes on every invalidation.
+
+        Read it before loading a row and pass it to `put`, so a
+        row loaded before a write is not cached after it.
+        """
+        return self._generation
+
+    def get(self, id: int) -> Optional[EventType]:
+        with self._lock:
+            entry = self._by_id.get(id)
+            if entry is None:
+                return None
+            expires, values = entry
+            if expires < time.monotonic():
+                self._evict(id)
+                return None
+        return EventType(**values)
+
+    def get_by_name(self, name: str) -> Optional[EventType]:
+        with self._lock:
+            id = self._by_name.get(name)
+        return self.get(id) if id is not None else None
+
+    def put(
+        self, event_type: EventType, generation: int
+    ) -> None:
+        # Copied, so later changes to the instance do not leak in
+        values = copy.deepcopy(
+            {
+                key: getattr(event_type, key)
+                for key in _COLUMNS
+            }
+        )
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._evict(event_type.id)
+            self._by_id[event_type.id] = (
+                time.monotonic() + self.ttl,
+                values,
+            )
+            self._by_name[event_type.name] = event_type.id
+
+    def invalidate(self, id: Optional[int] = None) -> None:
+        """Forget one event type, or all of them."""
+        with self._lock:
+            self._generation += 1
+            if id is None:
+                self._by_id.clear()
+                self._by_name.clear()
+            else:
+                self._evict(id)
+
+    def _evict(self, id: int) -> None:
+        entry = self._by_id.pop(id, None)
+        if entry is not None:
+            self._by_name.pop(entry[1]["name"], None)
+
+
+event_type_cache = EventTypeCache()
+
+
+@invalidation_bus.subscribe
+def _invalidate_event_types(
+    table: Optional[str], key: Optional[Any]
+) -> None:
+    if table is None:
+        event_type_cache.invalidate()
+    elif (
+        table == EventType.__tablename__ and key is not None
+    ):
+        event_type_cache.invalidate(key)
@@ -1,30 +1,52 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional, Sequence
+from datetime import datetime
 
 from fastapi import Depends, HTTPException
+from configs.Invalidation import invalidation_bus
 from models.EventTypeModel import EventType
 from models.LifeEventModel import LifeEvent
 
 from repositories.EventTypeRepository import (
     EventTypeRepository,
 )
+from repositories.LifeEventRepository import (
+    LifeEventRepository,
+)
 from schemas.pydantic.EventTypeSchema import (
     EventTypeCreate,
     EventTypeUpdate,
 )
+from services.DataSchema import check_event_schema
+from services.EventTypeCache import event_type_cache
+from services.Pagination import (
+    decode_cursor,
+    next_page_cursor,
+)
+from services.ResultCache import (
+    cache_key,
+    restore_rows,
+    result_cache,
+    snapshot_rows,
+)
 
 
 class EventTypeService:
     event_type_repository: EventTypeRepository
+    life_event_repository: LifeEventRepository
 
     def __init__(
         self,
         event_type_repository: EventTypeRepository = Depends(),
+        life_event_repository: LifeEventRepository = Depends(),
     ) -> None:
         self.event_type_repository = event_type_repository
+        self.life_event_repository = life_event_repository
 
     def create(
         self, event_type_data: EventTypeCreate
     ) -> EventType:
+        # Rejects schemas that could never validate event data
+        check_event_schema(event_type_data.event_schema)
         event_type = EventType(
             name=event_type_data.name,
             description=event_type_data.description,
@@ -32,22 +54,33 @@ class EventTypeService:
             icon=event_type_data.icon,
             color=event_type_data.color,
         )
-        return self.event_type_repository.create(event_type)
+        event_type = self.event_type_repository.create(
+            event_type
+        )
+        invalidation_bus.publish(
+            EventType.__tablename__, event_type.id
+        )
+        return event_type
 
     def delete(self, event_type_id: int) -> None:
-        return self.event_type_repository.delete(
-            event_type_id
+        self.event_type_repository.delete(event_type_id)
+        invalidation_bus.publish(
+            EventType.__tablename__, event_type_id
         )
 
     def get(self, event_type_id: int) -> EventType:
-        event_type = self.event_type_repository.get(
-            event_type_id
-        )
-        if not event_type:
-            raise HTTPException(
-                status_code=404,
-                detail="Event type not found",
+        event_type = event_type_cache.get(event_type_id)
+        if event_type is None:
+            generation = event_type_cache.generation
+            event_type = self.event_type_repository.get(
+                event_type_id
             )
+            if not event_type:
+                raise HTTPException(
+                    status_code=404,
+                    detail="Event type not found",
+                )
+            event_type_cache.put(event_type, generation)
         return event_type
 
     def list(
@@ -56,57 +89,95 @@ class EventTypeService:
         limit: Optional[int] = 100,
         start: Optional[int] = 0,
     ) -> List[EventType]:
-        return self.event_type_repository.list(
+        # Names are unique, so a cached one is the whole page
+        if name and not start and limit != 0:
+            event_type = event_type_cache.get_by_name(name)
+            if event_type is not None:
+                return [event_type]
+
+        key = cache_key(
+            EventType.__tablename__,
+            name=name,
+            limit=limit,
+            start=start or 0,
+        )
+        rows = result_cache.get(key)
+        if rows is not None:
+            return restore_rows(EventType, rows)
+        generation = result_cache.generation(
+            EventType.__tablename__
+        )
+        event_types = self.event_type_repository.list(
             limit=limit,
             start=start,
             name=name,
         )
+        result_cache.put(
+            key,
+            (EventType.__tablename__,),
+            generation,
+            snapshot_rows(event_types),
+        )
+        return event_types
 
     def update(
         self,
         event_type_id: int,
         event_type_data: EventTypeUpdate,
     ) -> EventType:
-        current_event_type = self.get(event_type_id)
-
         # Update only provided fields
-        if event_type_data.name is not None:
-            setattr(
-                current_event_type,
-                "name",
-                event_type_data.name,
-            )
-        if event_type_data.description is not None:
-            setattr(
-                current_event_type,
-                "description",
-                event_type_data.description,
-            )
-        if event_type_data.event_schema is not None:
-            setattr(
-                current_event_type,
-                "event_schema",
-                event_type_data.event_schema,
-            )
-        if event_type_data.icon is not None:
-            setattr(
-                current_event_type,
-                "icon",
-                event_type_data.icon,
-            )
-        if event_type_data.color is not None:
-            setattr(
-                current_event_type,
-                "color",
-                event_type_data.color,
+        values = event_type_data.dict(exclude_none=True)
+        if "event_schema" in values:
+            check_event_schema(values["event_schema"])
+        event_type = self.event_type_repository.update(
+            event_type_id, values
+        )
+        if not event_type:
+            raise HTTPException(
+                status_code=404,
+                detail="Event type not found",
             )
-
-        return self.event_type_repository.update(
-            event_type_id, current_event_type
+        invalidation_bus.publish(
+            EventType.__tablename__, event_type_id
         )
+        return event_type
 
     def get_events(
-        self, event_type_id: int
+        self,
+        event_type_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: Optional[int] = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
     ) -> List[LifeEvent]:
-        event_type = self.get(event_type_id)
-        return event_type.events if event_type else []
+        self.get(event_type_id)
+        return self.life_event_repository.list(
+            limit=limit,
+            event_type_id=event_type_id,
+            start_date=start_date,
+            end_date=end_date,
+            after=decode_cursor(cursor) if cursor else None,
+            columns=fields,
+        )
+
+    def next_cursor(
+        self,
+        events: List[LifeEvent],
+        limit: Optional[int],
+    ) -> Optional[str]:
+        return next_page_cursor(events, limit)
+
+    def iter_events(
+        self,
+        event_type_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Iterator[LifeEvent]:
+        # Checked eagerly, before the caller starts consuming
+        self.get(event_type_id)
+        return self.life_event_repository.stream(
+            event_type_id=event_type_id,
+            start_date=start_date,
+            end_date=end_date,
+        )
@@ -1,7 +1,18 @@
-from typing import List, Optional
-from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from datetime import date, datetime
 
 from fastapi import Depends, HTTPException
+from sqlalchemy.engine import Row
 from models.LifeEventModel import LifeEvent
 from models.EventTypeModel import EventType
 
@@ -11,29 +22,90 @@ from repositories.LifeEventRepository import (
 from repositories.EventTypeRepository import (
     EventTypeRepository,
 )
+from repositories.DailyEventCountRepository import (
+    DailyEventCountRepository,
+)
+from repositories.Search import SearchUnavailable
 from schemas.pydantic.LifeEventSchema import (
+    LifeEventBatchError,
+    LifeEventBatchResponse,
+    ImportFormat,
     LifeEventCreate,
+    LifeEventImportResponse,
+    LifeEventStatsResponse,
     LifeEventUpdate,
+    StatsInterval,
+    SummaryInterval,
+)
+from services.EventTypeCache import event_type_cache
+from services.DataSchema import (
+    data_error,
+    data_validators,
+)
+from services.EventImport import (
+    IMPORT_CHUNK_SIZE,
+    EventImport,
+)
+from services.DataFilter import (
+    DataFilter,
+    parse_data_filters,
+)
+from services.Pagination import (
+    decode_cursor,
+    next_page_cursor,
+)
+from services.ResultCache import (
+    cache_key,
+    restore_rows,
+    result_cache,
+    snapshot_rows,
+)
+from services.Stats import stats_response
+
+# Tables a listing depends on, as data filters are parsed
+# against the event type's schema
+LIST_TABLES = (
+    LifeEvent.__tablename__,
+    EventType.__tablename__,
 )
 
 
 class LifeEventService:
     life_event_repository: LifeEventRepository
     event_type_repository: EventTypeRepository
+    daily_event_count_repository: DailyEventCountRepository
 
     def __init__(
         self,
         life_event_repository: LifeEventRepository = Depends(),
         event_type_repository: EventTypeRepository = Depends(),
+        daily_event_count_repository: DailyEventCountRepository = Depends(),
     ) -> None:
         self.life_event_repository = life_event_repository
         self.event_type_repository = event_type_repository
+        self.daily_event_count_repository = (
+            daily_event_count_repository
+        )
+
+    def _event_type(
+        self, event_type_id: int
+    ) -> Optional[EventType]:
+        # Event types rarely change, so writes skip the query
+        event_type = event_type_cache.get(event_type_id)
+        if event_type is None:
+            generation = event_type_cache.generation
+            event_type = self.event_type_repository.get(
+                event_type_id
+            )
+            if event_type:
+                event_type_cache.put(event_type, generation)
+        return event_type
 
     def create(
         self, event_data: LifeEventCreate
     ) -> LifeEvent:
         # Verify event type exists
-        event_type = self.event_type_repository.get(
+        event_type = self._event_type(
             event_data.event_type_id
         )
         if not event_type:
@@ -41,6 +113,9 @@ class LifeEventService:
                 status_code=404,
                 detail="Event type not found",
             )
+        data_validators.validate(
+            event_type, event_data.data
+        )
 
         life_event = LifeEvent(
             event_type_id=event_data.event_type_id,
@@ -49,11 +124,169 @@ class LifeEventService:
         )
         return self.life_event_repository.create(life_event)
 
+    def create_many(
+        self, events_data: List[LifeEventCreate]
+    ) -> LifeEventBatchResponse:
+        # Verify all referenced event types, querying at most
+        # once for those not cached
+        event_type_ids = {
+            event_data.event_type_id
+            for event_data in events_data
+        }
+        event_types = {
+            id: event_type
+            for id in event_type_ids
+            if (event_type := event_type_cache.get(id))
+        }
+        missing = event_type_ids - event_types.keys()
+        if missing:
+            generation = event_type_cache.generation
+            for (
+                event_type
+            ) in self.event_type_repository.list(
+                ids=list(missing)
+            ):
+                event_type_cache.put(event_type, generation)
+                event_types[event_type.id] = event_type
+
+        rows = []
+        errors = []
+        for index, event_data in enumerate(events_data):
+            event_type = event_types.get(
+                event_data.event_type_id
+            )
+            if event_type is None:
+                errors.append(
+                    LifeEventBatchError(
+                        index=index,
+                        detail="Event type not found",
+                    )
+                )
+                continue
+            # Compiled once per event type for the whole batch
+            error = data_error(
+                data_validators.get(event_type),
+                event_data.data,
+            )
+            if error:
+                errors.append(
+                    LifeEventBatchError(
+                        index=index, detail=error
+                    )
+                )
+                continue
+            rows.append(
+                {
+                    "event_type_id": event_data.event_type_id,
+                    "timestamp": event_data.timestamp,
+                    "data": event_data.data,
+                }
+            )
+
+        return LifeEventBatchResponse(
+            created=self.life_event_repository.create_many(
+                rows
+            ),
+            errors=errors,
+        )
+
+    def import_events(
+        self,
+        format: ImportFormat,
+        chunks: Iterable[bytes],
+        skip: Optional[int] = None,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        progress: Optional[
+            Callable[[LifeEventImportResponse], None]
+        ] = None,
+        import_id: Optional[str] = None,
+    ) -> LifeEventImportResponse:
+        """Import events from a stream, committing each chunk.
+
+        Lines up to `skip` are read but not imported, to resume
+        an import from the `lines` it reached. The progress of an
+        import with an `import_id` is saved with each chunk, and
+        without a `skip` it resumes from there.
+        """
+        saved = (
+            self.life_event_repository.get_import_progress(
+                import_id
+            )
+            if import_id is not None and skip is None
+            else None
+        )
+        # Event type names are resolved once for the whole stream
+        events = EventImport(
+            format,
+            self.event_type_repository.list(),
+            skip=saved.lines if saved else skip or 0,
+            chunk_size=chunk_size,
+            created=saved.created if saved else 0,
+            rejected=saved.rejected if saved else 0,
+        )
+        for chunk in chunks:
+            for rows in events.feed(chunk):
+                self._import_chunk(
+                    events, rows, progress, import_id
+                )
+        for rows in events.close():
+            self._import_chunk(
+                events, rows, progress, import_id
+            )
+        return events.response()
+
+    def get_import(
+        self, import_id: str
+    ) -> LifeEventImportResponse:
+        """The progress saved for a named import."""
+        saved = (
+            self.life_event_repository.get_import_progress(
+                import_id
+            )
+        )
+        if saved is None:
+            raise HTTPException(
+                status_code=404, detail="Import not found"
+            )
+        return LifeEventImportResponse(
+            lines=saved.lines,
+            created=saved.created,
+            rejected=saved.rejected,
+        )
+
+    def _import_chunk(
+        self,
+        events: EventImport,
+        rows: List[Dict[str, Any]],
+        progress: Optional[
+            Callable[[LifeEventImportResponse], None]
+        ],
+        import_id: Optional[str],
+    ) -> None:
+        events.commit(
+            self.life_event_repository.create_many(
+                rows,
+                (
+                    events.progress(import_id, rows)
+                    if import_id is not None
+                    else None
+                ),
+            )
+        )
+        if progress:
+            progress(events.response())
+
     def delete(self, event_id: int) -> None:
         return self.life_event_repository.delete(event_id)
 
-    def get(self, event_id: int) -> LifeEvent:
-        event = self.life_event_repository.get(event_id)
+    def get(
+        self,
+        event_id: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> LifeEvent:
+        event = self.life_event_repository.get(
+            event_id, columns=fields
+        )
         if not event:
             raise HTTPException(
                 status_code=404,
@@ -68,53 +301,203 @@ class LifeEventService:
         end_date: Optional[datetime] = None,
         limit: Optional[int] = 100,
         start: Optional[int] = 0,
+        cursor: Optional[str] = None,
+        data: Optional[List[str]] = None,
+        fields: Optional[Sequence[str]] = None,
     ) -> List[LifeEvent]:
-        return self.life_event_repository.list(
+        key = cache_key(
+            "life_events",
+            event_type_id=event_type_id,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            start=None if cursor else start or 0,
+            cursor=cursor,
+            data=data,
+            fields=fields,
+        )
+        rows = result_cache.get(key)
+        if rows is not None:
+            return restore_rows(LifeEvent, rows)
+
+        generation = result_cache.generation(*LIST_TABLES)
+        events = self.life_event_repository.list(
             limit=limit,
             start=start,
             event_type_id=event_type_id,
             start_date=start_date,
             end_date=end_date,
+            after=decode_cursor(cursor) if cursor else None,
+            data_filters=(
+                self.data_filters(event_type_id, data)
+                if data
+                else None
+            ),
+            columns=fields,
+        )
+        result_cache.put(
+            key,
+            LIST_TABLES,
+            generation,
+            snapshot_rows(events),
+        )
+        return events
+
+    def iter_events(
+        self,
+        event_type_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        data: Optional[List[str]] = None,
+    ) -> Iterator[LifeEvent]:
+        """Stream the events matching the listing filters."""
+        # Filters are checked eagerly, before the caller starts
+        # consuming
+        return self.life_event_repository.stream(
+            event_type_id=event_type_id,
+            start_date=start_date,
+            end_date=end_date,
+            data_filters=(
+                self.data_filters(event_type_id, data)
+                if data
+                else None
+            ),
+        )
+
+    def export_event_types(
+        self, event_type_id: Optional[int] = None
+    ) -> List[EventType]:
+        """The event types whose fields an export can hold."""
+        if event_type_id:
+            event_type = self._event_type(event_type_id)
+            return [event_type] if event_type else []
+        return self.event_type_repository.list()
+
+    def data_filters(
+        self,
+        event_type_id: Optional[int],
+        data: List[str],
+    ) -> List[DataFilter]:
+        # Payload fields are declared per event type
+        if not event_type_id:
+            raise HTTPException(
+                status_code=400,
+                detail="Data filters need an event_type_id",
+            )
+        event_type = self._event_type(event_type_id)
+        if not event_type:
+            raise HTTPException(
+                status_code=404,
+                detail="Event type not found",
+            )
+        return parse_data_filters(data, event_type)
+
+    def next_cursor(
+        self,
+        events: List[LifeEvent],
+        limit: Optional[int],
+    ) -> Optional[str]:
+        return next_page_cursor(events, limit)
+
+    def stats(
+        self,
+        interval: StatsInterval = StatsInterval.day,
+        event_type_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> LifeEventStatsResponse:
+        rows = self.life_event_repository.count_by_bucket(
+            interval.value,
+            event_type_id=event_type_id,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return stats_response(interval, rows)
+
+    def daily_stats(
+        self,
+        interval: SummaryInterval = SummaryInterval.day,
+        event_type_id: Optional[int] = None,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None,
+    ) -> LifeEventStatsResponse:
+        # Reads the daily rollups, so the cost grows with days
+        rows = self.daily_event_count_repository.list(
+            interval.value,
+            event_type_id=event_type_id,
+            start_day=start_day,
+            end_day=end_day,
+        )
+        return stats_response(
+            StatsInterval(interval.value), rows
         )
 
+    def search(
+        self,
+        query: str,
+        event_type_id: Optional[int] = None,
+        limit: Optional[int] = 100,
+        start: Optional[int] = 0,
+    ) -> List[Tuple[LifeEvent, float]]:
+        if not query.strip():
+            raise HTTPException(
+                status_code=400,
+                detail="Search query is empty",
+            )
+        try:
+            return self.life_event_repository.search(
+                query,
+                limit=limit,
+                start=start,
+                event_type_id=event_type_id,
+            )
+        except SearchUnavailable as error:
+            raise HTTPException(
+                status_code=501, detail=str(error)
+            )
+
     def update(
         self, event_id: int, event_data: LifeEventUpdate
     ) -> LifeEvent:
-        current_event = self.get(event_id)
-
         # Update only provided fields
-        if event_data.timestamp is not None:
-            setattr(
-                current_event,
-                "timestamp",
-                event_data.timestamp,
-            )
-        if event_data.data is not None:
-            setattr(current_event, "data", event_data.data)
-        if (
-            hasattr(event_data, "event_type_id")
-            and event_data.event_type_id is not None
-        ):
-            event_type = self.event_type_repository.get(
-                event_data.event_type_id
+        values = event_data.dict(exclude_none=True)
+
+        def check(current: Row) -> None:
+            # The data and event type after the update must match
+            event_type = self._event_type(
+                values.get(
+                    "event_type_id", current.event_type_id
+                )
             )
             if not event_type:
                 raise HTTPException(
                     status_code=404,
                     detail="Event type not found",
                 )
-            setattr(
-                current_event,
-                "event_type_id",
-                event_data.event_type_id,
+            data_validators.validate(
+                event_type, values.get("data", current.data)
             )
 
-        return self.life_event_repository.update(
-            event_id, current_event
+        event = self.life_event_repository.update(
+            event_id,
+            values,
+            # Against the row being updated, not a replica's copy
+            check=(
+                check
+                if "event_type_id" in values
+                or "data" in values
+                else None
+            ),
         )
+        if not event:
+            raise HTTPException(
+                status_code=404,
+                detail="Life event not found",
+            )
+        return event
 
     def get_event_type(
         self, event_id: int
     ) -> Optional[EventType]:
         event = self.get(event_id)
-        return event.event_type if event else None
+        return self._event_type(event.event_type_id)
@@ -0,0 +1,53 @@
+"""Opaque cursor helpers for keyset pagination."""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+
+
+def encode_cursor(timestamp: datetime, id: int) -> str:
+    """Encode a (timestamp, id) position as an opaque cursor."""
+    payload = json.dumps(
+        [timestamp.isoformat(), id],
+        separators=(",", ":"),
+    )
+    return (
+        base64.urlsafe_b64encode(payload.encode("utf-8"))
+        .decode("ascii")
+        .rstrip("=")
+    )
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode an opaque cursor into a (timestamp, id) position."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw_timestamp, id = json.loads(
+            base64.urlsafe_b64decode(padded)
+        )
+        timestamp = datetime.fromisoformat(raw_timestamp)
+        return timestamp, int(id)
+    except (
+        binascii.Error,
+        TypeError,
+        ValueError,
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid cursor",
+        )
+
+
+def next_page_cursor(
+    rows: Sequence[Any], limit: Optional[int]
+) -> Optional[str]:
+    """Cursor for the page after `rows`, if it may have rows."""
+    # A short page means there is nothing left to fetch
+    if not rows or limit is None or len(rows) < limit:
+        return None
+    last_row = rows[-1]
+    return encode_cursor(last_row.timestamp, last_row.id)
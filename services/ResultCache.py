@@ -0,0 +1,217 @@
+"""Process-local cache of listing results."""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from sqlalchemy import inspect
+
+from repositories.TableVersion import (
+    TableGenerations,
+    table_generations,
+)
+
+# Bound memory; least recently used results go first. Listings
+# vary from one row to thousands, so rows are bounded too
+RESULT_CACHE_SIZE = 1024
+RESULT_CACHE_ROWS = 50_000
+# Bounds how long another process's writes go unnoticed
+RESULT_CACHE_TTL = 30.0
+
+Model = TypeVar("Model")
+
+Rows = Tuple[Dict[str, Any], ...]
+
+
+def cache_key(name: str, /, **arguments: Any) -> Hashable:
+    """A key equal for every spelling of the same arguments.
+
+    Omitted arguments are left out, and lists are compared as
+    sets, since their filters all apply.
+    """
+    return name, tuple(
+        sorted(
+            (
+                key,
+                (
+                    tuple(sorted(set(value)))
+                    if isinstance(value, list)
+                    else value
+                ),
+            )
+            for key, value in arguments.items()
+            if value is not None
+        )
+    )
+
+
+def _snapshot(row: Any) -> Dict[str, Any]:
+    # Columns a sparse fieldset did not load are left out, not
+    # loaded
+    unloaded = inspect(row).unloaded
+    return {
+        column.key: getattr(row, column.key)
+        for column in row.__table__.columns
+        if column.key not in unloaded
+    }
+
+
+def snapshot_rows(rows: Iterable[Any]) -> Rows:
+    """Column values of ORM rows, independent of a session.
+
+    Copied, so later changes to the rows do not leak in.
+    """
+    return tuple(
+        copy.deepcopy(_snapshot(row)) for row in rows
+    )
+
+
+def restore_rows(
+    model: Type[Model], rows: Rows
+) -> List[Model]:
+    """Fresh, session-less instances of cached rows.
+
+    Each has its own copy of the values, payloads included.
+    """
+    return [
+        model(**copy.deepcopy(values)) for values in rows
+    ]
+
+
+def _size(value: Any) -> int:
+    # Rows of a listing, or one for any other result
+    return len(value) if isinstance(value, tuple) else 1
+
+
+class ResultCache:
+    """Results keyed by their arguments, shared across requests.
+
+    Each entry records the generations of the tables it was read
+    from, and is stale once any of them is written in this
+    process; other processes catch up within RESULT_CACHE_TTL.
+    Entries are bounded in number and in total rows.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESULT_CACHE_SIZE,
+        ttl: float = RESULT_CACHE_TTL,
+        generations: TableGenerations = table_generations,
+        max_rows: int = RESULT_CACHE_ROWS,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self.generations = generations
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[
+            Hashable,
+            Tuple[
+                Sequence[str], Tuple[int, ...], float, Any
+            ],
+        ] = OrderedDict()
+        self._rows = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def generation(self, *tables: str) -> Tuple[int, ...]:
+        """The generations of tables, to be passed to `put`.
+
+        Read before loading, so a result loaded before a write is
+        not cached after it.
+        """
+        return self.generations.get(*tables)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                tables, generation, expires, value = entry
+                if (
+                    expires < time.monotonic()
+                    or generation
+                    != self.generations.get(*tables)
+                ):
+                    self._remove(key)
+                    self.evictions += 1
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(
+        self,
+        key: Hashable,
+        tables: Sequence[str],
+        generation: Tuple[int, ...],
+        value: Any,
+    ) -> None:
+        with self._lock:
+            if (
+                self.max_entries <= 0
+                or _size(value) > self.max_rows
+                or generation
+                != self.generations.get(*tables)
+            ):
+                return
+            self._remove(key)
+            self._entries[key] = (
+                tuple(tables),
+                generation,
+                time.monotonic() + self.ttl,
+                value,
+            )
+            self._rows += _size(value)
+            while (
+                len(self._entries) > self.max_entries
+                or self._rows > self.max_rows
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._rows -= _size(entry[3])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._rows = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "rows": self._rows,
+                "max_rows": self.max_rows,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (
+                    self.hits / lookups if lookups else 0.0
+                ),
+            }
+
+
+result_cache = ResultCache()
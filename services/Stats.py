@@ -0,0 +1,43 @@
+"""Helpers for time-bucketed life event statistics."""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from schemas.pydantic.LifeEventSchema import (
+    LifeEventStatsResponse,
+    LifeEventStatsSeries,
+    StatsInterval,
+)
+
+
+def stats_response(
+    interval: StatsInterval,
+    rows: Iterable[Tuple[datetime, int, int]],
+) -> LifeEventStatsResponse:
+    """Pivot (bucket, event_type_id, count) rows into series."""
+    rows = list(rows)
+    buckets = sorted({bucket for bucket, _, _ in rows})
+    positions = {
+        bucket: position
+        for position, bucket in enumerate(buckets)
+    }
+
+    # Buckets without events of a type count as zero
+    counts: Dict[int, List[int]] = {}
+    for bucket, event_type_id, count in rows:
+        series = counts.setdefault(
+            event_type_id, [0] * len(buckets)
+        )
+        series[positions[bucket]] = count
+
+    return LifeEventStatsResponse(
+        interval=interval,
+        buckets=buckets,
+        series=[
+            LifeEventStatsSeries(
+                event_type_id=event_type_id,
+                counts=counts[event_type_id],
+            )
+            for event_type_id in sorted(counts)
+        ],
+    )
@@ -9,12 +9,17 @@ setup(
         "fastapi==0.75.1",
         "sqlalchemy==1.4.35",
         "mysqlclient==2.1.0",
+        "aiomysql==0.2.0",
         "uvicorn[standard]==0.17.6",
         "python-dotenv==0.20.0",
         "strawberry-graphql[fastapi]>=0.205.0",
+        "jsonschema==4.26.0",
+        "orjson==3.13.0",
+        "pyarrow==26.0.0",
         "pytest>=7.4.3",
         "pytest-cov>=4.1.0",
         "pytest-asyncio>=0.21.1",
+        "aiosqlite>=0.22.1",
         "types-pytest>=7.4.0",
     ],
 )